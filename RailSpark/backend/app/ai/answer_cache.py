@@ -0,0 +1,76 @@
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Hashable, Optional, Tuple
+import threading
+import time
+
+from utils.data_version import data_version
+from .intent_router import IntentMatch
+
+
+class AnswerCache:
+    """Chatbot responses keyed by what determines them.
+
+    The key is the routed intent, its keywords and numbers, the global data
+    version and the current date, so a repeated question is answered from
+    memory until any table is written or the day rolls over. ``ttl`` bounds
+    how stale time-dependent parts of an answer can get.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, match: IntentMatch) -> Hashable:
+        return (
+            match.intent.value,
+            tuple(sorted(match.keywords)),
+            match.numbers,
+            data_version.current(),
+            date.today().isoformat(),
+        )
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, response: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_answer_cache: Optional[AnswerCache] = None
+_answer_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> AnswerCache:
+    global _answer_cache
+    with _answer_cache_lock:
+        if _answer_cache is None:
+            _answer_cache = AnswerCache()
+            # Old versions can never be hit again; free them on the next write
+            data_version.on_commit(lambda tables: _answer_cache.clear())
+        return _answer_cache
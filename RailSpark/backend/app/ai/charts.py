@@ -0,0 +1,237 @@
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeoutError
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Any, Optional, Tuple
+import numpy as np
+import base64
+import hashlib
+import io
+import json
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChartSpec:
+    """A chart to render: draw(fig, data) fills a fresh Agg figure"""
+    name: str
+    draw: Callable[[Figure, Any], None]
+    data: Any = None
+    figsize: Tuple[float, float] = (8, 6)
+    static: bool = False
+
+    def cache_key(self) -> str:
+        if self.static:
+            return f"{self.name}:{self.figsize}"
+        payload = json.dumps(self.data, sort_keys=True, default=str)
+        return f"{self.name}:{self.figsize}:{hashlib.sha1(payload.encode()).hexdigest()}"
+
+
+class ChartRenderer:
+    """Renders charts on a worker pool using the object-oriented Agg API.
+
+    Each render creates its own Figure/FigureCanvasAgg, so no pyplot global
+    state is shared between threads. Static charts (data-independent) are
+    cached for the life of the process; data-driven charts are cached in a
+    bounded LRU keyed by a hash of their input data.
+    """
+
+    def __init__(self, max_workers: int = 2, cache_size: int = 256, dpi: int = 150):
+        self.dpi = dpi
+        self.cache_size = cache_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="chart-render")
+        self._static_cache: Dict[str, str] = {}
+        self._data_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, spec: ChartSpec) -> Future:
+        """Start rendering (or return the cached image) without blocking"""
+        key = spec.cache_key()
+        with self._lock:
+            cached = self._static_cache.get(key) if spec.static else self._data_cache.get(key)
+            if cached is not None:
+                if not spec.static:
+                    self._data_cache.move_to_end(key)
+                future = Future()
+                future.set_result(cached)
+                return future
+
+            # Identical charts requested concurrently share one render
+            future = self._in_flight.get(key)
+            if future is None:
+                future = self._executor.submit(self._render, key, spec)
+                self._in_flight[key] = future
+            return future
+
+    def submit_many(self, specs: List[ChartSpec]) -> List[Future]:
+        return [self.submit(spec) for spec in specs]
+
+    def render_many(self, specs: List[ChartSpec], timeout: float = 10.0) -> List[str]:
+        """Render charts in parallel; failed or timed-out charts are left out"""
+        images = []
+        for spec, future in zip(specs, self.submit_many(specs)):
+            try:
+                images.append(future.result(timeout=timeout))
+            except FutureTimeoutError:
+                logger.warning(f"Chart '{spec.name}' timed out after {timeout}s")
+            except Exception as e:
+                logger.error(f"Chart '{spec.name}' failed: {e}")
+        return images
+
+    def _render(self, key: str, spec: ChartSpec) -> str:
+        try:
+            fig = Figure(figsize=spec.figsize)
+            FigureCanvasAgg(fig)
+            spec.draw(fig, spec.data)
+
+            buf = io.BytesIO()
+            fig.savefig(buf, format='png', dpi=self.dpi, bbox_inches='tight')
+            image = base64.b64encode(buf.getvalue()).decode('utf-8')
+
+            with self._lock:
+                if spec.static:
+                    self._static_cache[key] = image
+                else:
+                    self._data_cache[key] = image
+                    while len(self._data_cache) > self.cache_size:
+                        self._data_cache.popitem(last=False)
+            return image
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+
+_renderer: Optional[ChartRenderer] = None
+_renderer_lock = threading.Lock()
+
+
+def get_chart_renderer() -> ChartRenderer:
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = ChartRenderer()
+        return _renderer
+
+
+# === Chart drawings used by the chatbot ===
+
+def draw_system_architecture(fig: Figure, data: Any = None):
+    ax = fig.add_subplot()
+    components = {
+        'Input Layer': ['User Queries', 'Context Data', 'Real-time Feeds'],
+        'Data Layer': ['Train Database', 'Maintenance Records', 'Fitness Certs', 'Branding Contracts'],
+        'AI Layer': ['Rule Engine', 'ML Engine', 'Optimizer'],
+        'Validation Layer': ['Rule Checking', 'Consistency Validation', 'Impact Assessment'],
+        'Output Layer': ['Decisions', 'Explanations', 'Visualizations', 'Alternatives']
+    }
+
+    y_pos = 0
+    for layer, items in components.items():
+        ax.text(0.1, y_pos, layer, fontsize=14, fontweight='bold',
+                bbox=dict(boxstyle="round,pad=0.3", facecolor="lightblue"))
+
+        for i, item in enumerate(items):
+            ax.text(0.3, y_pos - (i+1)*0.1, f"• {item}", fontsize=11)
+
+        if y_pos > 0:
+            ax.arrow(0.5, y_pos - len(items)*0.05, 0.2, -0.3,
+                     head_width=0.02, head_length=0.05, fc='gray', ec='gray')
+
+        y_pos -= (len(items) + 1) * 0.15
+
+    ax.set_xlim(0, 1)
+    ax.set_ylim(y_pos - 0.5, 0.5)
+    ax.axis('off')
+    ax.set_title('AI System Architecture', fontsize=16, fontweight='bold')
+
+
+def draw_data_flow(fig: Figure, data: Any = None):
+    ax = fig.add_subplot()
+    sources = ['User Query', 'Train DB', 'Maintenance', 'Fitness', 'Branding', 'Operations']
+    processes = ['Query Analysis', 'Data Fusion', 'AI Processing', 'Validation', 'Explanation']
+
+    for i, source in enumerate(sources):
+        ax.scatter(i, 2, s=200, c='lightgreen', edgecolors='black')
+        ax.text(i, 2.2, source, ha='center', fontsize=9)
+
+    for i, process in enumerate(processes):
+        ax.scatter(i, 1, s=200, c='lightcoral', edgecolors='black')
+        ax.text(i, 0.8, process, ha='center', fontsize=9)
+
+    for i in range(len(sources)-1):
+        ax.arrow(i, 1.9, 1, 0, head_width=0.05, fc='blue', ec='blue', alpha=0.7)
+
+    for i in range(len(processes)-1):
+        ax.arrow(i, 1.1, 1, 0, head_width=0.05, fc='red', ec='red', alpha=0.7)
+
+    ax.set_xlim(-0.5, max(len(sources), len(processes)) - 0.5)
+    ax.set_ylim(0.5, 2.5)
+    ax.axis('off')
+    ax.set_title('Data Flow Process', fontsize=14)
+
+
+def draw_maintenance_history(fig: Figure, data: Dict[str, Any]):
+    """data: {'train_number': str, 'events': [(date, type), ...]}"""
+    ax = fig.add_subplot()
+    dates = [event[0] for event in data['events']]
+    types = [event[1] for event in data['events']]
+
+    type_map = {typ: i for i, typ in enumerate(sorted(set(types)))}
+    type_nums = [type_map[typ] for typ in types]
+
+    ax.scatter(dates, type_nums, c=type_nums, cmap='viridis', s=100)
+    ax.set_yticks(range(len(type_map)))
+    ax.set_yticklabels(list(type_map.keys()))
+    ax.set_xlabel('Date')
+    ax.set_title(f"Maintenance History - Train {data['train_number']}")
+    ax.grid(True, alpha=0.3)
+
+
+def draw_factor_pie(fig: Figure, data: Dict[str, Any]):
+    """data: {'train_number': str, 'factors': [(label, value), ...]}"""
+    ax = fig.add_subplot()
+    labels = [f[0] for f in data['factors']]
+    values = [f[1] for f in data['factors']]
+
+    ax.pie(values, labels=labels, autopct='%1.1f%%', startangle=90)
+    ax.set_title(f"Risk Factors Distribution - Train {data['train_number']}")
+
+
+def draw_risk_distribution(fig: Figure, data: Dict[str, int]):
+    """data: {risk_level: count}"""
+    ax = fig.add_subplot()
+    labels = [f"{risk.title()} ({count})" for risk, count in data.items()]
+    sizes = list(data.values())
+    colors = ['green', 'yellow', 'orange', 'red'][:len(sizes)]
+
+    ax.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
+    ax.set_title('Train Failure Risk Distribution')
+
+
+def draw_feature_importance(fig: Figure, data: List[Tuple[str, float]]):
+    """data: [(feature, importance), ...] sorted by importance"""
+    ax = fig.add_subplot()
+    features, importance = zip(*data)
+
+    y_pos = np.arange(len(features))
+    ax.barh(y_pos, importance, color='skyblue')
+    ax.set_yticks(y_pos)
+    ax.set_yticklabels(features)
+    ax.set_xlabel('Feature Importance')
+    ax.set_title('Top 10 Risk Prediction Factors')
+    ax.invert_yaxis()
+
+
+def draw_probability_histogram(fig: Figure, data: List[float]):
+    """data: failure probabilities"""
+    ax = fig.add_subplot()
+    ax.hist(data, bins=20, alpha=0.7, color='blue', edgecolor='black')
+    ax.set_xlabel('Failure Probability')
+    ax.set_ylabel('Number of Trains')
+    ax.set_title('Failure Probability Distribution Across Trains')
+    ax.grid(True, alpha=0.3)
@@ -1,19 +1,32 @@
 from sqlalchemy.orm import Session
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 from datetime import date, datetime, timedelta
 import crud
 from .rule_engine import AdvancedRuleEngine
 from .optimizer import InductionOptimizer
 from .ml_model import MLModel
-import re
+from .services import get_rule_engine, get_optimizer, get_ml_model, get_scenario_engine
+from .intent_router import Intent, IntentMatch, intent_router, route_message
+from .context_store import ConversationContext, get_context_store
+from .answer_cache import get_answer_cache
+from .sections import Section, SectionResults, get_section_runner
+from .transcript_log import get_transcript_log
+from .charts import (
+    ChartSpec, get_chart_renderer, draw_system_architecture, draw_data_flow,
+    draw_maintenance_history, draw_factor_pie, draw_risk_distribution,
+    draw_feature_importance, draw_probability_histogram
+)
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
-import matplotlib.pyplot as plt
-import io
-import base64
 import numpy as np
 from collections import Counter
+from contextlib import contextmanager
+import time
+import logging
+from concurrent.futures import Future, as_completed, TimeoutError as FutureTimeoutError
+
+logger = logging.getLogger(__name__)
 
 class ExplanationType(Enum):
     RULE_BASED = "rule_based"
@@ -47,86 +60,289 @@ class ChatResponse:
     confidence_score: float = 1.0
     alternative_scenarios: List[Dict] = None
     visualizations: List[str] = None  # Base64 encoded images
+    partial: bool = False  # Some sections missed their deadline or failed
 
 class TransparentChatbot:
+    # Deadlines in seconds for the independently loaded parts of an answer
+    SECTION_TIMEOUTS = {"plan": 20.0, "fleet": 5.0, "predictions": 10.0}
+    
     def __init__(self, db: Session):
         self.db = db
-        self.rule_engine = AdvancedRuleEngine(db)
-        self.optimizer = InductionOptimizer(db)
-        self.ml_model = MLModel(db)
-        self.context = {}
-        self.conversation_history = []
+        # Engines are resolved on first use so intents that do not need them stay cheap
+        self._rule_engine = None
+        self._optimizer = None
+        self._ml_model = None
+        # Conversation state outlives this instance in the shared context store
+        self.context_store = get_context_store()
+        self.answer_cache = get_answer_cache()
+        self.user_context: Optional[ConversationContext] = None
+        # When streaming, charts render in the background instead of blocking the answer
+        self._deferred_charts: Optional[List[Tuple[str, Future]]] = None
+        # Milliseconds spent in each engine for the current message, for the transcript log
+        self._timings: Dict[str, float] = {}
+    
+    @property
+    def rule_engine(self) -> AdvancedRuleEngine:
+        if self._rule_engine is None:
+            self._rule_engine = get_rule_engine(self.db)
+        return self._rule_engine
+    
+    @property
+    def optimizer(self) -> InductionOptimizer:
+        if self._optimizer is None:
+            self._optimizer = get_optimizer(self.db)
+        return self._optimizer
+    
+    @property
+    def ml_model(self) -> MLModel:
+        if self._ml_model is None:
+            self._ml_model = get_ml_model(self.db)
+        return self._ml_model
     
     def process_message(self, message: str, user_id: int = None) -> ChatResponse:
         """Process user message with full transparency and explanations"""
         message = message.lower().strip()
+        started = time.perf_counter()
+        self._timings = {}
+        match = None
         
-        # Store conversation history
-        self.conversation_history.append({
-            'timestamp': datetime.now(),
-            'user_message': message,
-            'user_id': user_id
-        })
+        try:
+            match = self._route(message, user_id)
+            # Repeated questions are answered from cache until the data changes
+            cache_key = self.answer_cache.key(match)
+            response = self.answer_cache.get(cache_key)
+            cache_hit = response is not None
+            if response is None:
+                response = self._dispatch(message, match)
+                if response.type != "error" and not response.partial:
+                    self.answer_cache.put(cache_key, response)
+        except Exception as e:
+            response = self._create_error_response(f"Error processing message: {str(e)}")
+            self._log_turn(user_id, match, response, started, cache_hit=False)
+            return response
         
-        # Store user context
-        if user_id:
-            self.context['user_id'] = user_id
+        self._record_turn(user_id, message, match, response)
+        self._log_turn(user_id, match, response, started, cache_hit)
+        return response
+    
+    def stream_message(self, message: str, user_id: int = None,
+                       chart_timeout: float = 30.0) -> Iterator[Tuple[str, Any]]:
+        """Process a message as a sequence of (event, payload) sections.
+        
+        The detected intent is sent before any data is loaded, the answer text
+        as soon as the handler returns, and each chart when it finishes
+        rendering, so the first bytes do not wait on charts.
+        """
+        message = message.lower().strip()
+        started = time.perf_counter()
+        self._timings = {}
+        self._deferred_charts = []
+        cache_key = cached = None
         
         try:
-            # Check for explanation requests
-            if any(word in message for word in ["explain", "why", "how", "reasoning", "journey", "process"]):
-                return self._provide_detailed_explanation(message)
-            
-            # Check for "what-if" scenarios
-            if "what if" in message or "scenario" in message:
-                return self._handle_what_if_scenario(message)
-            
-            # Check for specific queries
-            if any(word in message for word in ["schedule", "induction", "plan"]):
-                return self._handle_schedule_query(message)
-            
-            elif any(word in message for word in ["train", "status", "fitness"]):
-                return self._handle_train_query(message)
-            
-            elif any(word in message for word in ["maintenance", "job card", "repair"]):
-                return self._handle_maintenance_query(message)
-            
-            elif any(word in message for word in ["branding", "advertisement"]):
-                return self._handle_branding_query(message)
-            
-            elif any(word in message for word in ["prediction", "risk", "failure", "ml", "ai", "stats", "graph"]):
-                return self._handle_prediction_query(message)
-            
-            elif any(word in message for word in ["help", "support"]):
-                return self._handle_help_query()
-            
-            elif any(word in message for word in ["data", "statistics", "analytics"]):
-                return self._handle_data_query(message)
-            
-            else:
-                return self._handle_general_query(message)
-                
+            match = self._route(message, user_id)
+            yield "intent", match.to_dict()
+            cache_key = self.answer_cache.key(match)
+            cached = self.answer_cache.get(cache_key)
+            response = cached or self._dispatch(message, match)
         except Exception as e:
-            return self._create_error_response(f"Error processing message: {str(e)}")
+            response = self._create_error_response(f"Error processing message: {str(e)}")
+            match = None
+        
+        yield "message", {
+            "message": response.message,
+            "type": response.type,
+            "confidence_score": response.confidence_score,
+            "partial": response.partial,
+            "data": response.data
+        }
+        if response.explanation:
+            yield "explanation", response.explanation
+        if response.reasoning_steps:
+            yield "reasoning", response.reasoning_steps
+        if response.alternative_scenarios:
+            yield "alternatives", response.alternative_scenarios
+        
+        if match is not None:
+            self._record_turn(user_id, message, match, response)
+        
+        charts, self._deferred_charts = self._deferred_charts, None
+        if cached is not None:
+            for index, image in enumerate(cached.visualizations or []):
+                yield "chart", {"index": index, "name": None, "image": image}
+            self._log_turn(user_id, match, response, started, cache_hit=True, streamed=True)
+            yield "done", {"charts": len(cached.visualizations or []), "cached": True}
+            return
+        
+        names = {future: (index, name) for index, (name, future) in enumerate(charts)}
+        images: Dict[int, str] = {}
+        charts_started = time.perf_counter()
+        try:
+            for future in as_completed(names, timeout=chart_timeout):
+                index, name = names[future]
+                try:
+                    images[index] = future.result()
+                    yield "chart", {"index": index, "name": name, "image": images[index]}
+                except Exception as e:
+                    yield "chart_error", {"index": index, "name": name, "error": str(e)}
+        except FutureTimeoutError:
+            yield "chart_error", {"error": f"Charts not ready after {chart_timeout}s"}
+        if charts:
+            self._timings["charts"] = (time.perf_counter() - charts_started) * 1000
+        
+        # Cache the complete answer only once every chart is in
+        if (cache_key is not None and response.type != "error" and not response.partial
+                and len(images) == len(charts)):
+            self.answer_cache.put(cache_key, replace(
+                response, visualizations=[images[i] for i in range(len(charts))] or response.visualizations
+            ))
+        
+        self._log_turn(user_id, match, response, started, cache_hit=False, streamed=True)
+        yield "done", {"charts": len(charts), "cached": False}
+    
+    def _route(self, message: str, user_id: int = None) -> IntentMatch:
+        # Load this user's conversation so follow-ups can build on earlier turns
+        self.user_context = self.context_store.get(user_id) if user_id else None
+        
+        # One pass over the message picks the intent and extracts entities
+        match = route_message(message)
+        previous_turn = self.user_context.last_turn if self.user_context else None
+        if previous_turn:
+            match = intent_router.resolve_follow_up(message, match, IntentMatch.from_dict(previous_turn))
+        return match
     
-    def _provide_detailed_explanation(self, message: str) -> ChatResponse:
+    def _record_turn(self, user_id: Optional[int], message: str, match: IntentMatch, response: ChatResponse):
+        if user_id:
+            turn = match.to_dict()
+            turn.update({
+                'timestamp': datetime.now().isoformat(),
+                'user_message': message,
+                'response_type': response.type
+            })
+            self.context_store.add_turn(user_id, turn)
+    
+    def _log_turn(self, user_id: Optional[int], match: Optional[IntentMatch], response: ChatResponse,
+                  started: float, cache_hit: bool, streamed: bool = False):
+        try:
+            get_transcript_log().record(
+                user_id=user_id,
+                intent=match.intent.value if match else None,
+                keywords=list(match.keywords) if match else [],
+                numbers=list(match.numbers) if match else [],
+                response_type=response.type,
+                total_ms=(time.perf_counter() - started) * 1000,
+                latencies=self._timings,
+                cache_hit=cache_hit,
+                partial=response.partial,
+                streamed=streamed
+            )
+        except Exception as e:
+            # Analytics must never cost the user an answer
+            logger.error(f"Error logging chatbot turn: {e}")
+    
+    @contextmanager
+    def _timed(self, engine: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            self._timings[engine] = self._timings.get(engine, 0.0) + elapsed
+    
+    def _render_charts(self, specs: List[ChartSpec]) -> List[str]:
+        """Render charts now, or queue them when streaming and return no images"""
+        renderer = get_chart_renderer()
+        if self._deferred_charts is not None:
+            self._deferred_charts.extend(zip([spec.name for spec in specs], renderer.submit_many(specs)))
+            return []
+        with self._timed("charts"):
+            return renderer.render_many(specs)
+    
+    def _load_plan_sections(self, plan_date: date, with_predictions: bool = False) -> SectionResults:
+        """Load the induction plan, fleet statistics and risk predictions concurrently"""
+        timeouts = self.SECTION_TIMEOUTS
+        sections = [
+            Section("plan", lambda db: get_optimizer(db).generate_induction_plan(plan_date),
+                    timeouts["plan"], default=[]),
+            Section("fleet", self._load_fleet_stats, timeouts["fleet"],
+                    default={"total": 0, "eligible": 0})
+        ]
+        if with_predictions:
+            # A follow-up in the same conversation reuses the fleet predictions
+            predictions = self.user_context.recall('predictions') if self.user_context else None
+            load = (lambda db: predictions) if predictions is not None else self._load_predictions
+            sections.append(Section("predictions", load, timeouts["predictions"], default=[]))
+        results = get_section_runner().run(sections)
+        for name, seconds in results.elapsed.items():
+            self._timings[name] = seconds * 1000
+        return results
+    
+    @staticmethod
+    def _load_fleet_stats(db: Session) -> Dict[str, int]:
+        trains = crud.trains.read_active_trains(db)
+        certificate_summary = crud.fitness.read_certificate_summary(db)
+        eligible = sum(1 for t in trains if certificate_summary.get(t.id, {}).get('latest_is_valid'))
+        return {"total": len(trains), "eligible": eligible}
+    
+    @staticmethod
+    def _load_predictions(db: Session) -> List:
+        model = get_ml_model(db)
+        if not model.is_trained:
+            raise RuntimeError("prediction model is not trained yet")
+        return model.predict_all_trains()
+    
+    def _partial_notice(self, sections: SectionResults) -> str:
+        if not sections.partial:
+            return ""
+        notes = "\n".join(f"- {note}" for note in sections.notes())
+        return f"""
+
+**⏱️ Partial Answer:** Some data could not be loaded in time, so this answer leaves it out:
+{notes}"""
+    
+    def _dispatch(self, message: str, match: IntentMatch) -> ChatResponse:
+        intent = match.intent
+        
+        if intent == Intent.EXPLANATION:
+            return self._provide_detailed_explanation(message, match)
+        elif intent == Intent.WHAT_IF:
+            return self._handle_what_if_scenario(message, match)
+        elif intent == Intent.SCHEDULE:
+            return self._handle_schedule_query(message)
+        elif intent == Intent.TRAIN:
+            return self._handle_train_query(message, match)
+        elif intent == Intent.MAINTENANCE:
+            return self._handle_maintenance_query(message)
+        elif intent == Intent.BRANDING:
+            return self._handle_branding_query(message)
+        elif intent == Intent.PREDICTION:
+            return self._handle_prediction_query(message, match)
+        elif intent == Intent.HELP:
+            return self._handle_help_query()
+        elif intent == Intent.DATA:
+            return self._handle_data_query(message)
+        else:
+            return self._handle_general_query(message)
+    
+    def _provide_detailed_explanation(self, message: str, match: IntentMatch = None) -> ChatResponse:
         """Provide detailed explanations for decisions and predictions"""
         try:
-            if "process" in message and "your" in message:
+            match = match or route_message(message)
+            if match.has("process") and match.has("your"):
                 return self._explain_ai_workings_complete()
-            elif "journey" in message:
-                return self._explain_decision_journey(message)
-            elif "induction" in message or "schedule" in message:
+            elif match.has("journey"):
+                return self._explain_decision_journey(message, match)
+            elif match.has("induction", "schedule"):
                 return self._explain_induction_planning()
-            elif "prediction" in message or "risk" in message or "failure" in message:
+            elif match.has("prediction", "risk", "failure"):
                 return self._explain_risk_prediction()
-            elif "maintenance" in message:
+            elif match.has("maintenance"):
                 return self._explain_maintenance_decisions()
-            elif "branding" in message:
+            elif match.has("branding"):
                 return self._explain_branding_prioritization()
-            elif "fitness" in message:
+            elif match.has("fitness"):
                 return self._explain_fitness_assessment()
-            elif "train" in message and "select" in message:
+            elif match.has("train") and match.has("select"):
                 return self._explain_train_selection()
             else:
                 return self._explain_general_ai_workings()
@@ -280,86 +496,11 @@ class TransparentChatbot:
     
     def _generate_system_architecture_visualization(self):
         """Generate system architecture diagram"""
-        images = []
-        
-        try:
-            # Create architecture diagram
-            plt.figure(figsize=(12, 8))
-            
-            # Define components
-            components = {
-                'Input Layer': ['User Queries', 'Context Data', 'Real-time Feeds'],
-                'Data Layer': ['Train Database', 'Maintenance Records', 'Fitness Certs', 'Branding Contracts'],
-                'AI Layer': ['Rule Engine', 'ML Engine', 'Optimizer'],
-                'Validation Layer': ['Rule Checking', 'Consistency Validation', 'Impact Assessment'],
-                'Output Layer': ['Decisions', 'Explanations', 'Visualizations', 'Alternatives']
-            }
-            
-            # Create flow diagram
-            y_pos = 0
-            for layer, items in components.items():
-                plt.text(0.1, y_pos, layer, fontsize=14, fontweight='bold', 
-                        bbox=dict(boxstyle="round,pad=0.3", facecolor="lightblue"))
-                
-                for i, item in enumerate(items):
-                    plt.text(0.3, y_pos - (i+1)*0.1, f"• {item}", fontsize=11)
-                
-                # Draw arrows between layers
-                if y_pos > 0:
-                    plt.arrow(0.5, y_pos - len(items)*0.05, 0.2, -0.3, 
-                             head_width=0.02, head_length=0.05, fc='gray', ec='gray')
-                
-                y_pos -= (len(items) + 1) * 0.15
-            
-            plt.xlim(0, 1)
-            plt.ylim(y_pos - 0.5, 0.5)
-            plt.axis('off')
-            plt.title('AI System Architecture', fontsize=16, fontweight='bold')
-            
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', dpi=150, bbox_inches='tight')
-            buf.seek(0)
-            images.append(base64.b64encode(buf.read()).decode('utf-8'))
-            plt.close()
-            
-            # Create data flow diagram
-            plt.figure(figsize=(10, 6))
-            
-            # Data sources
-            sources = ['User Query', 'Train DB', 'Maintenance', 'Fitness', 'Branding', 'Operations']
-            processes = ['Query Analysis', 'Data Fusion', 'AI Processing', 'Validation', 'Explanation']
-            
-            # Draw flow
-            for i, source in enumerate(sources):
-                plt.scatter(i, 2, s=200, c='lightgreen', edgecolors='black')
-                plt.text(i, 2.2, source, ha='center', fontsize=9)
-            
-            for i, process in enumerate(processes):
-                plt.scatter(i, 1, s=200, c='lightcoral', edgecolors='black')
-                plt.text(i, 0.8, process, ha='center', fontsize=9)
-            
-            # Connect with arrows
-            for i in range(len(sources)-1):
-                plt.arrow(i, 1.9, 1, 0, head_width=0.05, fc='blue', ec='blue', alpha=0.7)
-            
-            for i in range(len(processes)-1):
-                plt.arrow(i, 1.1, 1, 0, head_width=0.05, fc='red', ec='red', alpha=0.7)
-            
-            plt.xlim(-0.5, max(len(sources), len(processes)) - 0.5)
-            plt.ylim(0.5, 2.5)
-            plt.axis('off')
-            plt.title('Data Flow Process', fontsize=14)
-            
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', dpi=150, bbox_inches='tight')
-            buf.seek(0)
-            images.append(base64.b64encode(buf.read()).decode('utf-8'))
-            plt.close()
-            
-        except Exception as e:
-            print(f"Architecture visualization error: {e}")
-        
-        return images
+        # Both diagrams are data-independent and cached after the first render
+        return self._render_charts([
+            ChartSpec('system_architecture', draw_system_architecture, figsize=(12, 8), static=True),
+            ChartSpec('data_flow', draw_data_flow, figsize=(10, 6), static=True),
+        ])
     
     def _explain_general_ai_workings(self) -> ChatResponse:
         """Explain general AI workings when no specific topic is requested"""
@@ -488,12 +629,11 @@ I use three complementary AI approaches:
             confidence_score=0.85
         )
 
-    def _explain_decision_journey(self, message: str) -> ChatResponse:
+    def _explain_decision_journey(self, message: str, match: IntentMatch = None) -> ChatResponse:
         """Explain the complete journey of a specific decision"""
         try:
-            # Extract train number if mentioned
-            train_numbers = [int(s) for s in re.findall(r'\d+', message)]
-            train_id = train_numbers[0] if train_numbers else None
+            # Train number extracted by the router, if mentioned
+            train_id = (match or route_message(message)).train_number
             
             if train_id:
                 return self._explain_specific_train_journey(train_id)
@@ -590,50 +730,25 @@ I use three complementary AI approaches:
     
     def _generate_train_journey_visualizations(self, train, fitness, maintenance, job_cards, branding):
         """Generate visualizations for train journey explanation"""
-        images = []
-        
         try:
-            # Visualization 1: Maintenance History Timeline
-            plt.figure(figsize=(10, 4))
-            if maintenance:
-                dates = [m.date for m in maintenance]
-                types = [m.type for m in maintenance]
-                
-                # Convert to numerical for plotting
-                type_map = {typ: i for i, typ in enumerate(set(types))}
-                type_nums = [type_map[typ] for typ in types]
-                
-                plt.scatter(dates, type_nums, c=type_nums, cmap='viridis', s=100)
-                plt.yticks(range(len(type_map)), list(type_map.keys()))
-                plt.xlabel('Date')
-                plt.title(f'Maintenance History - Train {train.train_number}')
-                plt.grid(True, alpha=0.3)
-                
-                buf = io.BytesIO()
-                plt.savefig(buf, format='png', dpi=150, bbox_inches='tight')
-                buf.seek(0)
-                images.append(base64.b64encode(buf.read()).decode('utf-8'))
-                plt.close()
-            
-            # Visualization 2: Risk Factors Pie Chart
-            plt.figure(figsize=(6, 6))
+            # Extract plain data here so workers never touch ORM objects
             factors = self._calculate_train_factors(train, fitness, maintenance, job_cards, branding)
-            labels = [f[0] for f in factors[:5]]
-            values = [f[1] for f in factors[:5]]
-            
-            plt.pie(values, labels=labels, autopct='%1.1f%%', startangle=90)
-            plt.title(f'Risk Factors Distribution - Train {train.train_number}')
-            
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', dpi=150, bbox_inches='tight')
-            buf.seek(0)
-            images.append(base64.b64encode(buf.read()).decode('utf-8'))
-            plt.close()
-            
+            specs = []
+            if maintenance:
+                specs.append(ChartSpec(
+                    'maintenance_history', draw_maintenance_history,
+                    {'train_number': train.train_number, 'events': [(m.date, m.type) for m in maintenance]},
+                    figsize=(10, 4)
+                ))
+            specs.append(ChartSpec(
+                'train_factors', draw_factor_pie,
+                {'train_number': train.train_number, 'factors': factors[:5]},
+                figsize=(6, 6)
+            ))
+            return self._render_charts(specs)
         except Exception as e:
-            print(f"Visualization error: {e}")
-        
-        return images
+            logger.error(f"Visualization error: {e}")
+            return []
     
     def _calculate_train_factors(self, train, fitness, maintenance, job_cards, branding):
         """Calculate importance factors for a specific train"""
@@ -735,7 +850,8 @@ I use three complementary AI approaches:
             # Get comprehensive model information
             feature_importance = self.ml_model.get_feature_importance()
             model_info = self.ml_model.get_model_info()
-            predictions = self.ml_model.predict_all_trains()
+            with self._timed("predictions"):
+                predictions = self.ml_model.predict_all_trains()
             
             # Generate visualizations
             viz_images = self._generate_risk_prediction_visualizations(predictions, feature_importance)
@@ -854,71 +970,34 @@ I use three complementary AI approaches:
     
     def _generate_risk_prediction_visualizations(self, predictions, feature_importance):
         """Generate comprehensive visualizations for risk prediction"""
-        images = []
-        
-        try:
-            # Visualization 1: Risk Distribution Pie Chart
-            plt.figure(figsize=(8, 6))
-            risk_counts = Counter([p.risk_level for p in predictions])
-            labels = [f"{risk.title()} ({count})" for risk, count in risk_counts.items()]
-            sizes = list(risk_counts.values())
-            colors = ['green', 'yellow', 'orange', 'red'][:len(sizes)]
-            
-            plt.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
-            plt.title('Train Failure Risk Distribution')
-            
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', dpi=150, bbox_inches='tight')
-            buf.seek(0)
-            images.append(base64.b64encode(buf.read()).decode('utf-8'))
-            plt.close()
-            
-            # Visualization 2: Feature Importance Bar Chart
-            plt.figure(figsize=(10, 6))
-            top_features = sorted(feature_importance.items(), key=lambda x: x[1], reverse=True)[:10]
-            features, importance = zip(*top_features)
-            
-            y_pos = np.arange(len(features))
-            plt.barh(y_pos, importance, color='skyblue')
-            plt.yticks(y_pos, features)
-            plt.xlabel('Feature Importance')
-            plt.title('Top 10 Risk Prediction Factors')
-            plt.gca().invert_yaxis()
-            
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', dpi=150, bbox_inches='tight')
-            buf.seek(0)
-            images.append(base64.b64encode(buf.read()).decode('utf-8'))
-            plt.close()
-            
-            # Visualization 3: Probability Distribution
-            plt.figure(figsize=(8, 6))
-            probabilities = [p.failure_probability for p in predictions]
-            plt.hist(probabilities, bins=20, alpha=0.7, color='blue', edgecolor='black')
-            plt.xlabel('Failure Probability')
-            plt.ylabel('Number of Trains')
-            plt.title('Failure Probability Distribution Across Trains')
-            plt.grid(True, alpha=0.3)
-            
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', dpi=150, bbox_inches='tight')
-            buf.seek(0)
-            images.append(base64.b64encode(buf.read()).decode('utf-8'))
-            plt.close()
-            
-        except Exception as e:
-            print(f"Visualization generation error: {e}")
-        
-        return images
+        return self._render_charts(self._risk_prediction_chart_specs(predictions, feature_importance))
+    
+    def _risk_prediction_chart_specs(self, predictions, feature_importance) -> List[ChartSpec]:
+        specs = [
+            ChartSpec('risk_distribution', draw_risk_distribution,
+                      dict(Counter([p.risk_level for p in predictions]))),
+        ]
+        top_features = sorted(feature_importance.items(), key=lambda x: x[1], reverse=True)[:10]
+        if top_features:
+            specs.append(ChartSpec('feature_importance', draw_feature_importance,
+                                   [(name, float(value)) for name, value in top_features], figsize=(10, 6)))
+        specs.append(ChartSpec('probability_histogram', draw_probability_histogram,
+                               [round(p.failure_probability, 6) for p in predictions]))
+        return specs
     
     def _explain_induction_planning(self) -> ChatResponse:
         """Explain how induction planning works with complete transparency"""
         try:
             plan_date = date.today() + timedelta(days=1)
-            induction_plan = self.optimizer.generate_induction_plan(plan_date)
+            # The plan, fleet statistics and predictions are independent; load them side by side
+            sections = self._load_plan_sections(plan_date, with_predictions=True)
+            induction_plan = sections.get("plan")
+            fleet = sections.get("fleet")
+            predictions = sections.get("predictions")
+            if sections.has("predictions") and self.user_context:
+                self.user_context.remember('predictions', predictions)
             
             # Get detailed optimization metrics
-            trains = crud.trains.read_active_trains(self.db)
             service_trains = [p for p in induction_plan if p['induction_type'] == 'service']
             maintenance_trains = [p for p in induction_plan if p['induction_type'] == 'maintenance']
             
@@ -969,9 +1048,11 @@ I use three complementary AI approaches:
             )
             
             # Generate detailed reasoning with metrics
-            total_trains = len(trains)
-            eligible_trains = len([t for t in trains if self._is_train_eligible(t)])
+            total_trains = fleet["total"]
+            eligible_trains = fleet["eligible"]
             utilization_rate = len(service_trains) / eligible_trains if eligible_trains > 0 else 0
+            eligibility_rate = eligible_trains / total_trains * 100 if total_trains > 0 else 0
+            high_risk_trains = [p for p in predictions if p.risk_level in ["high", "critical"]]
             
             reasoning_steps = [
                 f"📅 Planning for: {plan_date.strftime('%Y-%m-%d')}",
@@ -985,6 +1066,9 @@ I use three complementary AI approaches:
                 "💡 Priority given to trains with expiring branding contracts",
                 "🔄 Balanced rotation to ensure even wear across fleet"
             ]
+            if predictions:
+                reasoning_steps.append(f"⚠️ High failure risk: {len(high_risk_trains)} trains flagged by the ML model")
+            reasoning_steps.extend(f"⏱️ Left out: {note}" for note in sections.notes())
             
             message = f"""**📋 Complete Induction Planning Explanation**
 
@@ -996,16 +1080,17 @@ I use three complementary AI approaches:
 5. **Branding Compliance**: Ensure contract exposure requirements are met
 
 **📊 Key Metrics:**
-- **Eligibility Rate**: {eligible_trains}/{total_trains} ({eligible_trains/total_trains*100:.1f}%) trains ready
+- **Eligibility Rate**: {eligible_trains}/{total_trains} ({eligibility_rate:.1f}%) trains ready
 - **Service Utilization**: {utilization_rate:.1%} of eligible trains deployed
 - **Maintenance Coverage**: {len(maintenance_trains)} trains receiving care
+- **Failure Risk**: {len(high_risk_trains)} of {len(predictions)} assessed trains at high risk
 - **Optimization Score**: Balanced across 7 key factors
 
 **⚖️ Decision Factors (Weighted):**
 {self._format_factors(explanation.factors)}
 
 **💡 AI Reasoning:**
-The system prioritizes safety (fitness) first, then addresses urgent maintenance, while maximizing service coverage and meeting branding commitments."""
+The system prioritizes safety (fitness) first, then addresses urgent maintenance, while maximizing service coverage and meeting branding commitments.""" + self._partial_notice(sections)
 
             return ChatResponse(
                 message=message,
@@ -1013,20 +1098,28 @@ The system prioritizes safety (fitness) first, then addresses urgent maintenance
                 type="explanation",
                 explanation=explanation,
                 reasoning_steps=reasoning_steps,
-                confidence_score=0.88
+                confidence_score=0.5 if sections.partial else 0.88,
+                partial=sections.partial
             )
             
         except Exception as e:
             return self._create_error_response(f"Error explaining induction planning: {str(e)}")
     
-    def _is_train_eligible(self, train):
-        """Check if a train is eligible for service"""
+    def _is_train_eligible(self, train, certificate_summary: Dict[int, Dict] = None):
+        """Check if a train is eligible for service (its latest certificate is valid)"""
         try:
-            fitness = crud.fitness_certificates.read_certificates_by_train(self.db, train.id)
-            return fitness and fitness[-1].is_valid
+            if certificate_summary is None:
+                certificate_summary = crud.fitness.read_certificate_summary(self.db, [train.id])
+            summary = certificate_summary.get(train.id)
+            return bool(summary and summary['latest_is_valid'])
         except:
             return False
     
+    def _count_eligible_trains(self, trains) -> int:
+        """Count eligible trains with one grouped certificate query"""
+        certificate_summary = crud.fitness.read_certificate_summary(self.db)
+        return sum(1 for t in trains if self._is_train_eligible(t, certificate_summary))
+    
     def _explain_fitness_assessment(self) -> ChatResponse:
         """Explain how train fitness is assessed"""
         explanation = Explanation(
@@ -1071,7 +1164,7 @@ The system prioritizes safety (fitness) first, then addresses urgent maintenance
         
         # Get current fitness statistics
         trains = crud.trains.read_active_trains(self.db)
-        fit_trains = len([t for t in trains if self._is_train_eligible(t)])
+        fit_trains = self._count_eligible_trains(trains)
         fitness_rate = fit_trains / len(trains) if trains else 0
         
         reasoning_steps = [
@@ -1115,15 +1208,29 @@ The system prioritizes safety (fitness) first, then addresses urgent maintenance
             confidence_score=0.92
         )
     
-    def _handle_prediction_query(self, message: str) -> ChatResponse:
+    def _handle_prediction_query(self, message: str, match: IntentMatch = None) -> ChatResponse:
         """Handle prediction queries with complete transparency"""
         try:
-            if not self.ml_model.is_trained:
-                training_result = self.ml_model.train_model()
-                if not training_result["success"]:
-                    return self._create_error_response("Prediction model needs training. Please try again later.")
+            match = match or route_message(message)
+            # A follow-up in the same conversation reuses the fleet predictions
+            predictions = self.user_context.recall('predictions') if self.user_context else None
+            
+            if predictions is None:
+                if not self.ml_model.is_trained:
+                    training_result = self.ml_model.train_model()
+                    if not training_result["success"]:
+                        return self._create_error_response("Prediction model needs training. Please try again later.")
+                
+                with self._timed("predictions"):
+                    predictions = self.ml_model.predict_all_trains()
+                if self.user_context:
+                    self.user_context.remember('predictions', predictions)
+            
+            if match.train_number is not None:
+                train_prediction = next((p for p in predictions if p.train_id == match.train_number), None)
+                if train_prediction:
+                    return self._single_train_prediction_response(train_prediction)
             
-            predictions = self.ml_model.predict_all_trains()
             high_risk_trains = [p for p in predictions if p.risk_level in ["high", "critical"]]
             
             # Generate comprehensive explanation
@@ -1211,6 +1318,28 @@ The system prioritizes safety (fitness) first, then addresses urgent maintenance
         except Exception as e:
             return self._create_error_response(f"Error generating predictions: {str(e)}")
     
+    def _single_train_prediction_response(self, prediction) -> ChatResponse:
+        """Summarise the prediction for one train"""
+        message = f"""**🔍 Risk Prediction - Train {prediction.train_number}**
+
+• Failure Probability: {prediction.failure_probability:.1%}
+• Risk Level: {prediction.risk_level.upper()}
+• Likely Failure Type: {prediction.predicted_failure_type or 'None identified'}
+• Model Confidence: {prediction.confidence:.1%}
+
+**💡 Recommendation:** {prediction.recommendation}"""
+
+        return ChatResponse(
+            message=message,
+            data=prediction,
+            type="prediction",
+            reasoning_steps=[
+                f"Model used: {prediction.model_used}",
+                f"Predicted at: {prediction.prediction_timestamp.strftime('%Y-%m-%d %H:%M')}"
+            ],
+            confidence_score=prediction.confidence
+        )
+    
     def _generate_alternative_scenarios(self, predictions: List) -> List[Dict]:
         """Generate detailed alternative scenarios for predictions"""
         high_risk = len([p for p in predictions if p.risk_level in ["high", "critical"]])
@@ -1267,14 +1396,16 @@ The system prioritizes safety (fitness) first, then addresses urgent maintenance
         """Handle data and analytics queries with comprehensive insights"""
         try:
             # Get comprehensive data overview
+            # A fixed number of queries regardless of fleet size
             trains = crud.trains.read_active_trains(self.db)
             open_jobs = crud.job_cards.read_open_job_cards(self.db)
             contracts = crud.branding.read_active_contracts(self.db)
-            fitness_certs = [crud.fitness_certificates.read_certificates_by_train(self.db, t.id) for t in trains]
+            certificate_summary = crud.fitness.read_certificate_summary(self.db)
             
             # Calculate detailed statistics
-            valid_fitness = sum(1 for certs in fitness_certs if certs and certs[-1].is_valid)
-            urgent_jobs = len([j for j in open_jobs if j.priority == 'high'])
+            valid_fitness = sum(1 for t in trains if self._is_train_eligible(t, certificate_summary))
+            # Job cards carry no priority column yet
+            urgent_jobs = len([j for j in open_jobs if getattr(j, 'priority', None) == 'high'])
             contracts_needing_exposure = len([c for c in contracts if c.exposure_hours_fulfilled < c.exposure_hours_required * 0.8])
             
             avg_train_age = np.mean([self._calculate_train_age(t) for t in trains]) if trains else 0
@@ -1435,27 +1566,32 @@ I'm here to be completely transparent about how I work! What would you like me t
         """Handle schedule-related queries with complete transparency"""
         try:
             plan_date = date.today() + timedelta(days=1)
-            induction_plan = self.optimizer.generate_induction_plan(plan_date)
+            sections = self._load_plan_sections(plan_date)
+            induction_plan = sections.get("plan")
+            fleet = sections.get("fleet")
             
             service_trains = [p for p in induction_plan if p['induction_type'] == 'service']
             standby_trains = [p for p in induction_plan if p['induction_type'] == 'standby']
             maintenance_trains = [p for p in induction_plan if p['induction_type'] == 'maintenance']
             
             # Get detailed reasoning
-            trains = crud.trains.read_active_trains(self.db)
-            eligible_trains = len([t for t in trains if self._is_train_eligible(t)])
+            total_trains = fleet["total"]
+            eligible_trains = fleet["eligible"]
+            ready_rate = eligible_trains / total_trains * 100 if total_trains > 0 else 0
+            deployment_rate = len(service_trains) / eligible_trains * 100 if eligible_trains > 0 else 0
             
             reasoning_steps = [
                 f"📅 Planning horizon: {plan_date.strftime('%Y-%m-%d')}",
-                f"🚂 Total operational trains: {len(trains)}",
+                f"🚂 Total operational trains: {total_trains}",
                 f"✅ Eligible for service: {eligible_trains}",
                 f"🎯 Service allocation: {len(service_trains)} trains",
                 f"🔄 Standby reserve: {len(standby_trains)} trains",
                 f"🔧 Maintenance priority: {len(maintenance_trains)} trains",
-                f"📊 Utilization rate: {len(service_trains)/eligible_trains*100:.1f}% of eligible fleet",
+                f"📊 Utilization rate: {deployment_rate:.1f}% of eligible fleet",
                 "⚖️ Optimization criteria: Safety > Maintenance > Service > Branding",
                 "💡 Decision logic: Maximize service while ensuring maintenance compliance"
             ]
+            reasoning_steps.extend(f"⏱️ Left out: {note}" for note in sections.notes())
             
             message = f"""**📋 Induction Plan for {plan_date.strftime('%Y-%m-%d')} - Complete Transparency**
 
@@ -1466,9 +1602,9 @@ I'm here to be completely transparent about how I work! What would you like me t
 • **Total Planned**: {len(induction_plan)} trains
 
 **📊 Fleet Utilization:**
-• Total Available: {len(trains)} trains
-• Service Ready: {eligible_trains} trains ({eligible_trains/len(trains)*100:.1f}%)
-• Service Deployment: {len(service_trains)} trains ({len(service_trains)/eligible_trains*100:.1f}% of ready fleet)
+• Total Available: {total_trains} trains
+• Service Ready: {eligible_trains} trains ({ready_rate:.1f}%)
+• Service Deployment: {len(service_trains)} trains ({deployment_rate:.1f}% of ready fleet)
 
 **🔍 Selection Rationale:**
 - **Safety First**: Only trains with valid fitness certificates considered
@@ -1477,27 +1613,27 @@ I'm here to be completely transparent about how I work! What would you like me t
 - **Branding Compliance**: Contract exposure requirements factored in
 
 **💡 AI Reasoning:**
-This plan balances immediate service needs with long-term fleet health, ensuring safety compliance while maximizing operational efficiency."""
+This plan balances immediate service needs with long-term fleet health, ensuring safety compliance while maximizing operational efficiency.""" + self._partial_notice(sections)
 
             return ChatResponse(
                 message=message,
                 data=induction_plan,
                 type="induction_plan",
                 reasoning_steps=reasoning_steps,
-                confidence_score=0.88
+                confidence_score=0.5 if sections.partial else 0.88,
+                partial=sections.partial
             )
             
         except Exception as e:
             return self._create_error_response(f"Error generating schedule: {str(e)}")
     
-    def _handle_train_query(self, message: str) -> ChatResponse:
+    def _handle_train_query(self, message: str, match: IntentMatch = None) -> ChatResponse:
         """Handle train-specific queries with detailed status"""
         try:
-            # Extract train number if mentioned
-            train_numbers = [int(s) for s in re.findall(r'\d+', message)]
+            # Train number extracted by the router, if mentioned
+            train_id = (match or route_message(message)).train_number
             
-            if train_numbers:
-                train_id = train_numbers[0]
+            if train_id:
                 return self._explain_specific_train_journey(train_id)
             else:
                 # General train status overview
@@ -1535,11 +1671,14 @@ This plan balances immediate service needs with long-term fleet health, ensuring
         needs_maintenance = 0
         under_maintenance = 0
         
+        # Two grouped queries for the whole fleet instead of two per train
+        certificate_summary = crud.fitness.read_certificate_summary(self.db)
+        open_job_counts = crud.job_cards.count_open_job_cards_by_train(self.db)
+        
         for train in trains:
-            if self._is_train_eligible(train):
+            if self._is_train_eligible(train, certificate_summary):
                 # Check if has open job cards
-                job_cards = crud.job_cards.read_job_cards_by_train(self.db, train.id)
-                open_jobs = len([j for j in job_cards if j.status == 'open'])
+                open_jobs = open_job_counts.get(train.id, 0)
                 
                 if open_jobs > 0:
                     needs_maintenance += 1
@@ -1849,17 +1988,18 @@ This plan balances immediate service needs with long-term fleet health, ensuring
             confidence_score=0.85
         )
     
-    def _handle_what_if_scenario(self, message: str) -> ChatResponse:
+    def _handle_what_if_scenario(self, message: str, match: IntentMatch = None) -> ChatResponse:
         """Handle what-if scenarios with detailed simulation"""
         try:
-            numbers = [int(s) for s in re.findall(r'\d+', message)]
+            match = match or route_message(message)
+            numbers = match.numbers
             
-            if "add" in message and "train" in message and numbers:
+            if match.has("add") and match.has("train") and numbers:
                 return self._simulate_additional_trains(numbers[0])
-            elif "maintenance" in message and numbers:
+            elif match.has("maintenance") and numbers:
                 return self._simulate_maintenance_scenario(numbers[0])
-            elif "branding" in message:
-                return self._simulate_branding_scenario(message)
+            elif match.has("branding"):
+                return self._simulate_branding_scenario(message, numbers[0] if numbers else 1)
             else:
                 return ChatResponse(
                     "I can simulate various operational scenarios. Try: 'What if we add 2 trains?' or 'What if maintenance takes 3 days longer?'",
@@ -1870,94 +2010,86 @@ This plan balances immediate service needs with long-term fleet health, ensuring
             return self._create_error_response(f"Error processing what-if scenario: {str(e)}")
     
     def _simulate_additional_trains(self, additional_trains: int) -> ChatResponse:
-        """Simulate adding additional trains"""
-        current_trains = len(crud.trains.read_active_trains(self.db))
-        new_total = current_trains + additional_trains
+        """Simulate adding additional trains by re-solving the plan on a fleet copy"""
+        with self._timed("scenario"):
+            result = get_scenario_engine().simulate_additional_trains(self.db, additional_trains)
+        added = result.scenario_counts["service"] - result.baseline_counts["service"]
         
-        staffing_impact = additional_trains * 0.5
-        cleaning_impact = additional_trains * 2
-        maintenance_impact = additional_trains * 0.3
+        recommendations = [
+            f"{added} extra trains would enter service; the rest strengthen standby and maintenance rotation"
+            if added > 0 else "Service limits already cap the fleet in service; extra trains add standby capacity only",
+            "Assess maintenance bay capacity before proceeding",
+            "Plan for phased implementation to manage disruption"
+        ]
+        return self._scenario_response(result, recommendations, confidence=0.8)
+    
+    def _simulate_maintenance_scenario(self, days: int) -> ChatResponse:
+        """Simulate maintenance taking longer by re-solving the plan on a fleet copy"""
+        with self._timed("scenario"):
+            result = get_scenario_engine().simulate_maintenance_extension(self.db, days)
+        lost = result.baseline_counts["service"] - result.scenario_counts["service"]
         
-        reasoning_steps = [
-            f"Current active trains: {current_trains}",
-            f"Proposed additional trains: {additional_trains}",
-            f"New total: {new_total} trains",
-            f"Staffing impact: {staffing_impact:.1f} additional scheduling staff",
-            f"Cleaning impact: {cleaning_impact} additional cleaning staff",
-            f"Maintenance impact: {maintenance_impact:.1f} additional maintenance slots needed"
+        recommendations = [
+            f"Service fleet shrinks by {lost} trains; activate standby trains early" if lost > 0
+            else "Service level holds; standby and maintenance absorb the delay",
+            f"Prioritise the {len(result.details['delayed_trains'])} trains queuing for maintenance",
+            "Implement predictive maintenance to reduce unexpected repairs"
         ]
+        return self._scenario_response(result, recommendations, confidence=0.75)
+    
+    def _simulate_branding_scenario(self, message: str, contracts: int = 1) -> ChatResponse:
+        """Simulate new branding contracts by re-solving the plan on a fleet copy"""
+        with self._timed("scenario"):
+            result = get_scenario_engine().simulate_branding_contracts(self.db, contracts)
+        branded = result.details["branded_trains"]
+        
+        recommendations = [
+            f"Keep {', '.join(branded[:5])} in service rotation to build exposure hours" if branded
+            else "No available unbranded trains; new contracts would need to share trains",
+            "Check route compatibility with advertiser targets",
+            "Review exposure progress weekly against contract deadlines"
+        ]
+        return self._scenario_response(result, recommendations, confidence=0.72)
+    
+    def _scenario_response(self, result, recommendations: List[str], confidence: float) -> ChatResponse:
+        """Format a simulated plan against the current baseline"""
+        def counts_line(counts: Dict[str, int]) -> str:
+            return f"{counts['service']} service / {counts['standby']} standby / {counts['maintenance']} maintenance"
+        
+        changes = "\n".join(
+            f"- {change['train_number']}: {change['from']} → {change['to']}" for change in result.changes[:8]
+        ) or "- No assignment changes"
+        if len(result.changes) > 8:
+            changes += f"\n- ...and {len(result.changes) - 8} more"
         
-        message = f"""**🔮 Scenario Analysis: Adding {additional_trains} Trains**
+        message = f"""**🔮 Scenario Analysis: {result.title}**
 
-**📊 Baseline vs Projection:**
-- Current Fleet: {current_trains} trains
-- Proposed Fleet: {new_total} trains
-- Increase: {additional_trains} trains ({additional_trains/current_trains*100:.1f}% growth)
+**📊 Baseline vs Simulated Plan:**
+- Current Plan: {counts_line(result.baseline_counts)}
+- Simulated Plan: {counts_line(result.scenario_counts)}
+- Average Service Score: {result.baseline_service_score:.2f} → {result.scenario_service_score:.2f}
 
-**📈 Operational Impacts:**
-- **Staffing**: {staffing_impact:.1f} additional scheduling staff required
-- **Cleaning**: {cleaning_impact} additional cleaning staff needed
-- **Maintenance**: {maintenance_impact:.1f} additional weekly maintenance slots
-- **Training**: {additional_trains * 0.2:.1f} weeks of additional staff training
+**🔄 Assignment Changes ({len(result.changes)}):**
+{changes}
+
+**⚠️ Constraint Check:** {'; '.join(result.violations) if result.violations else 'All induction constraints satisfied'}
 
 **💡 Recommendations:**
-- Assess maintenance bay capacity before proceeding
-- Plan for phased implementation to manage disruption
-- Consider impact on existing maintenance schedules"""
+{chr(10).join(f'- {r}' for r in recommendations)}"""
 
+        reasoning_steps = [
+            "Cloned the current fleet snapshot in memory (database untouched)",
+            *[f"Assumption: {a}" for a in result.assumptions],
+            f"Re-solved the induction plan for {result.fleet_size} trains",
+            f"Simulation completed in {result.elapsed_ms:.0f} ms"
+        ]
+        
         return ChatResponse(
             message=message,
-            data={
-                "additional_trains": additional_trains,
-                "staffing_impact": staffing_impact,
-                "cleaning_impact": cleaning_impact,
-                "maintenance_impact": maintenance_impact
-            },
+            data=result.to_dict(),
+            type="what_if",
             reasoning_steps=reasoning_steps,
-            confidence_score=0.75
-        )
-    
-    def _simulate_maintenance_scenario(self, days: int) -> ChatResponse:
-        """Simulate maintenance duration scenario"""
-        message = f"""**🔮 Scenario Analysis: {days}-Day Maintenance Duration**
-
-**📊 Impact Assessment:**
-- Extended maintenance duration: {days} days vs standard 2-3 days
-- Reduced train availability during maintenance periods
-- Potential service disruption if multiple trains affected simultaneously
-
-**📈 Operational Impacts:**
-- **Capacity Reduction**: Up to {days/3:.1f}x longer maintenance cycles
-- **Scheduling Complexity**: Increased challenge in maintaining service levels
-- **Resource Strain**: Maintenance team capacity stretched {days/2:.1f}x longer
-
-**💡 Mitigation Strategies:**
-- Implement predictive maintenance to reduce unexpected repairs
-- Increase standby train allocation by {days*0.5:.0f}%
-- Optimize maintenance workflows to improve efficiency
-- Consider outsourcing during peak maintenance periods"""
-
-        return ChatResponse(
-            message=message,
-            confidence_score=0.70
-        )
-    
-    def _simulate_branding_scenario(self, message: str) -> ChatResponse:
-        """Simulate branding scenario"""
-        return ChatResponse(
-            message="""**🔮 Branding Scenario Analysis**
-
-**📊 Potential Scenarios:**
-- **New High-Value Contract**: Increased revenue but requires prime train allocation
-- **Contract Expansion**: More exposure hours needing additional train capacity
-- **Route Optimization**: Better visibility but may conflict with operational needs
-
-**💡 Consideration Factors:**
-- Train availability and fitness status
-- Route compatibility with branding targets
-- Impact on maintenance schedules
-- Revenue potential vs operational constraints""",
-            confidence_score=0.68
+            confidence_score=confidence
         )
     
     def _handle_maintenance_query(self, message: str) -> ChatResponse:
@@ -2076,6 +2208,7 @@ I encountered an error while processing your request. Here's what happened:
 - Request a simpler explanation
 
 **My Commitment:** Even when things go wrong, I'm transparent about what happened and why.""",
+            type="error",
             reasoning_steps=reasoning_steps,
             confidence_score=0.0
         )
@@ -0,0 +1,200 @@
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import json
+import os
+import sqlite3
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ConversationContext:
+    """Conversation state for one user.
+
+    ``turns`` is a ring buffer of the most recent exchanges. ``working_set``
+    holds data loaded while answering (e.g. fleet predictions) so follow-up
+    questions can reuse it; it lives in memory only and each entry expires
+    on its own.
+    """
+
+    def __init__(self, user_id: int, max_turns: int, turns: List[Dict[str, Any]] = None,
+                 last_interaction: datetime = None):
+        self.user_id = user_id
+        self.turns: Deque[Dict[str, Any]] = deque(turns or [], maxlen=max_turns)
+        self.last_interaction = last_interaction or datetime.now()
+        self.working_set: Dict[str, Tuple[datetime, Any]] = {}
+
+    @property
+    def last_turn(self) -> Optional[Dict[str, Any]]:
+        return self.turns[-1] if self.turns else None
+
+    def remember(self, key: str, value: Any):
+        self.working_set[key] = (datetime.now(), value)
+
+    def recall(self, key: str, max_age: timedelta = timedelta(minutes=5)) -> Any:
+        entry = self.working_set.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if datetime.now() - stored_at > max_age:
+            del self.working_set[key]
+            return None
+        return value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "turns": list(self.turns),
+            "last_intent": self.last_turn["intent"] if self.turns else None,
+            "cached_data": sorted(self.working_set),
+        }
+
+
+class ConversationContextStore:
+    """Per-user conversation contexts with bounded memory.
+
+    At most ``max_users`` contexts are kept in memory (least recently used are
+    dropped first) and each keeps at most ``max_turns`` turns. Contexts idle
+    for longer than ``ttl`` are evicted. When ``db_path`` is set, turns are
+    written through to a SQLite file so context survives restarts and is
+    shared between worker processes.
+    """
+
+    def __init__(self, max_turns: int = 20, ttl: timedelta = timedelta(hours=1),
+                 max_users: int = 1000, db_path: str = None):
+        self.max_turns = max_turns
+        self.ttl = ttl
+        self.max_users = max_users
+        self.db_path = db_path
+        self._contexts: "OrderedDict[int, ConversationContext]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._conn = self._connect() if db_path else None
+
+    def get(self, user_id: int, create: bool = True) -> Optional[ConversationContext]:
+        with self._lock:
+            context = self._contexts.get(user_id)
+            if context is not None and self._expired(context):
+                self._drop(user_id)
+                context = None
+
+            if context is None:
+                context = self._load(user_id)
+                if context is None:
+                    if not create:
+                        return None
+                    context = ConversationContext(user_id, self.max_turns)
+                self._contexts[user_id] = context
+
+            self._contexts.move_to_end(user_id)
+            self._evict()
+            return context
+
+    def add_turn(self, user_id: int, turn: Dict[str, Any]) -> ConversationContext:
+        with self._lock:
+            context = self.get(user_id)
+            context.turns.append(turn)
+            context.last_interaction = datetime.now()
+            self._persist(context)
+            return context
+
+    def snapshot(self, user_id: int) -> Optional[Dict[str, Any]]:
+        context = self.get(user_id, create=False)
+        if context is None:
+            return None
+        return {
+            "user_id": user_id,
+            "context": context.to_dict(),
+            "last_interaction": context.last_interaction.isoformat(),
+        }
+
+    def clear(self, user_id: int) -> bool:
+        with self._lock:
+            existed = self._contexts.pop(user_id, None) is not None
+            if self._conn is not None:
+                cursor = self._conn.execute("DELETE FROM conversation_context WHERE user_id = ?", (user_id,))
+                self._conn.commit()
+                existed = existed or cursor.rowcount > 0
+            return existed
+
+    def evict_expired(self) -> int:
+        """Drop idle contexts from memory and the persistent tier"""
+        with self._lock:
+            expired = [user_id for user_id, context in self._contexts.items() if self._expired(context)]
+            for user_id in expired:
+                self._drop(user_id)
+            if self._conn is not None:
+                cutoff = (datetime.now() - self.ttl).timestamp()
+                self._conn.execute("DELETE FROM conversation_context WHERE last_interaction < ?", (cutoff,))
+                self._conn.commit()
+            return len(expired)
+
+    def _expired(self, context: ConversationContext) -> bool:
+        return datetime.now() - context.last_interaction > self.ttl
+
+    def _drop(self, user_id: int):
+        self._contexts.pop(user_id, None)
+
+    def _evict(self):
+        # Expired contexts first, then least recently used beyond the cap
+        while self._contexts:
+            user_id, context = next(iter(self._contexts.items()))
+            if self._expired(context) or len(self._contexts) > self.max_users:
+                self._drop(user_id)
+            else:
+                break
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS conversation_context ("
+            "user_id INTEGER PRIMARY KEY, turns TEXT NOT NULL, last_interaction REAL NOT NULL)"
+        )
+        conn.commit()
+        return conn
+
+    def _load(self, user_id: int) -> Optional[ConversationContext]:
+        if self._conn is None:
+            return None
+        try:
+            row = self._conn.execute(
+                "SELECT turns, last_interaction FROM conversation_context WHERE user_id = ?", (user_id,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Error loading conversation context for user {user_id}: {e}")
+            return None
+        if row is None:
+            return None
+
+        last_interaction = datetime.fromtimestamp(row[1])
+        if datetime.now() - last_interaction > self.ttl:
+            return None
+        return ConversationContext(user_id, self.max_turns, json.loads(row[0]), last_interaction)
+
+    def _persist(self, context: ConversationContext):
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO conversation_context (user_id, turns, last_interaction) VALUES (?, ?, ?)",
+                (context.user_id, json.dumps(list(context.turns), default=str), context.last_interaction.timestamp())
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error saving conversation context for user {context.user_id}: {e}")
+
+
+_context_store: Optional[ConversationContextStore] = None
+_context_store_lock = threading.Lock()
+
+
+def get_context_store() -> ConversationContextStore:
+    """Process-wide store; set CHATBOT_CONTEXT_DB to a file path to persist contexts"""
+    global _context_store
+    with _context_store_lock:
+        if _context_store is None:
+            _context_store = ConversationContextStore(db_path=os.getenv("CHATBOT_CONTEXT_DB"))
+        return _context_store
@@ -0,0 +1,128 @@
+import pandas as pd
+import json
+import os
+import sys
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+# External datasets used to bootstrap the failure model. They are only fetched
+# by the ingest command; training always reads the local copies.
+HISTORICAL_DATA_SOURCES = {
+    "accidents": "https://raw.githubusercontent.com/datasets/railway-accidents/master/data/accidents.csv",
+    "maintenance": "https://raw.githubusercontent.com/datasets/vehicle-maintenance/master/data/maintenance.csv",
+}
+
+MANIFEST_FILE = "manifest.json"
+
+
+class HistoricalDataStore:
+    """Local columnar cache of the external historical training datasets.
+
+    Each source is stored as ``<name>.parquet`` (or a pickle when no Parquet
+    engine is installed) next to a manifest recording where and when it was
+    fetched. Reading never performs network I/O.
+    """
+
+    def __init__(self, data_dir: Path = Path("data/historical"), sources: Dict[str, str] = None):
+        self.data_dir = Path(data_dir)
+        self.sources = sources or HISTORICAL_DATA_SOURCES
+
+    def ingest(self, force: bool = False, timeout: int = 30) -> Dict[str, Any]:
+        """Download every source once and cache it locally"""
+        import requests
+
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self._read_manifest()
+        results = {}
+
+        for name, url in self.sources.items():
+            if not force and name in manifest and self._frame_path(manifest[name]).exists():
+                results[name] = {"status": "cached", "rows": manifest[name]["rows"]}
+                continue
+
+            try:
+                logger.info(f"Downloading historical data from {url}")
+                response = requests.get(url, timeout=timeout)
+                response.raise_for_status()
+                df = pd.read_csv(StringIO(response.text))
+
+                filename = self._write_frame(name, df)
+                manifest[name] = {
+                    "url": url,
+                    "file": filename,
+                    "rows": len(df),
+                    "columns": list(df.columns),
+                    "fetched_at": datetime.now().isoformat(),
+                }
+                results[name] = {"status": "downloaded", "rows": len(df)}
+                logger.info(f"Cached {len(df)} records from {url}")
+            except Exception as e:
+                logger.warning(f"Failed to ingest {url}: {e}")
+                results[name] = {"status": "failed", "error": str(e)}
+
+        self._write_manifest(manifest)
+        return results
+
+    def load(self, name: str) -> Optional[pd.DataFrame]:
+        """Read a cached source, or None if it has not been ingested"""
+        entry = self._read_manifest().get(name)
+        if not entry:
+            return None
+
+        path = self._frame_path(entry)
+        if not path.exists():
+            return None
+
+        try:
+            if path.suffix == ".parquet":
+                return pd.read_parquet(path)
+            return pd.read_pickle(path)
+        except Exception as e:
+            logger.error(f"Error reading cached historical data {path}: {e}")
+            return None
+
+    def available_sources(self) -> List[str]:
+        return [name for name, entry in self._read_manifest().items() if self._frame_path(entry).exists()]
+
+    def _write_frame(self, name: str, df: pd.DataFrame) -> str:
+        try:
+            filename = f"{name}.parquet"
+            df.to_parquet(self.data_dir / filename, index=False)
+        except ImportError:
+            logger.warning("No Parquet engine installed, caching historical data as pickle")
+            filename = f"{name}.pkl"
+            df.to_pickle(self.data_dir / filename)
+        return filename
+
+    def _frame_path(self, entry: Dict[str, Any]) -> Path:
+        return self.data_dir / entry["file"]
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        manifest_path = self.data_dir / MANIFEST_FILE
+        if not manifest_path.exists():
+            return {}
+        try:
+            with open(manifest_path) as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading historical data manifest: {e}")
+            return {}
+
+    def _write_manifest(self, manifest: Dict[str, Any]):
+        tmp_path = self.data_dir / f"{MANIFEST_FILE}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.data_dir / MANIFEST_FILE)
+
+
+if __name__ == "__main__":
+    # Usage: python -m ai.historical_store [--force]
+    logging.basicConfig(level=logging.INFO)
+    store = HistoricalDataStore()
+    for source, result in store.ingest(force="--force" in sys.argv).items():
+        print(f"{source}: {result}")
@@ -0,0 +1,181 @@
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+import re
+import time
+
+
+class Intent(Enum):
+    EXPLANATION = "explanation"
+    WHAT_IF = "what_if"
+    SCHEDULE = "schedule"
+    TRAIN = "train"
+    MAINTENANCE = "maintenance"
+    BRANDING = "branding"
+    PREDICTION = "prediction"
+    HELP = "help"
+    DATA = "data"
+    GENERAL = "general"
+
+
+# Highest priority first: a message mentioning keywords of several intents is
+# routed to the earliest one. Matching is by substring, so "how" also fires
+# inside "show" exactly as the original keyword chains did.
+INTENT_KEYWORDS: List[Tuple[Intent, List[str]]] = [
+    (Intent.EXPLANATION, ["explain", "why", "how", "reasoning", "journey", "process"]),
+    (Intent.WHAT_IF, ["what if", "scenario"]),
+    (Intent.SCHEDULE, ["schedule", "induction", "plan"]),
+    (Intent.TRAIN, ["train", "status", "fitness"]),
+    (Intent.MAINTENANCE, ["maintenance", "job card", "repair"]),
+    (Intent.BRANDING, ["branding", "advertisement"]),
+    (Intent.PREDICTION, ["prediction", "risk", "failure", "ml", "ai", "stats", "graph"]),
+    (Intent.HELP, ["help", "support"]),
+    (Intent.DATA, ["data", "statistics", "analytics"]),
+]
+
+# Words the handlers use to pick a sub-topic; they never decide the intent
+ENTITY_KEYWORDS = ["your", "select", "add"]
+
+# A short message opening like this continues the previous question, e.g.
+# "and train 7?" after "show the journey of train 3"
+FOLLOW_UP_PREFIXES = ("and ", "also ", "what about ")
+FOLLOW_UP_MAX_WORDS = 5
+
+# Keywords that only name the subject of a follow-up, not a new topic
+SUBJECT_KEYWORDS = ["train"]
+
+
+@dataclass(frozen=True)
+class IntentMatch:
+    intent: Intent
+    keywords: FrozenSet[str] = field(default_factory=frozenset)
+    numbers: Tuple[int, ...] = ()
+
+    def has(self, *words: str) -> bool:
+        """True if any of the given keywords occurs in the message"""
+        return any(word in self.keywords for word in words)
+
+    @property
+    def train_number(self):
+        return self.numbers[0] if self.numbers else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "intent": self.intent.value,
+            "keywords": sorted(self.keywords),
+            "numbers": list(self.numbers),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "IntentMatch":
+        return cls(
+            intent=Intent(data["intent"]),
+            keywords=frozenset(data.get("keywords", [])),
+            numbers=tuple(data.get("numbers", [])),
+        )
+
+
+class IntentRouter:
+    """Classifies a chatbot message in a single regex scan.
+
+    Every keyword is compiled into one alternation inside a lookahead, so
+    overlapping keywords ("maintenance" contains "ai") are all found while the
+    scan advances one character at a time; digit runs are captured in the same
+    pass as train numbers. Keywords contained in a longer keyword that starts
+    at the same position are added from a precomputed table.
+    """
+
+    def __init__(self, intent_keywords: List[Tuple[Intent, List[str]]] = INTENT_KEYWORDS,
+                 entity_keywords: List[str] = ENTITY_KEYWORDS):
+        self.priority: Dict[str, int] = {}
+        self.keyword_intent: Dict[str, Intent] = {}
+        for rank, (intent, words) in enumerate(intent_keywords):
+            for word in words:
+                if word not in self.keyword_intent:
+                    self.keyword_intent[word] = intent
+                    self.priority[word] = rank
+
+        vocabulary = sorted(set(self.keyword_intent) | set(entity_keywords), key=len, reverse=True)
+        # A match reports the longest keyword at its position; keywords that are
+        # substrings of it are implied
+        self._implied: Dict[str, FrozenSet[str]] = {
+            word: frozenset(other for other in vocabulary if other in word)
+            for word in vocabulary
+        }
+        self._subject_words = frozenset().union(*(self._implied[word] for word in SUBJECT_KEYWORDS))
+        alternation = "|".join(re.escape(word) for word in vocabulary)
+        self._pattern = re.compile(rf"(?P<num>\d+)|(?=(?P<kw>{alternation}))")
+
+    def route(self, message: str) -> IntentMatch:
+        """Classify an already lower-cased message"""
+        keywords = set()
+        numbers = []
+        for m in self._pattern.finditer(message):
+            number = m.group("num")
+            if number is not None:
+                numbers.append(int(number))
+            else:
+                keywords |= self._implied[m.group("kw")]
+
+        ranked = [self.priority[word] for word in keywords if word in self.priority]
+        if ranked:
+            best = min(ranked)
+            intent = next(self.keyword_intent[w] for w in keywords if self.priority.get(w) == best)
+        else:
+            intent = Intent.GENERAL
+        return IntentMatch(intent=intent, keywords=frozenset(keywords), numbers=tuple(numbers))
+
+    def resolve_follow_up(self, message: str, match: IntentMatch,
+                          previous: Optional[IntentMatch]) -> IntentMatch:
+        """Carry the previous intent over to a follow-up that names no new topic"""
+        if previous is None or not message.startswith(FOLLOW_UP_PREFIXES):
+            return match
+        if len(message.split()) > FOLLOW_UP_MAX_WORDS:
+            return match
+        if any(word in self.priority for word in match.keywords - self._subject_words):
+            return match
+
+        return IntentMatch(
+            intent=previous.intent,
+            keywords=previous.keywords | match.keywords,
+            numbers=match.numbers or previous.numbers,
+        )
+
+
+intent_router = IntentRouter()
+
+
+def route_message(message: str) -> IntentMatch:
+    return intent_router.route(message)
+
+
+def benchmark(messages: List[str] = None, iterations: int = 20000) -> Dict[str, float]:
+    """Measure routing throughput in messages per second"""
+    messages = messages or [
+        "show me the induction schedule for tomorrow",
+        "why was train 12 selected?",
+        "what if we add 3 trains",
+        "status of train 7",
+        "any open job card for train 4?",
+        "branding compliance report",
+        "what is the failure risk across the fleet",
+        "help",
+        "give me fleet statistics",
+        "good morning",
+    ]
+    start = time.perf_counter()
+    for i in range(iterations):
+        intent_router.route(messages[i % len(messages)])
+    elapsed = time.perf_counter() - start
+    return {
+        "messages": iterations,
+        "seconds": elapsed,
+        "messages_per_second": iterations / elapsed,
+    }
+
+
+if __name__ == "__main__":
+    # Usage: python -m ai.intent_router
+    result = benchmark()
+    print(f"Routed {result['messages']} messages in {result['seconds']:.3f}s "
+          f"({result['messages_per_second']:,.0f} messages/sec)")
@@ -19,10 +19,15 @@ import warnings
 import os
 import sys
 from pathlib import Path
-import requests
 import json
-from io import StringIO
 import time
+import copy
+import threading
+
+from .model_store import ModelArtifactStore
+from .historical_store import HistoricalDataStore, HISTORICAL_DATA_SOURCES
+from .tree_inference import CompiledTreeEnsemble, verify_parity
+from .online_learning import get_outcome_buffer, get_drift_monitor
 
 # Configure logging
 logging.basicConfig(
@@ -38,6 +43,11 @@ logger = logging.getLogger(__name__)
 # Suppress warnings
 warnings.filterwarnings('ignore')
 
+# Artifacts saved without a compiled model are compiled (or found not to
+# compile) once per process rather than once per MLModel instance
+_compiled_for_version: Dict[str, Optional["CompiledTreeEnsemble"]] = {}
+_compiled_lock = threading.Lock()
+
 @dataclass
 class FailurePrediction:
     train_id: int
@@ -51,9 +61,35 @@ class FailurePrediction:
     model_used: str
     prediction_timestamp: datetime
 
+class _ArtifactComponent:
+    """Model attribute that is read from the on-disk artifact on first access"""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.slot = f"_{name}"
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        if self.slot not in obj.__dict__:
+            obj.__dict__[self.slot] = obj._load_artifact_component(self.name)
+        return obj.__dict__[self.slot]
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.slot] = value
+
 class MLModel:
+    # Heavy estimators and preprocessors are only materialised when needed, so
+    # constructing a model per request costs a manifest read after cold start.
+    models = _ArtifactComponent()
+    best_model = _ArtifactComponent()
+    scaler = _ArtifactComponent()
+    imputer = _ArtifactComponent()
+    compiled_model = _ArtifactComponent()
+
     def __init__(self, db: Session, auto_retrain_days: int = 30):
         self.db = db
+        self._artifact = None
         self.models = {}
         self.best_model = None
         self.best_model_name = None
@@ -61,13 +97,14 @@ class MLModel:
         self.imputer = None
         self.feature_names = []
         self.model_dir = Path("models")
+        self.artifact_store = ModelArtifactStore(self.model_dir)
         self.auto_retrain_days = auto_retrain_days
         self.last_training_date = None
         self.is_trained = False
-        self.historical_data_sources = [
-            "https://raw.githubusercontent.com/datasets/railway-accidents/master/data/accidents.csv",
-            "https://raw.githubusercontent.com/datasets/vehicle-maintenance/master/data/maintenance.csv"
-        ]
+        self.feature_reference = None
+        self.incremental_updates = 0
+        self.historical_data_sources = list(HISTORICAL_DATA_SOURCES.values())
+        self.historical_store = HistoricalDataStore()
         
         # Create directories
         self.model_dir.mkdir(exist_ok=True)
@@ -107,16 +144,24 @@ class MLModel:
         
         self.expected_features = self.base_features + self.derived_features
         
+        # Online learning state is shared across request-scoped instances
+        self.outcome_buffer = get_outcome_buffer(self.expected_features)
+        self.drift_monitor = get_drift_monitor(self.expected_features)
+        
         # Initialize model
         self.initialize_model()
     
     def initialize_model(self):
-        """Initialize model - load existing or train new with historical data"""
+        """Initialize model - load existing or train new with historical data.
+        
+        A loaded model is used as it is; age-based retraining and incremental
+        updates run from POST /ai/update-model and the background maintenance
+        in ai.services, never while serving a read.
+        """
         try:
             if self.load_model():
                 logger.info("Model loaded successfully from disk")
                 self.is_trained = True
-                self.check_retraining_need()
             else:
                 logger.info("No existing model found. Training new model with historical data...")
                 result = self.train_model_with_historical_data()
@@ -201,33 +246,23 @@ class MLModel:
             # Return zero array as fallback
             return np.zeros((1, len(self.expected_features)))
     
-    def download_historical_data(self) -> pd.DataFrame:
-        """Download and combine historical train failure data from multiple sources"""
-        logger.info("Downloading historical train data...")
-        
+    def load_historical_data(self) -> pd.DataFrame:
+        """Combine cached historical datasets with local files (no network access)"""
         all_data = []
+        parsers = {
+            "accidents": self._parse_accident_data,
+            "maintenance": self._parse_maintenance_data,
+        }
         
-        for source in self.historical_data_sources:
-            try:
-                logger.info(f"Downloading from {source}")
-                response = requests.get(source, timeout=30)
-                response.raise_for_status()
-                
-                # Parse the data based on source type
-                if "accidents" in source:
-                    df = self._parse_accident_data(response.text)
-                elif "maintenance" in source:
-                    df = self._parse_maintenance_data(response.text)
-                else:
-                    df = self._parse_generic_data(response.text)
-                
-                if not df.empty:
-                    all_data.append(df)
-                    logger.info(f"Downloaded {len(df)} records from {source}")
-                
-            except Exception as e:
-                logger.warning(f"Failed to download from {source}: {e}")
+        for source in self.historical_store.available_sources():
+            raw_df = self.historical_store.load(source)
+            if raw_df is None or raw_df.empty:
                 continue
+            
+            df = parsers.get(source, self._parse_generic_data)(raw_df)
+            if not df.empty:
+                all_data.append(df)
+                logger.info(f"Loaded {len(df)} cached records from {source}")
         
         # Also try to load local historical data if available
         local_data = self._load_local_historical_data()
@@ -239,14 +274,18 @@ class MLModel:
             logger.info(f"Combined {len(combined_data)} historical records")
             return combined_data
         else:
-            logger.warning("No historical data could be downloaded")
+            logger.warning("No historical data cached locally. Run `python -m ai.historical_store` to ingest it.")
             return pd.DataFrame()
     
-    def _parse_accident_data(self, csv_text: str) -> pd.DataFrame:
+    def download_historical_data(self) -> pd.DataFrame:
+        """Refresh the local historical data cache from the remote sources, then load it"""
+        logger.info("Downloading historical train data...")
+        self.historical_store.ingest(force=True)
+        return self.load_historical_data()
+    
+    def _parse_accident_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Parse accident/incident data"""
         try:
-            df = pd.read_csv(StringIO(csv_text))
-            
             # Map columns to our feature format
             feature_mapping = {
                 'mileage': 'mileage',
@@ -292,11 +331,9 @@ class MLModel:
             logger.error(f"Error parsing accident data: {e}")
             return pd.DataFrame()
     
-    def _parse_maintenance_data(self, csv_text: str) -> pd.DataFrame:
+    def _parse_maintenance_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Parse maintenance record data"""
         try:
-            df = pd.read_csv(StringIO(csv_text))
-            
             features_list = []
             for _, row in df.iterrows():
                 features = {
@@ -332,11 +369,9 @@ class MLModel:
             logger.error(f"Error parsing maintenance data: {e}")
             return pd.DataFrame()
     
-    def _parse_generic_data(self, csv_text: str) -> pd.DataFrame:
+    def _parse_generic_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Parse generic railway data"""
         try:
-            df = pd.read_csv(StringIO(csv_text))
-            
             # Extract relevant columns or create synthetic data
             features_list = []
             for _, row in df.iterrows():
@@ -416,12 +451,12 @@ class MLModel:
         return None
     
     def train_model_with_historical_data(self) -> Dict[str, Any]:
-        """Train model using downloaded historical data"""
+        """Train model using locally cached historical data"""
         logger.info("Training model with historical data...")
         
         try:
-            # Download historical data
-            historical_df = self.download_historical_data()
+            # Read the local cache; ingestion happens out of band
+            historical_df = self.load_historical_data()
             
             if historical_df.empty:
                 logger.warning("No historical data available. Using synthetic data.")
@@ -444,12 +479,12 @@ class MLModel:
             logger.error(f"Error training with historical data: {e}")
             return {"success": False, "error": str(e)}
     
-    def train_with_synthetic_data(self, n_samples: int = 2000) -> Dict[str, Any]:
+    def train_with_synthetic_data(self, n_samples: int = 2000, seed: int = 42) -> Dict[str, Any]:
         """Train model using comprehensive synthetic data"""
         logger.info(f"Training with {n_samples} synthetic samples...")
         
         try:
-            df = self._generate_comprehensive_synthetic_data(n_samples)
+            df = self._generate_comprehensive_synthetic_data(n_samples, seed=seed)
             result = self._train_on_dataframe(df)
             
             if result["success"]:
@@ -462,94 +497,112 @@ class MLModel:
             logger.error(f"Error training with synthetic data: {e}")
             return {"success": False, "error": str(e)}
     
-    def _generate_comprehensive_synthetic_data(self, n_samples: int = 2000) -> pd.DataFrame:
+    # Failure scenarios used by the synthetic generator; rows beyond the
+    # pattern blocks are fully random and labelled by _simulate_failure_risk.
+    SYNTHETIC_PATTERNS = {
+        'high_mileage_failure': {'mileage': (80000, 150000), 'maintenance_age': (30, 365), 'open_jobs_poisson': 2, 'failure_prob': 0.7},
+        'poor_maintenance': {'mileage': (10000, 80000), 'maintenance_age': (180, 730), 'open_jobs_poisson': 3, 'failure_prob': 0.8},
+        'high_utilization': {'mileage': (50000, 120000), 'maintenance_age': (60, 180), 'open_jobs_poisson': 1, 'failure_prob': 0.6},
+        'multiple_issues': {'mileage': (20000, 100000), 'maintenance_age': (120, 365), 'open_jobs': (3, 10), 'failure_prob': 0.9},
+        'normal_operation': {'mileage': (5000, 60000), 'maintenance_age': (1, 90), 'open_jobs_poisson': 0.5, 'failure_prob': 0.1},
+    }
+    
+    def _generate_comprehensive_synthetic_data(self, n_samples: int = 2000, seed: int = 42) -> pd.DataFrame:
         """Generate realistic synthetic training data with varied patterns"""
         logger.info(f"Generating {n_samples} comprehensive synthetic samples")
         
-        np.random.seed(42)
-        data = []
+        df = pd.concat(self.iter_synthetic_data(n_samples, seed=seed), ignore_index=True)
+        logger.info(f"Generated synthetic dataset with {len(df)} samples")
+        logger.info(f"Failure distribution: {df['failure_occurred'].value_counts().to_dict()}")
         
-        # Create different patterns for failure scenarios
-        patterns = {
-            'high_mileage_failure': {'mileage_range': (80000, 150000), 'failure_prob': 0.7},
-            'poor_maintenance': {'maintenance_range': (180, 730), 'failure_prob': 0.8},
-            'high_utilization': {'utilization_range': (25000, 50000), 'failure_prob': 0.6},
-            'multiple_issues': {'open_jobs_range': (3, 10), 'failure_prob': 0.9},
-            'normal_operation': {'failure_prob': 0.1}
-        }
+        return df
+    
+    def iter_synthetic_data(self, n_samples: int, chunk_size: int = 50000, seed: int = 42):
+        """Yield synthetic samples in DataFrame chunks so large datasets never sit in memory at once.
         
-        samples_per_pattern = n_samples // len(patterns)
+        The output depends only on seed, n_samples and chunk_size.
+        """
+        rng = np.random.default_rng(seed)
+        pattern_names = list(self.SYNTHETIC_PATTERNS.keys())
+        samples_per_pattern = n_samples // len(pattern_names)
+        pattern_rows = samples_per_pattern * len(pattern_names)
         
-        for pattern_name, pattern_config in patterns.items():
-            for i in range(samples_per_pattern):
-                if pattern_name == 'high_mileage_failure':
-                    mileage = np.random.randint(*pattern_config['mileage_range'])
-                    maintenance_age = np.random.randint(30, 365)
-                    open_jobs = np.random.poisson(2)
-                elif pattern_name == 'poor_maintenance':
-                    mileage = np.random.randint(10000, 80000)
-                    maintenance_age = np.random.randint(*pattern_config['maintenance_range'])
-                    open_jobs = np.random.poisson(3)
-                elif pattern_name == 'high_utilization':
-                    mileage = np.random.randint(50000, 120000)
-                    train_age = np.random.randint(365, 1095)  # 1-3 years
-                    maintenance_age = np.random.randint(60, 180)
-                    open_jobs = np.random.poisson(1)
-                elif pattern_name == 'multiple_issues':
-                    mileage = np.random.randint(20000, 100000)
-                    maintenance_age = np.random.randint(120, 365)
-                    open_jobs = np.random.randint(*pattern_config['open_jobs_range'])
-                else:  # normal_operation
-                    mileage = np.random.randint(5000, 60000)
-                    maintenance_age = np.random.randint(1, 90)
-                    open_jobs = np.random.poisson(0.5)
-                
-                features = {
-                    'mileage': float(mileage),
-                    'train_age_days': float(np.random.randint(365, 3650)),
-                    'maintenance_age_days': float(maintenance_age),
-                    'open_jobs_count': float(open_jobs),
-                    'cert_validity_days': float(np.random.randint(0, 365)),
-                    'has_active_branding': float(np.random.choice([0, 1], p=[0.7, 0.3])),
-                    'cleaning_slots_count': float(np.random.poisson(0.5)),
-                    'induction_priority': float(np.random.choice([1, 2, 3, 99], p=[0.2, 0.3, 0.3, 0.2])),
-                }
-                
-                # Add derived features
-                features.update(self._calculate_derived_features(features))
-                
-                # Determine failure based on pattern
-                if np.random.random() < pattern_config['failure_prob']:
-                    features['failure_occurred'] = 1
+        for start in range(0, n_samples, chunk_size):
+            index = np.arange(start, min(start + chunk_size, n_samples))
+            size = len(index)
+            # Pattern id per row; len(pattern_names) marks the random tail
+            pattern_ids = np.where(index < pattern_rows, index // max(samples_per_pattern, 1), len(pattern_names))
+            
+            # Random-tail defaults, overwritten per pattern below
+            mileage = rng.integers(1000, 150000, size).astype(float)
+            maintenance_age = rng.integers(1, 730, size).astype(float)
+            open_jobs = rng.poisson(1.5, size).astype(float)
+            failure_prob = np.full(size, np.nan)
+            
+            for pattern_id, name in enumerate(pattern_names):
+                mask = pattern_ids == pattern_id
+                count = int(mask.sum())
+                if not count:
+                    continue
+                config = self.SYNTHETIC_PATTERNS[name]
+                mileage[mask] = rng.integers(*config['mileage'], count)
+                maintenance_age[mask] = rng.integers(*config['maintenance_age'], count)
+                if 'open_jobs' in config:
+                    open_jobs[mask] = rng.integers(*config['open_jobs'], count)
                 else:
-                    features['failure_occurred'] = 0
-                
-                features['train_id'] = len(data)
-                data.append(features)
+                    open_jobs[mask] = rng.poisson(config['open_jobs_poisson'], count)
+                failure_prob[mask] = config['failure_prob']
+            
+            chunk = pd.DataFrame({
+                'mileage': mileage,
+                'train_age_days': rng.integers(365, 3650, size).astype(float),
+                'maintenance_age_days': maintenance_age,
+                'open_jobs_count': open_jobs,
+                'cert_validity_days': rng.integers(0, 365, size).astype(float),
+                'has_active_branding': rng.choice([0.0, 1.0], size, p=[0.7, 0.3]),
+                'cleaning_slots_count': rng.poisson(0.5, size).astype(float),
+                'induction_priority': rng.choice([1.0, 2.0, 3.0, 99.0], size, p=[0.2, 0.3, 0.3, 0.2]),
+            })
+            chunk = self._add_derived_feature_columns(chunk)
+            
+            # Pattern rows fail with their pattern probability, random rows by rule
+            pattern_failures = rng.random(size) < failure_prob
+            chunk['failure_occurred'] = np.where(
+                np.isnan(failure_prob), self._simulate_failure_risk_batch(chunk), pattern_failures
+            ).astype(int)
+            chunk['train_id'] = index
+            
+            yield chunk
+    
+    def _add_derived_feature_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Vectorised equivalent of _calculate_derived_features for a whole frame"""
+        mileage = df['mileage'].to_numpy(dtype=float)
+        train_age_years = np.maximum(df['train_age_days'].to_numpy(dtype=float), 1) / 365
+        maintenance_age = df['maintenance_age_days'].to_numpy(dtype=float)
         
-        # Add some random samples
-        for i in range(n_samples - len(data)):
-            features = {
-                'mileage': float(np.random.randint(1000, 150000)),
-                'train_age_days': float(np.random.randint(365, 3650)),
-                'maintenance_age_days': float(np.random.randint(1, 730)),
-                'open_jobs_count': float(np.random.poisson(1.5)),
-                'cert_validity_days': float(np.random.randint(0, 365)),
-                'has_active_branding': float(np.random.choice([0, 1], p=[0.7, 0.3])),
-                'cleaning_slots_count': float(np.random.poisson(0.5)),
-                'induction_priority': float(np.random.choice([1, 2, 3, 99], p=[0.2, 0.3, 0.3, 0.2])),
-            }
-            
-            features.update(self._calculate_derived_features(features))
-            features['failure_occurred'] = self._simulate_failure_risk(features)
-            features['train_id'] = len(data)
-            data.append(features)
+        df['mileage_per_year'] = mileage / train_age_years
+        df['maintenance_ratio'] = maintenance_age / 180
+        df['utilization_intensity'] = np.minimum(mileage / train_age_years / 20000, 3.0)
+        df['maintenance_urgency'] = np.minimum(maintenance_age / 90, 4.0)
+        return df
+    
+    def _simulate_failure_risk_batch(self, df: pd.DataFrame) -> np.ndarray:
+        """Vectorised _simulate_failure_risk over a feature frame"""
+        def column(name):
+            return df[name].to_numpy(dtype=float) if name in df else np.zeros(len(df))
         
-        df = pd.DataFrame(data)
-        logger.info(f"Generated synthetic dataset with {len(df)} samples")
-        logger.info(f"Failure distribution: {df['failure_occurred'].value_counts().to_dict()}")
+        mileage = column('mileage')
+        maintenance_age = column('maintenance_age_days')
+        open_jobs = column('open_jobs_count')
         
-        return df
+        risk_score = (
+            np.select([mileage > 50000, mileage > 20000], [2, 1], 0)
+            + np.select([maintenance_age > 180, maintenance_age > 90], [2, 1], 0)
+            + np.select([open_jobs > 5, open_jobs > 2], [2, 1], 0)
+            + (column('cert_validity_days') < 30)
+            + (column('mileage_per_year') > 25000)
+        )
+        return (risk_score >= 3).astype(int)
 
     # === ALL ORIGINAL METHODS ===
     
@@ -673,7 +726,10 @@ class MLModel:
             }
     
     def _simulate_failure_risk(self, features: Dict) -> int:
-        """Simulate failure risk based on features (for training data)"""
+        """Simulate failure risk based on features (for training data)
+
+        Single-row form; keep in sync with _simulate_failure_risk_batch.
+        """
         risk_score = 0
         
         # High mileage risk
@@ -707,10 +763,8 @@ class MLModel:
     def _handle_missing_values(self, df: pd.DataFrame) -> pd.DataFrame:
         """Handle missing values safely"""
         df_clean = df.copy()
-        numeric_features = df_clean.select_dtypes(include=[np.number]).columns.tolist()
-        
-        if 'failure_occurred' in numeric_features:
-            numeric_features.remove('failure_occurred')
+        # Fit on the model features only so the imputer accepts prediction rows
+        numeric_features = [f for f in self.expected_features if f in df_clean.columns]
         
         if numeric_features:
             self.imputer = SimpleImputer(strategy='median')
@@ -784,6 +838,12 @@ class MLModel:
             X = df_clean[self.expected_features]
             y = df_clean['failure_occurred']
             
+            # Reference statistics for drift monitoring
+            self.feature_reference = {
+                'features': {f: {'mean': float(X[f].mean()), 'std': float(X[f].std() or 1.0)} for f in self.expected_features},
+                'failure_rate': float(y.mean()),
+            }
+            
             # Scale features
             self.scaler = RobustScaler()
             X_scaled = self.scaler.fit_transform(X)
@@ -852,12 +912,14 @@ class MLModel:
             self.best_model_name = max(performance_results.keys(), 
                                      key=lambda x: performance_results[x]['f1_score'])
             self.best_model = self.models[self.best_model_name]
+            self.compiled_model = self._compile_best_model()
             
             # Set feature names for consistency
             self.feature_names = self.expected_features
             
             self.last_training_date = datetime.now()
             self.is_trained = True
+            self.incremental_updates = 0
             self.save_model()
             
             return {
@@ -890,7 +952,7 @@ class MLModel:
     
     def predict_failure_risk(self, train_id: int) -> FailurePrediction:
         """Predict failure risk for a specific train"""
-        if not self.is_trained or not self.best_model:
+        if not self.is_trained or (self.compiled_model is None and not self.best_model):
             raise ValueError("Model not trained. Call train_model() first.")
         
         try:
@@ -908,7 +970,7 @@ class MLModel:
             feature_array = self._prepare_features_for_prediction(features)
             
             # Predict
-            probability = self.best_model.predict_proba(feature_array)[0][1]
+            probability = self._predict_probability(feature_array)
             
             # Determine risk level
             if probability < 0.3:
@@ -924,6 +986,7 @@ class MLModel:
                 risk_level = "critical"
                 recommendation = "Immediate maintenance required - high failure probability"
             
+            self._track_prediction(train.id, features, probability)
             failure_type = self._predict_failure_type(features, probability)
             
             return FailurePrediction(
@@ -944,6 +1007,104 @@ class MLModel:
             # Create fallback prediction
             return self._create_fallback_prediction(train)
     
+    def _predict_probability(self, feature_array: np.ndarray) -> float:
+        """Failure probability for one prepared row, using the compiled trees when available"""
+        if self.compiled_model is not None:
+            return self.compiled_model.predict_proba_one(feature_array[0])
+        return self.best_model.predict_proba(feature_array)[0][1]
+    
+    def _track_prediction(self, train_id: int, features: Dict[str, Any], probability: float):
+        """Feed a live prediction to the outcome buffer and drift monitor"""
+        try:
+            self.outcome_buffer.record(train_id, features, probability)
+            self.drift_monitor.update(features, probability)
+        except Exception as e:
+            logger.warning(f"Error tracking prediction for train {train_id}: {e}")
+    
+    def _prepare_feature_matrix(self, df: pd.DataFrame) -> np.ndarray:
+        """Batch form of _prepare_features_for_prediction"""
+        X = df[self.expected_features].to_numpy(dtype=float)
+        if self.imputer is not None and getattr(self.imputer, 'n_features_in_', X.shape[1]) == X.shape[1]:
+            X = self.imputer.transform(X)
+        if self.scaler is not None:
+            X = self.scaler.transform(X)
+        return X
+    
+    def update_incrementally(self, min_samples: int = 20, trees_per_update: int = 10,
+                             max_estimators: int = 500) -> Dict[str, Any]:
+        """Grow the best model with trees fitted on newly observed outcomes.
+        
+        Uses warm_start so existing trees/stages are kept and only
+        trees_per_update new ones are fitted on the buffered outcomes.
+        """
+        if not self.is_trained or self.best_model is None:
+            return {"success": False, "message": "Model not trained"}
+        
+        try:
+            self.drift_monitor.record_outcomes(*self._resolved_outcomes(force=True))
+            batch = self.outcome_buffer.training_batch()
+            if len(batch) < min_samples:
+                return {"success": False, "message": f"Only {len(batch)} new outcomes buffered, need {min_samples}"}
+            
+            y = batch['label'].astype(int).to_numpy()
+            if len(np.unique(y)) < 2:
+                return {"success": False, "message": "New outcomes contain a single class, waiting for more data"}
+            
+            if self.best_model.n_estimators + trees_per_update > max_estimators:
+                return {"success": False, "message": "Estimator limit reached, full retraining required"}
+            
+            # Copy first: the loaded estimator is shared and may be memory-mapped
+            model = copy.deepcopy(self.best_model)
+            model.set_params(warm_start=True, n_estimators=model.n_estimators + trees_per_update)
+            model.fit(self._prepare_feature_matrix(batch), y)
+            model.set_params(warm_start=False)
+            
+            self.models[self.best_model_name] = model
+            self.best_model = model
+            self.compiled_model = self._compile_best_model()
+            self.incremental_updates += 1
+            self.outcome_buffer.mark_used(batch.index)
+            self.save_model()
+            
+            logger.info(f"Incrementally updated {self.best_model_name} with {len(batch)} outcomes "
+                        f"({model.n_estimators} estimators)")
+            return {
+                "success": True,
+                "model": self.best_model_name,
+                "new_outcomes": len(batch),
+                "observed_failures": int(y.sum()),
+                "n_estimators": model.n_estimators,
+                "incremental_updates": self.incremental_updates,
+            }
+        except Exception as e:
+            logger.error(f"Error in incremental update: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def _resolved_outcomes(self, force: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        resolved = self.outcome_buffer.resolve(self.db, force=force)
+        return resolved['label'].to_numpy(dtype=float), resolved['failure_probability'].to_numpy(dtype=float)
+    
+    def get_drift_metrics(self) -> Dict[str, Any]:
+        """Live feature drift and outcome calibration since the current model was trained"""
+        metrics = self.drift_monitor.metrics()
+        metrics.update(self.outcome_buffer.stats())
+        metrics["incremental_updates"] = self.incremental_updates
+        return metrics
+    
+    def _compile_best_model(self) -> Optional[CompiledTreeEnsemble]:
+        """Flatten the best model for fast inference, keeping it only if it matches sklearn"""
+        if self.best_model is None:
+            return None
+        
+        try:
+            compiled = CompiledTreeEnsemble.from_estimator(self.best_model)
+            max_error = verify_parity(self.best_model, compiled)
+            logger.info(f"Compiled {self.best_model_name} for inference (max parity error {max_error:.2e})")
+            return compiled
+        except Exception as e:
+            logger.warning(f"Falling back to sklearn inference for {self.best_model_name}: {e}")
+            return None
+    
     def _predict_failure_type(self, features: Dict, probability: float) -> str:
         """Predict the most likely failure type based on feature patterns"""
         if probability < 0.4:
@@ -1011,51 +1172,140 @@ class MLModel:
         if needs_retraining:
             logger.info(f"Model is {days_since} days old. Auto-retraining...")
             self.train_model()
+        elif self.db is not None:
+            # Between full retrains, learn from outcomes observed since the last check
+            labels, probabilities = self._resolved_outcomes()
+            if len(labels):
+                self.drift_monitor.record_outcomes(labels, probabilities)
+                self.update_incrementally()
         
         return needs_retraining
     
     def save_model(self):
-        """Save trained model and preprocessing objects"""
+        """Save trained model and preprocessing objects as a new artifact version"""
         try:
             if self.best_model:
-                model_data = {
-                    'best_model': self.best_model,
-                    'best_model_name': self.best_model_name,
-                    'models': self.models,
+                components = {
                     'scaler': self.scaler,
                     'imputer': self.imputer,
-                    'feature_names': self.feature_names,
-                    'last_training_date': self.last_training_date,
-                    'is_trained': self.is_trained
                 }
-                joblib.dump(model_data, self.model_dir / "failure_prediction_model.pkl")
-                logger.info("Model saved successfully")
+                for model_name, model in self.models.items():
+                    components[f"estimator_{model_name}"] = model
+                
+                arrays = {}
+                compiled_params = None
+                if self.compiled_model is not None:
+                    arrays = {f"compiled.{name}": array for name, array in self.compiled_model.to_arrays().items()}
+                    compiled_params = self.compiled_model.params()
+                
+                metadata = {
+                    'best_model_name': self.best_model_name,
+                    'model_names': list(self.models.keys()),
+                    'feature_names': list(self.feature_names),
+                    'last_training_date': self.last_training_date.isoformat() if self.last_training_date else None,
+                    'is_trained': self.is_trained,
+                    'feature_importance': self._best_model_feature_importance(),
+                    'compiled_model': compiled_params,
+                    'feature_reference': self.feature_reference,
+                    'incremental_updates': self.incremental_updates,
+                }
+                
+                version = self.artifact_store.save(components, metadata, arrays)
+                self._artifact = self.artifact_store.open(version)
+                self.drift_monitor.set_reference(self.feature_reference, metadata['last_training_date'])
+                logger.info(f"Model saved successfully as {version}")
         except Exception as e:
             logger.error(f"Error saving model: {e}")
     
     def load_model(self) -> bool:
-        """Load trained model and preprocessing objects"""
+        """Load the current model artifact; estimators are read lazily on first use"""
         try:
-            model_path = self.model_dir / "failure_prediction_model.pkl"
-            if model_path.exists():
-                model_data = joblib.load(model_path)
+            artifact = self.artifact_store.open()
+            if artifact is not None:
+                metadata = artifact.metadata
+                self._artifact = artifact
+                # Drop anything materialised from a previous version
+                for component in ('models', 'best_model', 'scaler', 'imputer', 'compiled_model'):
+                    self.__dict__.pop(f"_{component}", None)
                 
-                self.best_model = model_data['best_model']
-                self.best_model_name = model_data['best_model_name']
-                self.models = model_data['models']
-                self.scaler = model_data['scaler']
-                self.imputer = model_data['imputer']
-                self.feature_names = model_data['feature_names']
-                self.last_training_date = model_data['last_training_date']
-                self.is_trained = model_data.get('is_trained', True)
+                self.best_model_name = metadata['best_model_name']
+                self.feature_names = metadata['feature_names']
+                last_training = metadata.get('last_training_date')
+                self.last_training_date = datetime.fromisoformat(last_training) if last_training else None
+                self.is_trained = metadata.get('is_trained', True)
+                self.feature_reference = metadata.get('feature_reference')
+                self.incremental_updates = metadata.get('incremental_updates', 0)
+                # Keyed by training run so incremental updates keep accumulating
+                self.drift_monitor.set_reference(self.feature_reference, last_training)
                 
-                logger.info("Model loaded successfully")
+                logger.info(f"Model artifact {artifact.version} loaded successfully")
                 return True
-            return False
+            
+            return self._load_legacy_model()
         except Exception as e:
             logger.error(f"Error loading model: {e}")
             return False
     
+    def refresh_if_stale(self) -> bool:
+        """Reload if a newer artifact version has been published since this model was loaded"""
+        current = self.artifact_store.current_version()
+        if current is None or (self._artifact is not None and self._artifact.version == current):
+            return False
+        return self.load_model()
+    
+    def _load_legacy_model(self) -> bool:
+        """Load a single-file pickle from older releases and migrate it to an artifact"""
+        model_path = self.model_dir / "failure_prediction_model.pkl"
+        if not model_path.exists():
+            return False
+        
+        model_data = joblib.load(model_path)
+        
+        self.best_model = model_data['best_model']
+        self.best_model_name = model_data['best_model_name']
+        self.models = model_data['models']
+        self.scaler = model_data['scaler']
+        self.imputer = model_data['imputer']
+        self.feature_names = model_data['feature_names']
+        self.last_training_date = model_data['last_training_date']
+        self.is_trained = model_data.get('is_trained', True)
+        self.compiled_model = self._compile_best_model()
+        
+        logger.info("Legacy model loaded, migrating to artifact format")
+        self.save_model()
+        return True
+    
+    def _load_artifact_component(self, name: str) -> Any:
+        """Materialise a lazily loaded attribute from the current artifact"""
+        artifact = self._artifact
+        if name == 'compiled_model':
+            if artifact is None:
+                return self._compile_best_model()
+            if artifact.metadata.get('compiled_model'):
+                # Memory-mapped arrays: no estimator unpickling on the prediction path
+                return CompiledTreeEnsemble(artifact.load_arrays('compiled'), artifact.metadata['compiled_model'])
+            with _compiled_lock:
+                if artifact.version not in _compiled_for_version:
+                    # Only the current version is worth keeping
+                    _compiled_for_version.clear()
+                    _compiled_for_version[artifact.version] = self._compile_best_model()
+                return _compiled_for_version[artifact.version]
+        
+        if artifact is None:
+            return {} if name == 'models' else None
+        
+        if name == 'models':
+            return {
+                model_name: artifact.load(f"estimator_{model_name}")
+                for model_name in artifact.metadata.get('model_names', [])
+            }
+        if name == 'best_model':
+            loaded_models = self.__dict__.get('_models') or {}
+            if self.best_model_name in loaded_models:
+                return loaded_models[self.best_model_name]
+            return artifact.load(f"estimator_{self.best_model_name}")
+        return artifact.load(name)
+    
     def get_model_info(self) -> Dict[str, Any]:
         """Get model information"""
         return {
@@ -1064,17 +1314,25 @@ class MLModel:
             "last_training": self.last_training_date.isoformat() if self.last_training_date else None,
             "auto_retrain_days": self.auto_retrain_days,
             "feature_count": len(self.feature_names) if self.feature_names else 0,
+            "incremental_updates": self.incremental_updates,
             "days_since_training": (datetime.now() - self.last_training_date).days if self.last_training_date else None
         }
     
     def get_feature_importance(self) -> Dict[str, float]:
         """Get feature importance from the best model"""
-        if not self.is_trained or not self.best_model:
+        if not self.is_trained:
             return {}
         
+        # Served from the manifest so the estimator does not need to be loaded
+        if self._artifact is not None and '_best_model' not in self.__dict__:
+            return self._artifact.metadata.get('feature_importance') or {}
+        
+        return self._best_model_feature_importance()
+    
+    def _best_model_feature_importance(self) -> Dict[str, float]:
         try:
-            if hasattr(self.best_model, 'feature_importances_'):
-                return dict(zip(self.feature_names, self.best_model.feature_importances_))
+            if self.best_model is not None and hasattr(self.best_model, 'feature_importances_'):
+                return {name: float(value) for name, value in zip(self.feature_names, self.best_model.feature_importances_)}
             return {}
         except:
             return {}
@@ -0,0 +1,200 @@
+import joblib
+import json
+import numpy as np
+import os
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+CURRENT_FILE = "CURRENT"
+
+# Opened artifacts are shared across MLModel instances so that a request-scoped
+# model does not pay the load cost again once a version has been materialised.
+_artifact_cache: Dict[str, "ModelArtifact"] = {}
+_artifact_cache_lock = threading.Lock()
+
+
+class ModelArtifact:
+    """A single immutable, versioned model artifact directory.
+
+    Components are stored uncompressed with joblib so their NumPy arrays can be
+    memory-mapped, and are only loaded when first requested. Plain arrays are
+    stored as .npy files and memory-mapped directly without unpickling.
+    """
+
+    def __init__(self, path: Path, manifest: Dict[str, Any]):
+        self.path = path
+        self.manifest = manifest
+        self._components: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> str:
+        return self.manifest["version"]
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self.manifest.get("metadata", {})
+
+    def has(self, key: str) -> bool:
+        return key in self.manifest.get("components", {})
+
+    def component_path(self, key: str) -> Path:
+        return self.path / self.manifest["components"][key]
+
+    def load(self, key: str, default: Any = None) -> Any:
+        """Load a component on first access and keep it for later callers"""
+        if not self.has(key):
+            return default
+
+        if key in self._components:
+            return self._components[key]
+
+        with self._lock:
+            if key not in self._components:
+                started = datetime.now()
+                self._components[key] = joblib.load(self.component_path(key), mmap_mode="r")
+                elapsed_ms = (datetime.now() - started).total_seconds() * 1000
+                logger.info(f"Loaded model component '{key}' from {self.version} in {elapsed_ms:.1f}ms")
+        return self._components[key]
+
+    def has_arrays(self, prefix: str) -> bool:
+        return any(key.startswith(f"{prefix}.") for key in self.manifest.get("arrays", {}))
+
+    def load_arrays(self, prefix: str) -> Dict[str, np.ndarray]:
+        """Memory-map every array stored under the given prefix"""
+        cache_key = f"arrays:{prefix}"
+        if cache_key not in self._components:
+            arrays = {}
+            for key, filename in self.manifest.get("arrays", {}).items():
+                if key.startswith(f"{prefix}."):
+                    arrays[key[len(prefix) + 1:]] = np.load(self.path / filename, mmap_mode="r")
+            self._components[cache_key] = arrays
+        return self._components[cache_key]
+
+
+class ModelArtifactStore:
+    """Versioned artifact directory with a manifest and a CURRENT pointer.
+
+    Layout::
+
+        <root>/<name>/CURRENT                 -> "v20250101120000000000"
+        <root>/<name>/v20250101120000000000/manifest.json
+        <root>/<name>/v20250101120000000000/<component>.joblib
+        <root>/<name>/v20250101120000000000/<prefix>.<array>.npy
+
+    A new version is written to a temporary directory and published by
+    atomically replacing CURRENT, so readers never observe a partial artifact
+    and a running process can hot-swap to a newer model by re-opening.
+    """
+
+    def __init__(self, root: Path, name: str = "failure_prediction", keep_versions: int = 3):
+        self.root = Path(root) / name
+        self.keep_versions = keep_versions
+
+    def save(self, components: Dict[str, Any], metadata: Dict[str, Any],
+             arrays: Dict[str, np.ndarray] = None) -> str:
+        """Persist components and arrays as a new version and make it current"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        version = datetime.now().strftime("v%Y%m%d%H%M%S%f")
+        staging_dir = self.root / f".{version}.tmp"
+        staging_dir.mkdir()
+
+        try:
+            files = {}
+            for key, component in components.items():
+                if component is None:
+                    continue
+                filename = f"{key}.joblib"
+                # No compression: compressed pickles cannot be memory-mapped
+                joblib.dump(component, staging_dir / filename)
+                files[key] = filename
+
+            array_files = {}
+            for key, array in (arrays or {}).items():
+                filename = f"{key}.npy"
+                np.save(staging_dir / filename, np.ascontiguousarray(array))
+                array_files[key] = filename
+
+            manifest = {
+                "format_version": ARTIFACT_FORMAT_VERSION,
+                "version": version,
+                "created_at": datetime.now().isoformat(),
+                "components": files,
+                "arrays": array_files,
+                "metadata": metadata,
+            }
+            with open(staging_dir / MANIFEST_FILE, "w") as f:
+                json.dump(manifest, f, indent=2, default=str)
+
+            staging_dir.rename(self.root / version)
+        except Exception:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+
+        self._set_current(version)
+        self._prune_old_versions()
+        return version
+
+    def current_version(self) -> Optional[str]:
+        current_file = self.root / CURRENT_FILE
+        if not current_file.exists():
+            return None
+        version = current_file.read_text().strip()
+        return version or None
+
+    def open(self, version: str = None) -> Optional[ModelArtifact]:
+        """Open the requested (or current) version, reusing an already opened one"""
+        version = version or self.current_version()
+        if not version:
+            return None
+
+        artifact_dir = self.root / version
+        cache_key = str(artifact_dir.resolve())
+
+        with _artifact_cache_lock:
+            artifact = _artifact_cache.get(cache_key)
+            if artifact is not None:
+                return artifact
+
+            manifest_path = artifact_dir / MANIFEST_FILE
+            if not manifest_path.exists():
+                logger.warning(f"Model artifact {version} has no manifest")
+                return None
+
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+
+            if manifest.get("format_version") != ARTIFACT_FORMAT_VERSION:
+                logger.warning(f"Unsupported model artifact format: {manifest.get('format_version')}")
+                return None
+
+            artifact = ModelArtifact(artifact_dir, manifest)
+            _artifact_cache[cache_key] = artifact
+            return artifact
+
+    def list_versions(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir() and p.name.startswith("v"))
+
+    def _set_current(self, version: str):
+        tmp_file = self.root / f"{CURRENT_FILE}.tmp"
+        tmp_file.write_text(version)
+        os.replace(tmp_file, self.root / CURRENT_FILE)
+
+    def _prune_old_versions(self):
+        current = self.current_version()
+        previous = [v for v in self.list_versions() if v != current]
+        keep_previous = max(self.keep_versions - 1, 0)
+        for version in previous[:len(previous) - keep_previous]:
+            shutil.rmtree(self.root / version, ignore_errors=True)
+            with _artifact_cache_lock:
+                _artifact_cache.pop(str((self.root / version).resolve()), None)
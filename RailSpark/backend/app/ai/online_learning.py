@@ -0,0 +1,295 @@
+import pandas as pd
+import numpy as np
+import bisect
+import os
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class OutcomeBuffer:
+    """Predictions waiting for an observed outcome, plus their resolved labels.
+
+    A prediction becomes a positive example when a job card is opened for the
+    train within ``horizon_days`` of the prediction, and a negative one once
+    the horizon passes without a job card. At most one prediction per train is
+    recorded per ``record_interval`` so repeated dashboard refreshes do not
+    flood the buffer. Rows are kept in memory and persisted to a CSV file.
+    """
+
+    def __init__(self, feature_names: List[str], path: Path = Path("data/online/outcome_buffer.csv"),
+                 horizon_days: int = 14, record_interval: timedelta = timedelta(days=1),
+                 resolve_interval: timedelta = timedelta(minutes=15), retention_days: int = 180):
+        self.feature_names = list(feature_names)
+        self.path = Path(path)
+        self.horizon = timedelta(days=horizon_days)
+        self.record_interval = record_interval
+        self.resolve_interval = resolve_interval
+        self.retention = timedelta(days=retention_days)
+        self.columns = ['train_id', 'predicted_at', 'failure_probability', 'label', 'resolved_at', 'used'] + self.feature_names
+
+        self._lock = threading.Lock()
+        self._frame = self._load()
+        self._new_rows: List[Dict[str, Any]] = []
+        self._last_recorded: Dict[int, datetime] = {}
+        self._last_resolved: Optional[datetime] = None
+
+        if not self._frame.empty:
+            latest = self._frame.groupby('train_id')['predicted_at'].max()
+            self._last_recorded = {int(k): v.to_pydatetime() for k, v in latest.items()}
+
+    def record(self, train_id: int, features: Dict[str, Any], probability: float, predicted_at: datetime = None):
+        """Remember a prediction so its outcome can be learned from later"""
+        predicted_at = predicted_at or datetime.now()
+        last = self._last_recorded.get(train_id)
+        if last is not None and predicted_at - last < self.record_interval:
+            return
+
+        row = {
+            'train_id': train_id,
+            'predicted_at': predicted_at,
+            'failure_probability': float(probability),
+            'label': np.nan,
+            'resolved_at': pd.NaT,
+            'used': False,
+        }
+        row.update({name: float(features.get(name, 0.0)) for name in self.feature_names})
+
+        with self._lock:
+            self._last_recorded[train_id] = predicted_at
+            self._new_rows.append(row)
+
+    def resolve(self, db, force: bool = False) -> pd.DataFrame:
+        """Label pending predictions from job cards; returns the newly labelled rows"""
+        now = datetime.now()
+        if not force and self._last_resolved and now - self._last_resolved < self.resolve_interval:
+            return pd.DataFrame(columns=self.columns)
+
+        with self._lock:
+            self._merge_new_rows()
+            self._last_resolved = now
+            pending = self._frame[self._frame['label'].isna()]
+            if pending.empty:
+                return pd.DataFrame(columns=self.columns)
+
+            job_times = self._job_card_times(db, pending['predicted_at'].min())
+
+            labels, resolved_at = [], []
+            for train_id, predicted_at in zip(pending['train_id'], pending['predicted_at']):
+                times = job_times.get(int(train_id), [])
+                position = bisect.bisect_right(times, predicted_at)
+                deadline = predicted_at + self.horizon
+                if position < len(times) and times[position] <= deadline:
+                    labels.append(1.0)
+                    resolved_at.append(times[position])
+                elif now >= deadline:
+                    labels.append(0.0)
+                    resolved_at.append(deadline)
+                else:
+                    labels.append(np.nan)
+                    resolved_at.append(pd.NaT)
+
+            self._frame.loc[pending.index, 'label'] = labels
+            self._frame.loc[pending.index, 'resolved_at'] = pd.to_datetime(pd.Series(resolved_at, index=pending.index))
+            newly_labelled = self._frame.loc[pending.index].dropna(subset=['label'])
+
+            self._prune(now)
+            self._save()
+
+        if not newly_labelled.empty:
+            logger.info(f"Resolved {len(newly_labelled)} prediction outcomes "
+                        f"({int(newly_labelled['label'].sum())} failures)")
+        return newly_labelled
+
+    def training_batch(self) -> pd.DataFrame:
+        """Labelled outcomes that have not been used for an update yet"""
+        with self._lock:
+            self._merge_new_rows()
+            frame = self._frame
+            return frame[frame['label'].notna() & ~frame['used']].copy()
+
+    def mark_used(self, index):
+        with self._lock:
+            self._frame.loc[index, 'used'] = True
+            self._save()
+
+    def flush(self):
+        with self._lock:
+            self._merge_new_rows()
+            self._save()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._merge_new_rows()
+            frame = self._frame
+            labelled = frame['label'].notna()
+            return {
+                "buffered_predictions": len(frame),
+                "pending_outcomes": int((~labelled).sum()),
+                "labelled_outcomes": int(labelled.sum()),
+                "unused_outcomes": int((labelled & ~frame['used']).sum()),
+                "observed_failure_rate": float(frame.loc[labelled, 'label'].mean()) if labelled.any() else None,
+            }
+
+    def _job_card_times(self, db, since: datetime) -> Dict[int, List[datetime]]:
+        # One query for every pending prediction instead of one per train
+        from models import JobCard
+        rows = db.query(JobCard.train_id, JobCard.created_at).filter(
+            JobCard.created_at >= since
+        ).order_by(JobCard.created_at).all()
+
+        times: Dict[int, List[datetime]] = {}
+        for train_id, created_at in rows:
+            if created_at is not None:
+                # Predictions are timestamped in naive local time
+                if created_at.tzinfo is not None:
+                    created_at = created_at.astimezone().replace(tzinfo=None)
+                times.setdefault(train_id, []).append(pd.Timestamp(created_at))
+        return times
+
+    def _merge_new_rows(self):
+        if self._new_rows:
+            new_frame = self._normalise(pd.DataFrame(self._new_rows, columns=self.columns))
+            self._frame = new_frame if self._frame.empty else pd.concat([self._frame, new_frame], ignore_index=True)
+            self._new_rows = []
+
+    def _prune(self, now: datetime):
+        expired = (self._frame['used'] | self._frame['label'].notna()) & (self._frame['predicted_at'] < now - self.retention)
+        if expired.any():
+            self._frame = self._frame[~expired].reset_index(drop=True)
+
+    def _normalise(self, frame: pd.DataFrame) -> pd.DataFrame:
+        for column in self.columns:
+            if column not in frame:
+                frame[column] = 0.0
+        frame['predicted_at'] = pd.to_datetime(frame['predicted_at']).astype('datetime64[ns]')
+        frame['resolved_at'] = pd.to_datetime(frame['resolved_at']).astype('datetime64[ns]')
+        frame['label'] = frame['label'].astype(float)
+        frame['used'] = frame['used'].astype(bool)
+        return frame[self.columns]
+
+    def _load(self) -> pd.DataFrame:
+        if self.path.exists():
+            try:
+                return self._normalise(pd.read_csv(self.path))
+            except Exception as e:
+                logger.error(f"Error loading outcome buffer {self.path}: {e}")
+        return self._normalise(pd.DataFrame(columns=self.columns))
+
+    def _save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            self._frame.to_csv(tmp_path, index=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Error saving outcome buffer: {e}")
+
+
+class DriftMonitor:
+    """Cheap running drift statistics for live predictions.
+
+    Feature means and variances are accumulated with Welford's algorithm and
+    compared against the training reference as standardised mean shifts and
+    ratios of live to training standard deviation.
+    Resolved outcomes feed a running Brier score and accuracy.
+    """
+
+    def __init__(self, feature_names: List[str], shift_threshold: float = 0.5):
+        self.feature_names = list(feature_names)
+        self.shift_threshold = shift_threshold
+        self._lock = threading.Lock()
+        self.reference: Dict[str, Any] = {}
+        self.reference_version = None
+        self._reset()
+
+    def set_reference(self, reference: Optional[Dict[str, Any]], version: str = None):
+        """Compare against a new model's training data; resets live statistics on version change"""
+        with self._lock:
+            if version is not None and version == self.reference_version:
+                return
+            self.reference = reference or {}
+            self.reference_version = version
+            self._reset()
+
+    def update(self, features: Dict[str, Any], probability: float):
+        vector = np.array([float(features.get(name, 0.0)) for name in self.feature_names])
+        with self._lock:
+            self.count += 1
+            delta = vector - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (vector - self.mean)
+            self.probability_sum += probability
+
+    def record_outcomes(self, labels: np.ndarray, probabilities: np.ndarray):
+        labels = np.asarray(labels, dtype=float)
+        probabilities = np.asarray(probabilities, dtype=float)
+        with self._lock:
+            self.outcome_count += len(labels)
+            self.brier_sum += float(np.sum((probabilities - labels) ** 2))
+            self.correct += int(np.sum((probabilities >= 0.5) == (labels == 1)))
+            self.positive_outcomes += int(labels.sum())
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            feature_shift = {}
+            spread_ratio = {}
+            for i, name in enumerate(self.feature_names):
+                ref = self.reference.get('features', {}).get(name)
+                if ref and self.count:
+                    feature_shift[name] = round(float((self.mean[i] - ref['mean']) / (ref['std'] or 1.0)), 4)
+                if ref and self.count > 1 and ref['std']:
+                    live_std = np.sqrt(self.m2[i] / (self.count - 1))
+                    spread_ratio[name] = round(float(live_std / ref['std']), 4)
+
+            drift_score = max((abs(v) for v in feature_shift.values()), default=0.0)
+            return {
+                "model_version": self.reference_version,
+                "predictions_observed": self.count,
+                "feature_shift": feature_shift,
+                "feature_spread_ratio": spread_ratio,
+                "drift_score": drift_score,
+                "drifted_features": [name for name, v in feature_shift.items() if abs(v) > self.shift_threshold],
+                "mean_predicted_probability": self.probability_sum / self.count if self.count else None,
+                "training_failure_rate": self.reference.get('failure_rate'),
+                "outcomes_observed": self.outcome_count,
+                "observed_failure_rate": self.positive_outcomes / self.outcome_count if self.outcome_count else None,
+                "brier_score": self.brier_sum / self.outcome_count if self.outcome_count else None,
+                "accuracy": self.correct / self.outcome_count if self.outcome_count else None,
+            }
+
+    def _reset(self):
+        self.count = 0
+        self.mean = np.zeros(len(self.feature_names))
+        self.m2 = np.zeros(len(self.feature_names))
+        self.probability_sum = 0.0
+        self.outcome_count = 0
+        self.brier_sum = 0.0
+        self.correct = 0
+        self.positive_outcomes = 0
+
+
+# Process-level instances shared by every request-scoped MLModel
+_outcome_buffer: Optional[OutcomeBuffer] = None
+_drift_monitor: Optional[DriftMonitor] = None
+_instances_lock = threading.Lock()
+
+
+def get_outcome_buffer(feature_names: List[str]) -> OutcomeBuffer:
+    global _outcome_buffer
+    with _instances_lock:
+        if _outcome_buffer is None:
+            _outcome_buffer = OutcomeBuffer(feature_names)
+        return _outcome_buffer
+
+
+def get_drift_monitor(feature_names: List[str]) -> DriftMonitor:
+    global _drift_monitor
+    with _instances_lock:
+        if _drift_monitor is None:
+            _drift_monitor = DriftMonitor(feature_names)
+        return _drift_monitor
@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import date, datetime, timedelta
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 import crud
 from .rule_engine import AdvancedRuleEngine
@@ -40,6 +40,8 @@ class OptimizationConstraints:
     service_weight: float = 0.6
     standby_weight: float = 0.25
     maintenance_weight: float = 0.15
+    # Trains that must stay out of service and standby (e.g. still in the depot)
+    unavailable_train_ids: List[int] = field(default_factory=list)
 
 class InductionOptimizer:
     def __init__(self, db: Session):
@@ -47,6 +49,25 @@ class InductionOptimizer:
         self.rule_engine = AdvancedRuleEngine(db)
         self.solver = None
     
+    # Data access, overridden by optimizers that plan against an in-memory fleet
+    def _load_train(self, train_id: int):
+        return crud.trains.read_train(self.db, train_id)
+    
+    def _load_active_contracts(self, train_id: int) -> List:
+        return crud.branding.read_active_contracts(self.db, train_id)
+    
+    def _load_cleaning_slots(self, train_id: int) -> List:
+        return crud.cleaning.read_slots_by_train(self.db, train_id)
+    
+    def _load_stabling_geometry(self, train_id: int):
+        return crud.stabling.read_geometry_by_train(self.db, train_id)
+    
+    def _load_performance_history(self, train_id: int):
+        return crud.get_train_performance_history(self.db, train_id, 30)  # Last 30 days
+    
+    def _load_crew_availability(self):
+        return crud.get_crew_availability(self.db, date.today())  # Use current date
+    
     def optimize_induction_plan(self, plan_date: date = None, 
                           constraints: OptimizationConstraints = None) -> List[OptimizationResult]:
         """Generate optimized induction plan using MILP optimization"""
@@ -72,7 +93,7 @@ class InductionOptimizer:
         eligible_trains = []
         for train_id in train_ids:
             try:
-                train = crud.trains.read_train(self.db, train_id)
+                train = self._load_train(train_id)
                 if train:
                     eligible_trains.append(train)
             except Exception as e:
@@ -177,7 +198,7 @@ class InductionOptimizer:
     
     def _calculate_advanced_branding_score(self, train, plan_date: date) -> float:
         """Advanced branding exposure scoring with contract prioritization"""
-        active_contracts = crud.branding.read_active_contracts(self.db, train.id)
+        active_contracts = self._load_active_contracts(train.id)
         if not active_contracts:
             return 0.3  # Lower priority for trains without branding
         
@@ -223,7 +244,7 @@ class InductionOptimizer:
     
     def _calculate_advanced_cleaning_score(self, train, plan_date: date) -> float:
         """Advanced cleaning schedule scoring"""
-        cleaning_slots = crud.cleaning.read_slots_by_train(self.db, train.id)
+        cleaning_slots = self._load_cleaning_slots(train.id)
         
         if not cleaning_slots:
             return 0.3  # Lower score if no cleaning history
@@ -247,7 +268,7 @@ class InductionOptimizer:
     
     def _calculate_advanced_stabling_score(self, train) -> float:
         """Advanced stabling position optimization"""
-        stabling_info = crud.stabling.read_geometry_by_train(self.db, train.id)
+        stabling_info = self._load_stabling_geometry(train.id)
         if not stabling_info:
             return 0.5
         
@@ -275,7 +296,7 @@ class InductionOptimizer:
         """Advanced historical performance scoring"""
         try:
             # Get historical performance data - this returns a dictionary, not an iterable object
-            historical_data = crud.get_train_performance_history(self.db, train.id, 30)  # Last 30 days
+            historical_data = self._load_performance_history(train.id)
             
             if not historical_data:
                 return 0.7
@@ -317,7 +338,7 @@ class InductionOptimizer:
         
         # Crew availability (simplified) - FIX: Handle dictionary return type
         try:
-            crew_data = crud.get_crew_availability(self.db, date.today())  # Use current date
+            crew_data = self._load_crew_availability()
             if isinstance(crew_data, dict):
                 utilization_rate = crew_data.get('utilization_rate', 0.5)
                 factors.append(utilization_rate)
@@ -430,6 +451,13 @@ class InductionOptimizer:
             for j in range(n_types):
                 constraint.SetCoefficient(x[i, j], 1)
         
+        # Unavailable trains can only be assigned to maintenance
+        unavailable = set(constraints.unavailable_train_ids)
+        for i in range(n_trains):
+            if trains[i].id in unavailable:
+                x[i, 0].SetUb(0)
+                x[i, 1].SetUb(0)
+        
         # Service train count constraints
         service_constraint = solver.Constraint(constraints.min_service_trains, 
                                              constraints.max_service_trains)
@@ -513,20 +541,24 @@ class InductionOptimizer:
         # Sort trains by combined score (descending)
         sorted_trains = sorted(trains, key=lambda t: scores[t.id]['combined_score'], reverse=True)
         
+        # Unavailable trains only take part in the maintenance phase
+        unavailable = set(constraints.unavailable_train_ids)
+        available_trains = [t for t in sorted_trains if t.id not in unavailable]
+        
         results = []
         service_count = 0
         standby_count = 0
         maintenance_count = 0
         
         # Phase 1: Assign mandatory service trains (highest scores)
-        for train in sorted_trains:
+        for train in available_trains:
             if service_count < constraints.min_service_trains:
                 results.append(self._create_result(train, scores, InductionType.SERVICE, 
                                                  "Minimum service requirement"))
                 service_count += 1
         
         # Phase 2: Assign optimal service trains
-        for train in sorted_trains:
+        for train in available_trains:
             if train.id in [r.train_id for r in results]:
                 continue  # Skip already assigned trains
                 
@@ -537,7 +569,7 @@ class InductionOptimizer:
                 service_count += 1
         
         # Phase 3: Assign standby trains
-        for train in sorted_trains:
+        for train in available_trains:
             if train.id in [r.train_id for r in results]:
                 continue
                 
@@ -3,6 +3,7 @@ from typing import List, Dict, Any, Optional, Tuple
 from datetime import date, datetime, timedelta
 from dataclasses import dataclass
 from enum import Enum
+from collections import Counter
 import numpy as np
 from scipy.optimize import linear_sum_assignment
 import crud
@@ -34,6 +35,81 @@ class TrainReadiness:
     estimated_uptime: timedelta
     risk_factor: float
 
+# Statuses that count a train as available for service
+AVAILABLE_STATUSES = (TrainStatus.AVAILABLE, TrainStatus.RESTRICTED)
+
+# Lower score bounds of the fair, good and excellent readiness buckets; below the first is poor
+READINESS_BUCKET_EDGES = np.array([0.4, 0.6, 0.8])
+READINESS_BUCKETS = ("poor", "fair", "good", "excellent")
+
+# Score from which an available train counts as highly ready for capacity planning
+HIGH_READINESS_SCORE = 0.8
+
+@dataclass
+class ReadinessStats:
+    """Summary figures of a readiness assessment, gathered in one pass.
+
+    Scores, availability and constraint counts are collected in a single
+    loop; the bucket distribution is one digitize/bincount over the scores.
+    """
+    readiness: List[TrainReadiness]
+    scores: np.ndarray
+    available: int
+    constraint_counts: Counter
+    maintenance_needed: int = 0
+    high_readiness_available: int = 0  # Available trains scoring at least HIGH_READINESS_SCORE
+    risk_factor_sum: float = 0.0
+
+    @classmethod
+    def from_readiness(cls, readiness: List[TrainReadiness]) -> "ReadinessStats":
+        # Plain lists in the loop; per-item numpy writes and Counter updates cost more than the pass
+        scores = []
+        constraints = []
+        available = 0
+        maintenance_needed = 0
+        high_readiness = 0
+        risk_factor_sum = 0.0
+        for train in readiness:
+            scores.append(train.readiness_score)
+            if train.status in AVAILABLE_STATUSES:
+                available += 1
+                if train.readiness_score >= HIGH_READINESS_SCORE:
+                    high_readiness += 1
+            elif train.status == TrainStatus.MAINTENANCE_NEEDED:
+                maintenance_needed += 1
+            risk_factor_sum += train.risk_factor
+            constraints.extend(train.constraints)
+        return cls(readiness, np.array(scores, dtype=float), available, Counter(constraints),
+                   maintenance_needed, high_readiness, risk_factor_sum)
+
+    @property
+    def total(self) -> int:
+        return len(self.scores)
+
+    @property
+    def average_score(self) -> float:
+        return float(self.scores.mean()) if self.total else 0.0
+
+    @property
+    def average_risk_factor(self) -> Optional[float]:
+        return self.risk_factor_sum / self.total if self.total else None
+
+    @property
+    def availability_rate(self) -> float:
+        return self.available / self.total if self.total else 0.0
+
+    def distribution(self) -> Dict[str, int]:
+        counts = np.bincount(np.digitize(self.scores, READINESS_BUCKET_EDGES), minlength=len(READINESS_BUCKETS))
+        by_bucket = dict(zip(READINESS_BUCKETS, counts.tolist()))
+        return {bucket: by_bucket[bucket] for bucket in reversed(READINESS_BUCKETS)}
+
+    def top_constraints(self, n: int = 5) -> Dict[str, int]:
+        return dict(self.constraint_counts.most_common(n))
+
+    def below(self, threshold: float) -> List[TrainReadiness]:
+        """Trains scoring under ``threshold``, in assessment order"""
+        return [self.readiness[i] for i in np.flatnonzero(self.scores < threshold)]
+
 @dataclass
 class ResourceAllocation:
     train_id: int
@@ -55,6 +131,8 @@ class AdvancedRuleEngine:
             'cost': 0.10,
             'utilization': 0.10
         }
+        # Certificates of the fleet from the latest readiness assessment, by train id
+        self._certificates_by_train: Optional[Dict[int, List]] = None
     
     def generate_induction_plan(self, 
                               plan_date: date,
@@ -110,11 +188,18 @@ class AdvancedRuleEngine:
         """
         # Use safe database query with error handling
         try:
-            trains = crud.trains.read_trains(self.db)
+            trains = self._load_trains()
         except Exception as e:
             print(f"Error fetching trains: {e}")
             return []
         
+        # Each train's certificates are scored several times; load the fleet's once
+        try:
+            self._certificates_by_train = self._load_fleet_certificates(trains)
+        except Exception as e:
+            print(f"Error fetching fleet certificates: {e}")
+            self._certificates_by_train = None
+        
         readiness_scores = []
         
         for train in trains:
@@ -165,6 +250,21 @@ class AdvancedRuleEngine:
         
         return sorted(readiness_scores, key=lambda x: x.readiness_score, reverse=True)
     
+    # Data access, overridden by engines that plan against an in-memory fleet
+    def _load_trains(self) -> List:
+        return list(crud.trains.iter_trains(self.db))
+    
+    def _load_fleet_certificates(self, trains: List) -> Dict[int, List]:
+        return crud.fitness.read_certificates_by_trains(self.db, [t.id for t in trains])
+    
+    def _load_certificates(self, train_id: int) -> List:
+        if self._certificates_by_train is not None:
+            return self._certificates_by_train.get(train_id, [])
+        # Use safe CRUD function call
+        if hasattr(crud, 'fitness') and hasattr(crud.fitness, 'read_certificates_by_train'):
+            return crud.fitness.read_certificates_by_train(self.db, train_id)
+        return []
+    
     def _calculate_base_readiness_score(self, train, plan_date: date) -> float:
         """
         Calculate base readiness score using weighted factors
@@ -205,10 +305,7 @@ class AdvancedRuleEngine:
         Score fitness certificates with graceful degradation
         """
         try:
-            # Use safe CRUD function call
-            certs = []
-            if hasattr(crud, 'fitness') and hasattr(crud.fitness, 'read_certificates_by_train'):
-                certs = crud.fitness.read_certificates_by_train(self.db, train_id)
+            certs = self._load_certificates(train_id)
             
             if not certs:
                 return 0.3  # Base score for no certificates
@@ -493,9 +590,7 @@ class AdvancedRuleEngine:
         # Certificate constraints (reduced penalty)
         train_id = getattr(train, 'id', 0)
         try:
-            certs = []
-            if hasattr(crud, 'fitness') and hasattr(crud.fitness, 'read_certificates_by_train'):
-                certs = crud.fitness.read_certificates_by_train(self.db, train_id)
+            certs = self._load_certificates(train_id)
             
             if not certs:
                 penalties += 0.1  # Reduced from original
@@ -646,31 +741,14 @@ class AdvancedRuleEngine:
     
     def _summarize_readiness(self, readiness: List[TrainReadiness]) -> Dict[str, Any]:
         """Summarize overall readiness assessment"""
-        total_trains = len(readiness)
-        if total_trains == 0:
-            return {
-                "total_trains_assessed": 0,
-                "available_trains": 0,
-                "availability_rate": 0,
-                "average_readiness_score": 0,
-                "readiness_distribution": {
-                    "excellent": 0, "good": 0, "fair": 0, "poor": 0
-                }
-            }
-        
-        available = len([t for t in readiness if t.status in [TrainStatus.AVAILABLE, TrainStatus.RESTRICTED]])
+        stats = ReadinessStats.from_readiness(readiness)
         
         return {
-            "total_trains_assessed": total_trains,
-            "available_trains": available,
-            "availability_rate": available / total_trains,
-            "average_readiness_score": np.mean([t.readiness_score for t in readiness]) if readiness else 0,
-            "readiness_distribution": {
-                "excellent": len([t for t in readiness if t.readiness_score >= 0.8]),
-                "good": len([t for t in readiness if 0.6 <= t.readiness_score < 0.8]),
-                "fair": len([t for t in readiness if 0.4 <= t.readiness_score < 0.6]),
-                "poor": len([t for t in readiness if t.readiness_score < 0.4])
-            }
+            "total_trains_assessed": stats.total,
+            "available_trains": stats.available,
+            "availability_rate": stats.availability_rate,
+            "average_readiness_score": stats.average_score,
+            "readiness_distribution": stats.distribution()
         }
     
     def _calculate_efficiency_metrics(self, allocations: List[ResourceAllocation]) -> Dict[str, float]:
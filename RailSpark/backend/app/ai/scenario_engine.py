@@ -0,0 +1,415 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+from collections import Counter
+import copy
+import threading
+import time
+import logging
+
+from .rule_engine import AdvancedRuleEngine
+from .optimizer import InductionOptimizer, OptimizationConstraints, OptimizationResult
+
+logger = logging.getLogger(__name__)
+
+# Certificate departments issued to simulated trains; the rule engine expects five
+SIMULATED_CERTIFICATE_DEPARTMENTS = ["Rolling-Stock", "Signalling", "Telecom", "Electrical", "Safety"]
+
+
+def _detach(obj) -> SimpleNamespace:
+    """Plain copy of an ORM row's columns, safe to read after the session closes"""
+    return SimpleNamespace(**{column.key: getattr(obj, column.key) for column in obj.__table__.columns})
+
+
+class FleetSnapshot:
+    """In-memory copy of the fleet data the induction planners read.
+
+    Snapshots are never written back to the database. ``clone()`` is cheap:
+    a clone shares every collection with its parent until it modifies one,
+    at which point only that collection is copied (copy-on-write), and
+    modified records are replaced rather than mutated.
+    """
+
+    def __init__(self, trains: Dict[int, Any], certificates: Dict[int, List[Any]],
+                 contracts: Dict[int, List[Any]], cleaning_slots: Dict[int, List[Any]],
+                 stabling: Dict[int, Any], in_maintenance: Iterable[int], captured_at: datetime = None):
+        self._trains = trains
+        self._certificates = certificates
+        self._contracts = contracts
+        self._cleaning_slots = cleaning_slots
+        self._stabling = stabling
+        self._in_maintenance = frozenset(in_maintenance)
+        self.captured_at = captured_at or datetime.now()
+        self._owned = set()
+
+    @classmethod
+    def load(cls, db: Session) -> "FleetSnapshot":
+        """Read the whole fleet with one query per table"""
+        from models import Train, FitnessCertificate, BrandingContract, CleaningSlot, StablingGeometry, JobCard
+
+        today = date.today()
+        trains = {train.id: _detach(train) for train in db.query(Train).order_by(Train.id).all()}
+
+        certificates: Dict[int, List[Any]] = {}
+        for cert in db.query(FitnessCertificate).all():
+            certificates.setdefault(cert.train_id, []).append(_detach(cert))
+
+        contracts: Dict[int, List[Any]] = {}
+        for contract in db.query(BrandingContract).filter(
+            BrandingContract.start_date <= today,
+            BrandingContract.end_date >= today
+        ).all():
+            contracts.setdefault(contract.train_id, []).append(_detach(contract))
+
+        # Only the most recent completed cleaning affects the cleaning score
+        cleaning_slots: Dict[int, List[Any]] = {}
+        for train_id, last_cleaned in db.query(CleaningSlot.train_id, func.max(CleaningSlot.slot_time)).filter(
+            CleaningSlot.status == "completed",
+            CleaningSlot.slot_time <= datetime.now()
+        ).group_by(CleaningSlot.train_id).all():
+            cleaning_slots[train_id] = [SimpleNamespace(train_id=train_id, status="completed", slot_time=last_cleaned)]
+
+        stabling: Dict[int, Any] = {}
+        for geometry in db.query(StablingGeometry).order_by(StablingGeometry.id).all():
+            stabling.setdefault(geometry.train_id, _detach(geometry))
+
+        in_maintenance = {train_id for (train_id,) in db.query(JobCard.train_id).filter(
+            JobCard.status == "open"
+        ).distinct().all()}
+        in_maintenance |= {
+            train.id for train in trains.values()
+            if "maintenance" in (train.status, train.equipment_status)
+        }
+
+        return cls(trains, certificates, contracts, cleaning_slots, stabling, in_maintenance & set(trains))
+
+    def clone(self) -> "FleetSnapshot":
+        cloned = copy.copy(self)
+        cloned._owned = set()
+        return cloned
+
+    # Reads
+    def trains(self) -> List[Any]:
+        return list(self._trains.values())
+
+    def train(self, train_id: int) -> Optional[Any]:
+        return self._trains.get(train_id)
+
+    def certificates(self, train_id: int) -> List[Any]:
+        return self._certificates.get(train_id, [])
+
+    def active_contracts(self, train_id: int) -> List[Any]:
+        return self._contracts.get(train_id, [])
+
+    def cleaning_slots(self, train_id: int) -> List[Any]:
+        return self._cleaning_slots.get(train_id, [])
+
+    def stabling_geometry(self, train_id: int) -> Optional[Any]:
+        return self._stabling.get(train_id)
+
+    @property
+    def in_maintenance(self) -> frozenset:
+        return self._in_maintenance
+
+    # Copy-on-write modifications
+    def add_train(self, train: Any, certificates: List[Any] = None):
+        self._writable("_trains")[train.id] = train
+        if certificates:
+            self._writable("_certificates")[train.id] = list(certificates)
+
+    def update_train(self, train_id: int, **changes):
+        trains = self._writable("_trains")
+        trains[train_id] = SimpleNamespace(**{**vars(trains[train_id]), **changes})
+
+    def add_contract(self, contract: Any):
+        contracts = self._writable("_contracts")
+        contracts[contract.train_id] = contracts.get(contract.train_id, []) + [contract]
+
+    def _writable(self, name: str) -> Dict:
+        if name not in self._owned:
+            setattr(self, name, dict(getattr(self, name)))
+            self._owned.add(name)
+        return getattr(self, name)
+
+
+class ScenarioRuleEngine(AdvancedRuleEngine):
+    """Rule engine that assesses readiness from a fleet snapshot"""
+
+    def __init__(self, snapshot: FleetSnapshot):
+        super().__init__(db=None)
+        self.snapshot = snapshot
+
+    def _load_trains(self) -> List:
+        return self.snapshot.trains()
+
+    def _load_fleet_certificates(self, trains: List) -> Dict[int, List]:
+        return {train.id: self.snapshot.certificates(train.id) for train in trains}
+
+    def _load_certificates(self, train_id: int) -> List:
+        return self.snapshot.certificates(train_id)
+
+
+class ScenarioOptimizer(InductionOptimizer):
+    """Induction optimizer that solves against a fleet snapshot.
+
+    Performance history and crew availability have no stored data behind
+    them, so the neutral scores the live optimizer falls back to are used.
+    """
+
+    def __init__(self, snapshot: FleetSnapshot):
+        super().__init__(db=None)
+        self.snapshot = snapshot
+        self.rule_engine = ScenarioRuleEngine(snapshot)
+
+    def _load_train(self, train_id: int):
+        return self.snapshot.train(train_id)
+
+    def _load_active_contracts(self, train_id: int) -> List:
+        return self.snapshot.active_contracts(train_id)
+
+    def _load_cleaning_slots(self, train_id: int) -> List:
+        return self.snapshot.cleaning_slots(train_id)
+
+    def _load_stabling_geometry(self, train_id: int):
+        return self.snapshot.stabling_geometry(train_id)
+
+    def _load_performance_history(self, train_id: int):
+        return None
+
+    def _load_crew_availability(self):
+        return None
+
+
+@dataclass
+class ScenarioResult:
+    title: str
+    assumptions: List[str]
+    baseline_counts: Dict[str, int]
+    scenario_counts: Dict[str, int]
+    changes: List[Dict[str, Any]]
+    baseline_service_score: float
+    scenario_service_score: float
+    violations: List[str]
+    fleet_size: int
+    elapsed_ms: float
+    details: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "title": self.title,
+            "assumptions": self.assumptions,
+            "baseline_counts": self.baseline_counts,
+            "scenario_counts": self.scenario_counts,
+            "changes": self.changes,
+            "baseline_service_score": self.baseline_service_score,
+            "scenario_service_score": self.scenario_service_score,
+            "violations": self.violations,
+            "fleet_size": self.fleet_size,
+            "elapsed_ms": self.elapsed_ms,
+            "details": self.details,
+        }
+
+
+class ScenarioEngine:
+    """Answers what-if questions by re-solving the induction plan on a modified
+    copy of the fleet.
+
+    The fleet is read from the database at most once per ``snapshot_ttl``
+    seconds; each scenario clones that snapshot, applies its change and runs
+    the optimizer on the clone, so the database is never modified.
+    """
+
+    def __init__(self, snapshot_ttl: float = 60.0):
+        self.snapshot_ttl = snapshot_ttl
+        self._lock = threading.Lock()
+        self._snapshot: Optional[FleetSnapshot] = None
+        self._snapshot_loaded = 0.0
+        # Baseline plan per plan date, with the snapshot it was solved from
+        self._baseline: Dict[date, Tuple[FleetSnapshot, List[OptimizationResult]]] = {}
+
+    def snapshot(self, db: Session) -> FleetSnapshot:
+        with self._lock:
+            if self._snapshot is None or time.monotonic() - self._snapshot_loaded > self.snapshot_ttl:
+                self._snapshot = FleetSnapshot.load(db)
+                self._snapshot_loaded = time.monotonic()
+                self._baseline = {}
+            return self._snapshot
+
+    def baseline(self, db: Session, plan_date: date = None) -> List[OptimizationResult]:
+        plan_date = plan_date or date.today() + timedelta(days=1)
+        snapshot = self.snapshot(db)
+        with self._lock:
+            cached = self._baseline.get(plan_date)
+        if cached is not None and cached[0] is snapshot:
+            return cached[1]
+
+        # Solved outside the lock; a plan for a snapshot that has been
+        # replaced meanwhile is returned but not cached
+        plan = self._solve(snapshot, plan_date)
+        with self._lock:
+            if self._snapshot is snapshot:
+                self._baseline[plan_date] = (snapshot, plan)
+        return plan
+
+    def simulate_additional_trains(self, db: Session, count: int, plan_date: date = None) -> ScenarioResult:
+        """Add ``count`` new, fully certified trains to the fleet"""
+        started = time.perf_counter()
+        scenario = self.snapshot(db).clone()
+        today = date.today()
+
+        next_id = min([0] + [train.id for train in scenario.trains()]) - 1
+        added = []
+        for k in range(count):
+            train_id = next_id - k
+            train = SimpleNamespace(
+                id=train_id, train_number=f"SIM-{k + 1:02d}", current_mileage=0,
+                last_maintenance_date=today, maintenance_interval=90,
+                equipment_status="operational", status="active"
+            )
+            certificates = [
+                SimpleNamespace(id=train_id * 10 - i, train_id=train_id, department=department,
+                                valid_from=today, valid_until=today + timedelta(days=365), is_valid=True)
+                for i, department in enumerate(SIMULATED_CERTIFICATE_DEPARTMENTS)
+            ]
+            scenario.add_train(train, certificates)
+            added.append(train.train_number)
+
+        return self._evaluate(
+            db, scenario, plan_date, started,
+            title=f"Adding {count} Trains",
+            assumptions=[
+                "New trains arrive with zero mileage and fresh maintenance",
+                f"New trains hold valid certificates for {len(SIMULATED_CERTIFICATE_DEPARTMENTS)} departments",
+                "Service and standby limits stay unchanged",
+            ],
+            details={"added_trains": added}
+        )
+
+    def simulate_maintenance_extension(self, db: Session, days: int, plan_date: date = None) -> ScenarioResult:
+        """Maintenance takes ``days`` longer than planned.
+
+        Trains currently in maintenance (open job cards or maintenance status)
+        stay out of service and standby on the plan date, and trains falling
+        due during the extension queue behind them, running ``days`` longer
+        since their last maintenance.
+        """
+        started = time.perf_counter()
+        plan_date = plan_date or date.today() + timedelta(days=1)
+        base = self.snapshot(db)
+        scenario = base.clone()
+
+        held = sorted(base.in_maintenance)
+        delayed = []
+        for train in base.trains():
+            if train.id in base.in_maintenance or not train.last_maintenance_date:
+                continue
+            days_since = (plan_date - train.last_maintenance_date).days
+            if days_since + days >= (train.maintenance_interval or 90):
+                scenario.update_train(train.id, last_maintenance_date=train.last_maintenance_date - timedelta(days=days))
+                delayed.append(train.train_number)
+
+        constraints = OptimizationConstraints(plan_date=plan_date, unavailable_train_ids=held)
+        return self._evaluate(
+            db, scenario, plan_date, started,
+            title=f"Maintenance Taking {days} Days Longer",
+            assumptions=[
+                f"{len(held)} trains currently in maintenance stay in the depot on {plan_date}",
+                f"{len(delayed)} trains falling due wait {days} extra days for a maintenance slot",
+                "Service and standby limits stay unchanged",
+            ],
+            constraints=constraints,
+            details={
+                "held_trains": [base.train(train_id).train_number for train_id in held],
+                "delayed_trains": delayed,
+            }
+        )
+
+    def simulate_branding_contracts(self, db: Session, count: int = 1, exposure_hours: int = 500,
+                                    contract_value: float = 100000.0, duration_days: int = 30,
+                                    plan_date: date = None) -> ScenarioResult:
+        """Sign ``count`` new branding contracts on trains that carry none"""
+        started = time.perf_counter()
+        base = self.snapshot(db)
+        scenario = base.clone()
+        today = date.today()
+
+        # Wrap the least-used available trains first
+        candidates = sorted(
+            (train for train in base.trains()
+             if not base.active_contracts(train.id) and train.id not in base.in_maintenance),
+            key=lambda train: train.current_mileage or 0
+        )
+        branded = []
+        for k, train in enumerate(candidates[:count]):
+            scenario.add_contract(SimpleNamespace(
+                id=-(k + 1), train_id=train.id, advertiser_name=f"Simulated Advertiser {k + 1}",
+                contract_value=contract_value, exposure_hours_required=exposure_hours,
+                exposure_hours_fulfilled=0, start_date=today, end_date=today + timedelta(days=duration_days)
+            ))
+            branded.append(train.train_number)
+
+        return self._evaluate(
+            db, scenario, plan_date, started,
+            title=f"{len(branded)} New Branding Contract{'s' if len(branded) != 1 else ''}",
+            assumptions=[
+                f"Each contract requires {exposure_hours} exposure hours within {duration_days} days",
+                f"Contract value ₹{contract_value:,.0f} each",
+                "Contracts go to available trains without branding, lowest mileage first",
+            ],
+            details={"branded_trains": branded, "requested_contracts": count}
+        )
+
+    def _evaluate(self, db: Session, scenario: FleetSnapshot, plan_date: Optional[date], started: float,
+                  title: str, assumptions: List[str], constraints: OptimizationConstraints = None,
+                  details: Dict[str, Any] = None) -> ScenarioResult:
+        plan_date = plan_date or date.today() + timedelta(days=1)
+        if constraints is None:
+            constraints = OptimizationConstraints(plan_date=plan_date)
+
+        baseline = self.baseline(db, plan_date)
+        optimizer = ScenarioOptimizer(scenario)
+        plan = self._solve(scenario, plan_date, constraints, optimizer)
+        validation = optimizer.validate_optimization_result(plan, constraints)
+
+        before = {result.train_id: result.induction_type.value for result in baseline}
+        changes = []
+        for result in plan:
+            previous = before.get(result.train_id)
+            if previous != result.induction_type.value:
+                changes.append({
+                    "train_number": result.train_number,
+                    "from": previous or "new",
+                    "to": result.induction_type.value,
+                })
+
+        return ScenarioResult(
+            title=title,
+            assumptions=assumptions,
+            baseline_counts=self._count(baseline),
+            scenario_counts=self._count(plan),
+            changes=changes,
+            baseline_service_score=self._service_score(baseline),
+            scenario_service_score=self._service_score(plan),
+            violations=validation["violations"],
+            fleet_size=len(scenario.trains()),
+            elapsed_ms=(time.perf_counter() - started) * 1000,
+            details=details or {}
+        )
+
+    def _solve(self, snapshot: FleetSnapshot, plan_date: date, constraints: OptimizationConstraints = None,
+               optimizer: ScenarioOptimizer = None) -> List[OptimizationResult]:
+        optimizer = optimizer or ScenarioOptimizer(snapshot)
+        if constraints is None:
+            constraints = OptimizationConstraints(plan_date=plan_date)
+        return optimizer.optimize_induction_plan(plan_date, constraints)
+
+    def _count(self, plan: List[OptimizationResult]) -> Dict[str, int]:
+        counts = Counter(result.induction_type.value for result in plan)
+        return {kind: counts.get(kind, 0) for kind in ("service", "standby", "maintenance")}
+
+    def _service_score(self, plan: List[OptimizationResult]) -> float:
+        scores = [result.score for result in plan if result.induction_type.value == "service"]
+        return float(sum(scores) / len(scores)) if scores else 0.0
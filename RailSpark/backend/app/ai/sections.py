@@ -0,0 +1,108 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from sqlalchemy.orm import Session
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import threading
+import time
+import logging
+
+from database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Section:
+    """One independent part of an answer, loaded with its own session"""
+    name: str
+    load: Callable[[Session], Any]
+    timeout: float = 10.0
+    default: Any = None
+
+
+@dataclass
+class SectionResults:
+    values: Dict[str, Any] = field(default_factory=dict)
+    timed_out: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    elapsed: Dict[str, float] = field(default_factory=dict)
+    defaults: Dict[str, Any] = field(default_factory=dict)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """The section's value, or its default when it was left out"""
+        if name in self.values:
+            return self.values[name]
+        return self.defaults.get(name, default)
+
+    def has(self, name: str) -> bool:
+        return name in self.values
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.timed_out or self.failed)
+
+    def notes(self) -> List[str]:
+        """Human-readable lines describing the sections left out of the answer"""
+        notes = [f"{name} not ready in time" for name in self.timed_out]
+        notes.extend(f"{name} unavailable: {error}" for name, error in self.failed.items())
+        return notes
+
+
+class SectionRunner:
+    """Loads the independent sections of an answer concurrently.
+
+    Each section runs on the pool with a session of its own, since a session
+    must not be shared between threads. Every section has its own deadline
+    measured from submission; one that misses it or raises is reported in
+    the results and replaced by its default, so a slow component only costs
+    its part of the answer. A timed-out section keeps running in the
+    background and closes its session when it finishes.
+    """
+
+    def __init__(self, max_workers: int = 8, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="section")
+
+    def _load(self, section: Section) -> Tuple[Any, float]:
+        db = self.session_factory()
+        started = time.monotonic()
+        try:
+            return section.load(db), time.monotonic() - started
+        finally:
+            db.close()
+
+    def run(self, sections: List[Section]) -> SectionResults:
+        results = SectionResults()
+        started = time.monotonic()
+        futures = [(section, self._executor.submit(self._load, section)) for section in sections]
+        results.defaults = {section.name: section.default for section in sections}
+
+        for section, future in futures:
+            remaining = max(0.0, started + section.timeout - time.monotonic())
+            try:
+                results.values[section.name], results.elapsed[section.name] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                future.cancel()
+                results.timed_out.append(section.name)
+                results.elapsed[section.name] = section.timeout
+                logger.warning(f"Section '{section.name}' exceeded {section.timeout}s")
+            except Exception as e:
+                results.failed[section.name] = str(e)
+                results.elapsed[section.name] = time.monotonic() - started
+                logger.error(f"Section '{section.name}' failed: {e}")
+        return results
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_section_runner: Optional[SectionRunner] = None
+_section_runner_lock = threading.Lock()
+
+
+def get_section_runner() -> SectionRunner:
+    global _section_runner
+    with _section_runner_lock:
+        if _section_runner is None:
+            _section_runner = SectionRunner()
+        return _section_runner
@@ -0,0 +1,109 @@
+from sqlalchemy.orm import Session
+import copy
+import logging
+import threading
+import time
+
+from database import SessionLocal
+from .rule_engine import AdvancedRuleEngine
+from .optimizer import InductionOptimizer
+from .ml_model import MLModel
+from .scenario_engine import ScenarioEngine
+
+logger = logging.getLogger(__name__)
+
+
+class EngineServices:
+    """Process-level access to the AI engines.
+
+    The failure model is loaded (or trained) once per process with a session
+    of its own and handed out as a copy bound to the caller's session: the
+    loaded estimators are shared, but the containers holding them are copied,
+    so a request that refits its copy cannot change the shared model. Changes
+    reach other requests only by publishing a new artifact version. Once per
+    ``maintenance_interval`` a request starts age-based retraining and
+    incremental updates on a background thread; a new version it publishes is
+    picked up by the next request. The rule engine and optimizer hold no
+    expensive state and are created per session.
+    """
+
+    def __init__(self, maintenance_interval: float = 3600.0):
+        self._lock = threading.Lock()
+        self._ml_model = None
+        self._scenario_engine = ScenarioEngine()
+        self.maintenance_interval = maintenance_interval
+        self._last_maintenance = time.monotonic()
+
+    def ml_model(self, db: Session) -> MLModel:
+        run_maintenance = False
+        with self._lock:
+            if self._ml_model is None:
+                self._ml_model = self._load_shared_model()
+            else:
+                # Pick up a model published by another request or process
+                self._ml_model.refresh_if_stale()
+                if time.monotonic() - self._last_maintenance >= self.maintenance_interval:
+                    self._last_maintenance = time.monotonic()
+                    run_maintenance = True
+            shared = self._ml_model
+
+        if run_maintenance:
+            threading.Thread(target=self._maintain, name="ml-maintenance", daemon=True).start()
+
+        model = copy.copy(shared)
+        for name, value in vars(shared).items():
+            if isinstance(value, (dict, list)):
+                setattr(model, name, copy.copy(value))
+        model.db = db
+        return model
+
+    @staticmethod
+    def _load_shared_model() -> MLModel:
+        # Loading may train, which reads the database; the session must not be
+        # a request's, which is closed long before the shared model goes away
+        db = SessionLocal()
+        try:
+            model = MLModel(db)
+        finally:
+            db.close()
+        model.db = None
+        return model
+
+    def _maintain(self):
+        """Age-based retraining and incremental updates on a model of its own"""
+        db = SessionLocal()
+        try:
+            MLModel(db).check_retraining_need()
+        except Exception as e:
+            logger.error(f"Error in model maintenance: {e}")
+        finally:
+            db.close()
+
+    def rule_engine(self, db: Session) -> AdvancedRuleEngine:
+        return AdvancedRuleEngine(db)
+
+    def optimizer(self, db: Session) -> InductionOptimizer:
+        return InductionOptimizer(db)
+
+    def scenario_engine(self) -> ScenarioEngine:
+        # Shared so the fleet snapshot and baseline plan are reused across requests
+        return self._scenario_engine
+
+
+engine_services = EngineServices()
+
+
+def get_ml_model(db: Session) -> MLModel:
+    return engine_services.ml_model(db)
+
+
+def get_rule_engine(db: Session) -> AdvancedRuleEngine:
+    return engine_services.rule_engine(db)
+
+
+def get_optimizer(db: Session) -> InductionOptimizer:
+    return engine_services.optimizer(db)
+
+
+def get_scenario_engine() -> ScenarioEngine:
+    return engine_services.scenario_engine()
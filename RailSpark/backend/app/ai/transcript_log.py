@@ -0,0 +1,240 @@
+import pandas as pd
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Per-engine latencies are stored as one column each, named with this prefix
+LATENCY_PREFIX = "ms_"
+
+
+class TranscriptLog:
+    """Append-only columnar log of chatbot turns.
+
+    Turns are buffered in memory and written as new part files under
+    ``day=YYYY-MM-DD/`` partitions, so files are never rewritten and a
+    date range is read by listing directories. Parts are Parquet, or a
+    pickle when no Parquet engine is installed. Each row holds the intent,
+    entities, total and per-engine latency, and cache/error outcome.
+
+    ``record`` only appends; once ``flush_rows`` turns are buffered or
+    ``flush_interval`` seconds have passed, the flush runs on a background
+    worker so no chat turn waits for a file write. Days whose part failed
+    to write stay buffered for the next flush; while
+    writes keep failing the buffer holds at most ``max_buffer_rows`` turns,
+    dropping the oldest.
+    """
+
+    def __init__(self, log_dir: Path = Path("data/chat_transcripts"),
+                 flush_rows: int = 200, flush_interval: float = 60.0,
+                 max_buffer_rows: int = 10000):
+        self.log_dir = Path(log_dir)
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.max_buffer_rows = max_buffer_rows
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._flush_queued = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="transcript-flush")
+
+    def record(self, user_id: Optional[int], intent: Optional[str], keywords: List[str],
+               numbers: List[int], response_type: str, total_ms: float,
+               latencies: Dict[str, float] = None, cache_hit: bool = False,
+               partial: bool = False, streamed: bool = False):
+        now = datetime.now()
+        row = {
+            "timestamp": now,
+            "day": now.date().isoformat(),
+            "user_id": user_id,
+            "intent": intent or "unknown",
+            "keywords": " ".join(sorted(keywords)),
+            "numbers": " ".join(str(n) for n in numbers),
+            "response_type": response_type,
+            "error": response_type == "error",
+            "cache_hit": cache_hit,
+            "partial": partial,
+            "streamed": streamed,
+            "total_ms": float(total_ms),
+        }
+        for engine, ms in (latencies or {}).items():
+            row[f"{LATENCY_PREFIX}{engine}"] = float(ms)
+
+        with self._lock:
+            self._buffer.append(row)
+            self._trim_buffer()
+            due = not self._flush_queued and (
+                len(self._buffer) >= self.flush_rows
+                or time.monotonic() - self._last_flush >= self.flush_interval)
+            if due:
+                self._flush_queued = True
+        if due:
+            try:
+                self._executor.submit(self._background_flush)
+            except RuntimeError:
+                # Interpreter shutting down; the atexit flush writes the buffer
+                with self._lock:
+                    self._flush_queued = False
+
+    def wait(self, timeout: float = None):
+        """Block until a flush queued by ``record`` has finished"""
+        self._executor.submit(lambda: None).result(timeout=timeout)
+
+    def _background_flush(self):
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Error flushing chat transcript log: {e}")
+        finally:
+            with self._lock:
+                self._flush_queued = False
+
+    def flush(self) -> int:
+        """Write buffered turns as one new part file per day; returns rows written"""
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+        if not rows:
+            return 0
+
+        written = 0
+        failed_days = set()
+        for day, part in pd.DataFrame(rows).groupby("day", sort=False):
+            try:
+                self._write_part(day, part.drop(columns="day"))
+                written += len(part)
+            except Exception as e:
+                logger.error(f"Error writing chat transcript log for {day}: {e}")
+                failed_days.add(day)
+
+        if failed_days:
+            # Days already written must not be written again
+            with self._lock:
+                self._buffer[:0] = [row for row in rows if row["day"] in failed_days]
+                self._trim_buffer()
+        return written
+
+    def _trim_buffer(self):
+        # Caller holds the lock
+        excess = len(self._buffer) - self.max_buffer_rows
+        if excess > 0:
+            logger.warning(f"Chat transcript buffer full, dropping {excess} oldest turns")
+            del self._buffer[:excess]
+
+    def load(self, days: int = 7) -> pd.DataFrame:
+        """Turns from the last ``days`` days, including ones not yet flushed"""
+        since = (date.today() - timedelta(days=days - 1)).isoformat()
+        frames = []
+
+        if self.log_dir.exists():
+            for partition in sorted(self.log_dir.glob("day=*")):
+                day = partition.name.split("=", 1)[1]
+                if day < since:
+                    continue
+                for path in sorted(partition.iterdir()):
+                    frame = self._read_part(path)
+                    if frame is not None:
+                        frames.append(frame.assign(day=day))
+
+        with self._lock:
+            pending = [row for row in self._buffer if row["day"] >= since]
+        if pending:
+            frames.append(pd.DataFrame(pending))
+
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True, sort=False)
+
+    def analytics(self, days: int = 7) -> Dict[str, Any]:
+        """Per-intent volume, latency and cache effectiveness over the last ``days`` days"""
+        df = self.load(days)
+        if df.empty:
+            return {"days": days, "turns": 0, "intents": [], "precompute_candidates": [], "daily": []}
+
+        latency_columns = [c for c in df.columns if c.startswith(LATENCY_PREFIX)]
+        df["miss_ms"] = df["total_ms"].where(~df["cache_hit"].astype(bool), 0.0)
+        grouped = df.groupby("intent")
+
+        intents = grouped.agg(
+            turns=("total_ms", "size"),
+            cache_hit_rate=("cache_hit", "mean"),
+            error_rate=("error", "mean"),
+            partial_rate=("partial", "mean"),
+            mean_ms=("total_ms", "mean"),
+            p95_ms=("total_ms", lambda s: s.quantile(0.95)),
+            miss_ms=("miss_ms", "sum"),
+        )
+        if latency_columns:
+            engines = grouped[latency_columns].mean()
+            engines.columns = [f"mean_{c}" for c in latency_columns]
+            intents = intents.join(engines)
+        intents = intents.sort_values("turns", ascending=False).round(3)
+
+        # Time spent computing answers the cache did not have: what precomputing would save
+        candidates = intents[intents["miss_ms"] > 0].sort_values("miss_ms", ascending=False)
+        daily = df.groupby("day").agg(
+            turns=("total_ms", "size"),
+            errors=("error", "sum"),
+            cache_hits=("cache_hit", "sum"),
+            mean_ms=("total_ms", "mean"),
+        ).round(3)
+
+        return {
+            "days": days,
+            "turns": int(len(df)),
+            "cache_hit_rate": round(float(df["cache_hit"].mean()), 3),
+            "error_rate": round(float(df["error"].mean()), 3),
+            "intents": _records(intents, "intent"),
+            "precompute_candidates": [
+                {"intent": intent, "turns": int(row.turns), "miss_seconds": round(row.miss_ms / 1000, 3)}
+                for intent, row in candidates.head(5).iterrows()
+            ],
+            "daily": _records(daily, "day"),
+        }
+
+    def _write_part(self, day: str, df: pd.DataFrame):
+        partition = self.log_dir / f"day={day}"
+        partition.mkdir(parents=True, exist_ok=True)
+        stem = f"part-{datetime.now():%H%M%S}-{uuid.uuid4().hex[:8]}"
+        try:
+            df.to_parquet(partition / f"{stem}.parquet", index=False)
+        except ImportError:
+            logger.warning("No Parquet engine installed, logging chat transcripts as pickle")
+            df.to_pickle(partition / f"{stem}.pkl")
+
+    def _read_part(self, path: Path) -> Optional[pd.DataFrame]:
+        try:
+            if path.suffix == ".parquet":
+                return pd.read_parquet(path)
+            if path.suffix == ".pkl":
+                return pd.read_pickle(path)
+        except Exception as e:
+            logger.error(f"Error reading chat transcript part {path}: {e}")
+        return None
+
+
+def _records(df: pd.DataFrame, index_name: str) -> List[Dict[str, Any]]:
+    # NaN (an engine an intent never used) is not valid JSON
+    df = df.astype(object).where(df.notna(), None)
+    return df.rename_axis(index_name).reset_index().to_dict(orient="records")
+
+
+_transcript_log: Optional[TranscriptLog] = None
+_transcript_log_lock = threading.Lock()
+
+
+def get_transcript_log() -> TranscriptLog:
+    global _transcript_log
+    with _transcript_log_lock:
+        if _transcript_log is None:
+            _transcript_log = TranscriptLog(os.getenv("CHATBOT_TRANSCRIPT_DIR", "data/chat_transcripts"))
+            atexit.register(_transcript_log.flush)
+        return _transcript_log
@@ -0,0 +1,160 @@
+import numpy as np
+from typing import Dict, Any
+import logging
+
+logger = logging.getLogger(__name__)
+
+ARRAY_NAMES = ('feature', 'threshold', 'left', 'right', 'leaf_value', 'roots')
+
+
+class CompiledTreeEnsemble:
+    """Fitted tree ensemble flattened into contiguous NumPy arrays.
+
+    All trees share one node table; child indices are global and leaves point
+    at themselves, so every tree can be advanced one level per step with a
+    handful of vectorised gathers and no per-tree Python loop. Supports binary
+    RandomForestClassifier (mean of leaf class-1 fractions) and
+    GradientBoostingClassifier (sigmoid of the boosted raw score).
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], params: Dict[str, Any]):
+        self.feature = arrays['feature']
+        self.threshold = arrays['threshold']
+        self.left = arrays['left']
+        self.right = arrays['right']
+        self.leaf_value = arrays['leaf_value']
+        self.roots = arrays['roots']
+        self.kind = params['kind']
+        self.max_depth = int(params['max_depth'])
+        self.n_features = int(params['n_features'])
+        self.learning_rate = float(params.get('learning_rate', 1.0))
+        self.init_score = float(params.get('init_score', 0.0))
+
+    @classmethod
+    def from_estimator(cls, model) -> "CompiledTreeEnsemble":
+        """Compile a fitted scikit-learn ensemble"""
+        model_type = type(model).__name__
+        classes = list(getattr(model, 'classes_', []))
+        if len(classes) != 2:
+            raise ValueError(f"Only binary classifiers can be compiled, got classes {classes}")
+
+        if model_type == 'RandomForestClassifier':
+            trees = [estimator.tree_ for estimator in model.estimators_]
+            positive_index = classes.index(1) if 1 in classes else 1
+            params = {'kind': 'forest'}
+        elif model_type == 'GradientBoostingClassifier':
+            trees = [estimator.tree_ for estimator in model.estimators_[:, 0]]
+            positive_index = None
+            probe = np.zeros((1, model.n_features_in_), dtype=np.float32)
+            params = {
+                'kind': 'boosting',
+                'learning_rate': float(model.learning_rate),
+                'init_score': float(np.ravel(model._raw_predict_init(probe))[0]),
+            }
+        else:
+            raise ValueError(f"Unsupported model type for compilation: {model_type}")
+
+        feature, threshold, left, right, leaf_value, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for tree in trees:
+            n_nodes = tree.node_count
+            node_ids = np.arange(n_nodes) + offset
+            is_leaf = tree.children_left == -1
+
+            # Leaves loop back to themselves so extra traversal steps are no-ops
+            left.append(np.where(is_leaf, node_ids, tree.children_left + offset))
+            right.append(np.where(is_leaf, node_ids, tree.children_right + offset))
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+
+            values = tree.value[:, 0, :]
+            if positive_index is None:
+                leaf_value.append(values[:, 0])
+            else:
+                totals = values.sum(axis=1)
+                totals[totals == 0.0] = 1.0
+                leaf_value.append(values[:, positive_index] / totals)
+
+            roots.append(offset)
+            max_depth = max(max_depth, tree.max_depth)
+            offset += n_nodes
+
+        arrays = {
+            'feature': np.concatenate(feature).astype(np.int32),
+            'threshold': np.concatenate(threshold).astype(np.float64),
+            'left': np.concatenate(left).astype(np.int32),
+            'right': np.concatenate(right).astype(np.int32),
+            'leaf_value': np.concatenate(leaf_value).astype(np.float64),
+            'roots': np.asarray(roots, dtype=np.int32),
+        }
+        params.update({'max_depth': max_depth, 'n_features': int(model.n_features_in_)})
+        return cls(arrays, params)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        return {name: np.asarray(getattr(self, name)) for name in ARRAY_NAMES}
+
+    def params(self) -> Dict[str, Any]:
+        return {
+            'kind': self.kind,
+            'max_depth': self.max_depth,
+            'n_features': self.n_features,
+            'learning_rate': self.learning_rate,
+            'init_score': self.init_score,
+        }
+
+    def predict_proba_one(self, x: np.ndarray) -> float:
+        """Positive-class probability for a single feature row"""
+        # Trees compare float32 features against float64 thresholds
+        x = np.asarray(x, dtype=np.float32).ravel()
+        nodes = self.roots
+        for _ in range(self.max_depth):
+            go_left = x[self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        return float(self._link(self.leaf_value[nodes].sum()))
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Positive-class probabilities for a batch of rows"""
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], len(self.roots)))
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        return self._link(self.leaf_value[nodes].sum(axis=1))
+
+    def _link(self, leaf_sum):
+        if self.kind == 'forest':
+            return leaf_sum / len(self.roots)
+        raw = self.init_score + self.learning_rate * leaf_sum
+        return 1.0 / (1.0 + np.exp(-raw))
+
+
+def verify_parity(model, compiled: CompiledTreeEnsemble, X: np.ndarray = None,
+                  n_samples: int = 256, tolerance: float = 1e-9) -> float:
+    """Compare compiled probabilities with the estimator's predict_proba.
+
+    Probes are drawn around the scaled feature space and the estimator's own
+    split thresholds so that both sides of every boundary are exercised.
+    Returns the maximum absolute difference and raises if it exceeds tolerance.
+    """
+    if X is None:
+        rng = np.random.default_rng(0)
+        X = rng.normal(scale=3.0, size=(n_samples, compiled.n_features))
+        split_nodes = np.flatnonzero(np.isfinite(compiled.threshold))
+        if len(split_nodes):
+            picks = rng.choice(split_nodes, size=min(n_samples, len(split_nodes)))
+            boundary = X[:len(picks)].copy()
+            boundary[np.arange(len(picks)), compiled.feature[picks]] = compiled.threshold[picks]
+            X = np.vstack([X, boundary])
+
+    expected = model.predict_proba(X)[:, list(model.classes_).index(1) if 1 in model.classes_ else 1]
+    actual = compiled.predict_proba(X)
+    max_error = float(np.max(np.abs(expected - actual))) if len(X) else 0.0
+
+    if max_error > tolerance:
+        raise ValueError(f"Compiled model diverges from estimator (max error {max_error:.3g})")
+    return max_error
@@ -1,13 +1,18 @@
 # CRUD operations package
-from .trains import read_train, read_trains, create_train, update_train, delete_train
+from .trains import (read_train, read_trains, create_train, update_train, delete_train, read_fleet_status,
+                    iter_trains, count_trains)
+from .pagination import paginate, next_cursor, iter_keyset
 from .fitness import (read_fitness_certificate, read_fitness_certificates, 
                      create_fitness_certificate, update_fitness_certificate, 
-                     delete_fitness_certificate, read_valid_certificates)
+                     delete_fitness_certificate, read_valid_certificates,
+                     read_certificate_summary)
 from .job_cards import (read_job_card, read_job_cards, create_job_card, 
-                       update_job_card, delete_job_card, read_open_job_cards)
+                       update_job_card, delete_job_card, read_open_job_cards,
+                       count_open_job_cards, count_open_job_cards_by_train, read_open_job_cards_with_trains)
 from .branding import (read_branding_contract, read_branding_contracts, 
                       create_branding_contract, update_branding_contract, 
-                      delete_branding_contract, read_active_contracts, read_contracts_by_train)
+                      delete_branding_contract, read_active_contracts, read_contracts_by_train,
+                      read_branding_compliance, count_active_contracts)
 from .cleaning import (read_cleaning_slot, read_cleaning_slots, create_cleaning_slot, 
                       update_cleaning_slot, delete_cleaning_slot)
 from .stabling import (read_stabling_geometry, read_stabling_geometries, 
@@ -18,21 +23,29 @@ from .induction import (read_induction_plan, read_induction_plans,
                        delete_induction_plan, read_todays_plan)
 from .feedback import (read_feedback, read_all_feedback, create_feedback, 
                       update_feedback, delete_feedback)
+from .risk_snapshots import (create_risk_snapshot, read_latest_snapshot_time, read_latest_risk_snapshot,
+                            read_latest_risk_summary, read_risk_trends, delete_risk_snapshots_before)
 from .performance import (get_train_performance_history, get_crew_availability,
                          get_maintenance_priority, get_branding_priority)
 
 __all__ = [
     # Trains
-    "read_train", "read_trains", "create_train", "update_train", "delete_train",
+    "read_train", "read_trains", "create_train", "update_train", "delete_train", "read_fleet_status",
+    "iter_trains", "count_trains",
+    # Pagination
+    "paginate", "next_cursor", "iter_keyset",
     # Fitness
     "read_fitness_certificate", "read_fitness_certificates", "create_fitness_certificate",
     "update_fitness_certificate", "delete_fitness_certificate", "read_valid_certificates",
+    "read_certificate_summary",
     # Job Cards
     "read_job_card", "read_job_cards", "create_job_card", "update_job_card",
-    "delete_job_card", "read_open_job_cards",
+    "delete_job_card", "read_open_job_cards", "count_open_job_cards", "count_open_job_cards_by_train",
+    "read_open_job_cards_with_trains",
     # Branding
     "read_branding_contract", "read_branding_contracts", "create_branding_contract",
     "update_branding_contract", "delete_branding_contract", "read_active_contracts", "read_contracts_by_train",
+    "read_branding_compliance", "count_active_contracts",
     # Cleaning
     "read_cleaning_slot", "read_cleaning_slots", "create_cleaning_slot",
     "update_cleaning_slot", "delete_cleaning_slot",
@@ -44,6 +57,9 @@ __all__ = [
     "update_induction_plan", "delete_induction_plan", "read_todays_plan",
     # Feedback
     "read_feedback", "read_all_feedback", "create_feedback", "update_feedback", "delete_feedback",
+    # Risk snapshots
+    "create_risk_snapshot", "read_latest_snapshot_time", "read_latest_risk_snapshot",
+    "read_latest_risk_summary", "read_risk_trends", "delete_risk_snapshots_before",
     # Performance (NEW - Add these)
     "get_train_performance_history", "get_crew_availability", 
     "get_maintenance_priority", "get_branding_priority"
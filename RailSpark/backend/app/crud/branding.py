@@ -1,14 +1,21 @@
 from sqlalchemy.orm import Session
-from models import BrandingContract
+from sqlalchemy import case, func, literal
+from models import BrandingContract, Train
 from schemas import BrandingContractCreate
-from typing import List, Optional
+from .pagination import paginate
+from typing import List, Optional, Tuple
 from datetime import date
 
+# Completion rate (percent of required exposure delivered) at which a contract
+# stops being critical / at risk
+COMPLIANCE_AT_RISK_RATE = 50
+COMPLIANCE_COMPLIANT_RATE = 80
+
 def read_branding_contract(db: Session, contract_id: int) -> Optional[BrandingContract]:
     return db.query(BrandingContract).filter(BrandingContract.id == contract_id).first()
 
-def read_branding_contracts(db: Session, skip: int = 0, limit: int = 100) -> List[BrandingContract]:
-    return db.query(BrandingContract).offset(skip).limit(limit).all()
+def read_branding_contracts(db: Session, skip: int = 0, limit: int = 100, after_id: int = None) -> List[BrandingContract]:
+    return paginate(db.query(BrandingContract), BrandingContract.id, skip=skip, limit=limit, after_id=after_id)
 
 def read_contracts_by_train(db: Session, train_id: int) -> List[BrandingContract]:
     return db.query(BrandingContract).filter(BrandingContract.train_id == train_id).all()
@@ -62,6 +69,46 @@ def update_exposure_hours(db: Session, contract_id: int, hours: int) -> Optional
         db.refresh(db_contract)
     return db_contract
 
+def count_active_contracts(db: Session) -> Tuple[int, int]:
+    """Active contracts and, of those, the critical ones (under half their required exposure)"""
+    today = date.today()
+    critical = BrandingContract.exposure_hours_fulfilled < BrandingContract.exposure_hours_required * 0.5
+    active, critical_count = db.query(
+        func.count(BrandingContract.id),
+        func.coalesce(func.sum(case((critical, 1), else_=0)), 0)
+    ).filter(
+        BrandingContract.start_date <= today,
+        BrandingContract.end_date >= today
+    ).one()
+    return active, critical_count
+
+def read_branding_compliance(db: Session) -> List:
+    """Active contracts with their train number, completion rate and compliance status.
+
+    Rows are (contract, train_number, completion_rate, status); the rate and
+    status buckets are computed by the database in the same query.
+    """
+    today = date.today()
+    completion_rate = case(
+        (BrandingContract.exposure_hours_required > 0,
+         BrandingContract.exposure_hours_fulfilled * 100.0 / BrandingContract.exposure_hours_required),
+        else_=literal(0.0)
+    )
+    status = case(
+        (completion_rate >= COMPLIANCE_COMPLIANT_RATE, "compliant"),
+        (completion_rate >= COMPLIANCE_AT_RISK_RATE, "at_risk"),
+        else_="critical"
+    )
+    return db.query(
+        BrandingContract,
+        Train.train_number,
+        completion_rate.label("completion_rate"),
+        status.label("status")
+    ).outerjoin(Train, Train.id == BrandingContract.train_id).filter(
+        BrandingContract.start_date <= today,
+        BrandingContract.end_date >= today
+    ).all()
+
 def read_contracts_need_exposure(db: Session) -> List[BrandingContract]:
     """Get contracts that need more exposure hours"""
     active_contracts = read_active_contracts(db)
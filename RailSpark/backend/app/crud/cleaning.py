@@ -1,14 +1,15 @@
 from sqlalchemy.orm import Session
 from models import CleaningSlot
 from schemas import CleaningSlotCreate
+from .pagination import paginate
 from typing import List, Optional
 from datetime import datetime, date
 
 def read_cleaning_slot(db: Session, slot_id: int) -> Optional[CleaningSlot]:
     return db.query(CleaningSlot).filter(CleaningSlot.id == slot_id).first()
 
-def read_cleaning_slots(db: Session, skip: int = 0, limit: int = 100) -> List[CleaningSlot]:
-    return db.query(CleaningSlot).offset(skip).limit(limit).all()
+def read_cleaning_slots(db: Session, skip: int = 0, limit: int = 100, after_id: int = None) -> List[CleaningSlot]:
+    return paginate(db.query(CleaningSlot), CleaningSlot.id, skip=skip, limit=limit, after_id=after_id)
 
 def read_slots_by_train(db: Session, train_id: int) -> List[CleaningSlot]:
     return db.query(CleaningSlot).filter(CleaningSlot.train_id == train_id).all()
@@ -1,13 +1,16 @@
 from sqlalchemy.orm import Session
 from models import UserFeedback
 from schemas import UserFeedbackCreate
+from .pagination import paginate
 from typing import List, Optional
 
 def read_feedback(db: Session, feedback_id: int) -> Optional[UserFeedback]:
     return db.query(UserFeedback).filter(UserFeedback.id == feedback_id).first()
 
-def read_all_feedback(db: Session, skip: int = 0, limit: int = 100) -> List[UserFeedback]:
-    return db.query(UserFeedback).offset(skip).limit(limit).order_by(UserFeedback.created_at.desc()).all()
+def read_all_feedback(db: Session, skip: int = 0, limit: int = 100, after_id: int = None) -> List[UserFeedback]:
+    # Newest first; ids follow creation order
+    return paginate(db.query(UserFeedback), UserFeedback.id, skip=skip, limit=limit,
+                    after_id=after_id, descending=True)
 
 def read_feedback_by_user(db: Session, user_id: int) -> List[UserFeedback]:
     return db.query(UserFeedback).filter(UserFeedback.user_id == user_id).order_by(UserFeedback.created_at.desc()).all()
@@ -1,18 +1,30 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import func, case
 from models import FitnessCertificate
 from schemas import FitnessCertificateCreate
-from typing import List, Optional
+from .pagination import paginate
+from typing import Dict, Iterable, List, Optional
 from datetime import date
 
 def read_fitness_certificate(db: Session, cert_id: int) -> Optional[FitnessCertificate]:
     return db.query(FitnessCertificate).filter(FitnessCertificate.id == cert_id).first()
 
-def read_fitness_certificates(db: Session, skip: int = 0, limit: int = 100) -> List[FitnessCertificate]:
-    return db.query(FitnessCertificate).offset(skip).limit(limit).all()
+def read_fitness_certificates(db: Session, skip: int = 0, limit: int = 100, after_id: int = None) -> List[FitnessCertificate]:
+    return paginate(db.query(FitnessCertificate), FitnessCertificate.id, skip=skip, limit=limit, after_id=after_id)
 
 def read_certificates_by_train(db: Session, train_id: int) -> List[FitnessCertificate]:
     return db.query(FitnessCertificate).filter(FitnessCertificate.train_id == train_id).all()
 
+def read_certificates_by_trains(db: Session, train_ids: Iterable[int] = None) -> Dict[int, List[FitnessCertificate]]:
+    """Certificates grouped by train, loaded in one query"""
+    query = db.query(FitnessCertificate)
+    if train_ids is not None:
+        query = query.filter(FitnessCertificate.train_id.in_(list(train_ids)))
+    grouped: Dict[int, List[FitnessCertificate]] = {}
+    for cert in query.order_by(FitnessCertificate.id).all():
+        grouped.setdefault(cert.train_id, []).append(cert)
+    return grouped
+
 def read_valid_certificates(db: Session, train_id: int) -> List[FitnessCertificate]:
     today = date.today()
     return db.query(FitnessCertificate).filter(
@@ -22,6 +34,36 @@ def read_valid_certificates(db: Session, train_id: int) -> List[FitnessCertifica
         FitnessCertificate.is_valid == True
     ).all()
 
+def read_certificate_summary(db: Session, train_ids: Iterable[int] = None) -> Dict[int, Dict]:
+    """Per-train certificate counts and the validity of each train's latest certificate, in one query"""
+    today = date.today()
+    per_train = db.query(
+        FitnessCertificate.train_id.label("train_id"),
+        func.count(FitnessCertificate.id).label("total"),
+        func.sum(case((FitnessCertificate.is_valid == True, 1), else_=0)).label("valid"),
+        func.sum(case((FitnessCertificate.valid_until < today, 1), else_=0)).label("expired"),
+        func.max(FitnessCertificate.valid_until).label("latest_valid_until"),
+        func.max(FitnessCertificate.id).label("latest_id")
+    ).group_by(FitnessCertificate.train_id)
+    if train_ids is not None:
+        per_train = per_train.filter(FitnessCertificate.train_id.in_(list(train_ids)))
+    per_train = per_train.subquery()
+
+    rows = db.query(per_train, FitnessCertificate.is_valid).join(
+        FitnessCertificate, FitnessCertificate.id == per_train.c.latest_id
+    ).all()
+
+    return {
+        row.train_id: {
+            "total": row.total,
+            "valid": int(row.valid or 0),
+            "expired": int(row.expired or 0),
+            "latest_valid_until": row.latest_valid_until,
+            "latest_is_valid": bool(row.is_valid)
+        }
+        for row in rows
+    }
+
 def create_fitness_certificate(db: Session, cert: FitnessCertificateCreate) -> FitnessCertificate:
     db_cert = FitnessCertificate(
         train_id=cert.train_id,
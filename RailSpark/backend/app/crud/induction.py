@@ -1,14 +1,15 @@
 from sqlalchemy.orm import Session
 from models import InductionPlan
 from schemas import InductionPlanCreate
+from .pagination import paginate
 from typing import List, Optional
 from datetime import date, datetime
 
 def read_induction_plan(db: Session, plan_id: int) -> Optional[InductionPlan]:
     return db.query(InductionPlan).filter(InductionPlan.id == plan_id).first()
 
-def read_induction_plans(db: Session, skip: int = 0, limit: int = 100) -> List[InductionPlan]:
-    return db.query(InductionPlan).offset(skip).limit(limit).all()
+def read_induction_plans(db: Session, skip: int = 0, limit: int = 100, after_id: int = None) -> List[InductionPlan]:
+    return paginate(db.query(InductionPlan), InductionPlan.id, skip=skip, limit=limit, after_id=after_id)
 
 def read_plans_by_date(db: Session, plan_date: date) -> List[InductionPlan]:
     return db.query(InductionPlan).filter(InductionPlan.plan_date == plan_date).order_by(InductionPlan.rank).all()
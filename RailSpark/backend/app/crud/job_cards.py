@@ -1,14 +1,16 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy import func
 from models import JobCard
 from schemas import JobCardCreate
-from typing import List, Optional
+from .pagination import paginate
+from typing import Dict, List, Optional
 from datetime import datetime
 
 def read_job_card(db: Session, job_id: int) -> Optional[JobCard]:
     return db.query(JobCard).filter(JobCard.id == job_id).first()
 
-def read_job_cards(db: Session, skip: int = 0, limit: int = 100) -> List[JobCard]:
-    return db.query(JobCard).offset(skip).limit(limit).all()
+def read_job_cards(db: Session, skip: int = 0, limit: int = 100, after_id: int = None) -> List[JobCard]:
+    return paginate(db.query(JobCard), JobCard.id, skip=skip, limit=limit, after_id=after_id)
 
 def read_job_cards_by_train(db: Session, train_id: int) -> List[JobCard]:
     return db.query(JobCard).filter(JobCard.train_id == train_id).all()
@@ -19,6 +21,22 @@ def read_open_job_cards(db: Session, train_id: int = None) -> List[JobCard]:
         query = query.filter(JobCard.train_id == train_id)
     return query.all()
 
+def read_open_job_cards_with_trains(db: Session) -> List[JobCard]:
+    """Open job cards of existing trains, with ``job.train`` loaded by the same query"""
+    return db.query(JobCard).join(JobCard.train).options(
+        contains_eager(JobCard.train)
+    ).filter(JobCard.status == "open").all()
+
+def count_open_job_cards(db: Session) -> int:
+    return db.query(func.count(JobCard.id)).filter(JobCard.status == "open").scalar()
+
+def count_open_job_cards_by_train(db: Session) -> Dict[int, int]:
+    """Number of open job cards per train, for trains that have any"""
+    rows = db.query(JobCard.train_id, func.count(JobCard.id)).filter(
+        JobCard.status == "open"
+    ).group_by(JobCard.train_id).all()
+    return {train_id: count for train_id, count in rows}
+
 def create_job_card(db: Session, job_card: JobCardCreate) -> JobCard:
     db_job_card = JobCard(
         train_id=job_card.train_id,
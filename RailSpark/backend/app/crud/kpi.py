@@ -0,0 +1,147 @@
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from models import KpiDaily, KpiRollup, Train, BrandingContract
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import date, timedelta
+from itertools import groupby
+from statistics import mean
+from .job_cards import count_open_job_cards_by_train
+
+PERIODS = ("week", "month")
+
+def period_start(day: date, period: str) -> date:
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    if period == "month":
+        return day.replace(day=1)
+    raise ValueError(f"Unknown KPI period '{period}'")
+
+def next_period_start(start: date, period: str) -> date:
+    if period == "week":
+        return start + timedelta(days=7)
+    return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+def _exposure_by_train(db: Session, kpi_date: date) -> Dict[int, int]:
+    rows = db.query(
+        BrandingContract.train_id, func.sum(BrandingContract.exposure_hours_fulfilled)
+    ).filter(
+        BrandingContract.start_date <= kpi_date,
+        BrandingContract.end_date >= kpi_date
+    ).group_by(BrandingContract.train_id).all()
+    return {train_id: hours or 0 for train_id, hours in rows}
+
+def record_daily_kpis(db: Session, kpi_date: date, readiness: Dict[int, float],
+                      risk: Dict[int, Tuple[float, str]]) -> int:
+    """Store one row per train for ``kpi_date``, replacing any recorded earlier that day.
+
+    ``readiness`` maps train id to readiness score and ``risk`` to
+    (failure probability, risk level); mileage, exposure and open job cards
+    are read here. Returns the number of rows written.
+    """
+    trains = db.query(Train.id, Train.current_mileage).all()
+    open_jobs = count_open_job_cards_by_train(db)
+    exposure = _exposure_by_train(db, kpi_date)
+
+    db.query(KpiDaily).filter(KpiDaily.kpi_date == kpi_date).delete(synchronize_session=False)
+    db.add_all([
+        KpiDaily(
+            kpi_date=kpi_date,
+            train_id=train_id,
+            readiness_score=readiness.get(train_id),
+            risk_probability=risk.get(train_id, (None, None))[0],
+            risk_level=risk.get(train_id, (None, None))[1],
+            mileage=mileage,
+            exposure_hours=exposure.get(train_id, 0),
+            open_job_cards=open_jobs.get(train_id, 0)
+        )
+        for train_id, mileage in trains
+    ])
+    db.commit()
+    return len(trains)
+
+def _rollup(period: str, start: date, train_id: int, days: List[KpiDaily]) -> KpiRollup:
+    # days are in date order
+    readiness = [d.readiness_score for d in days if d.readiness_score is not None]
+    risk = [d.risk_probability for d in days if d.risk_probability is not None]
+    mileage = [d.mileage for d in days if d.mileage is not None]
+    return KpiRollup(
+        period=period,
+        period_start=start,
+        train_id=train_id,
+        days=len(days),
+        readiness_avg=mean(readiness) if readiness else None,
+        readiness_min=min(readiness) if readiness else None,
+        risk_avg=mean(risk) if risk else None,
+        risk_max=max(risk) if risk else None,
+        mileage_end=mileage[-1] if mileage else None,
+        mileage_delta=mileage[-1] - mileage[0] if mileage else None,
+        exposure_end=days[-1].exposure_hours,
+        open_job_cards_avg=mean(d.open_job_cards or 0 for d in days)
+    )
+
+def rollup_kpis(db: Session, day: date, periods=PERIODS) -> int:
+    """Recompute the rollups of the periods containing ``day`` from kpi_daily"""
+    written = 0
+    for period in periods:
+        start = period_start(day, period)
+        end = next_period_start(start, period)
+        rows = db.query(KpiDaily).filter(
+            KpiDaily.kpi_date >= start, KpiDaily.kpi_date < end
+        ).order_by(KpiDaily.train_id, KpiDaily.kpi_date).all()
+
+        db.query(KpiRollup).filter(
+            KpiRollup.period == period, KpiRollup.period_start == start
+        ).delete(synchronize_session=False)
+        rollups = [_rollup(period, start, train_id, list(days))
+                   for train_id, days in groupby(rows, key=lambda d: d.train_id)]
+        db.add_all(rollups)
+        written += len(rollups)
+    db.commit()
+    return written
+
+def read_daily_kpis(db: Session, start: date, end: date, train_id: int = None) -> List[KpiDaily]:
+    query = db.query(KpiDaily).filter(KpiDaily.kpi_date >= start, KpiDaily.kpi_date <= end)
+    if train_id:
+        query = query.filter(KpiDaily.train_id == train_id)
+    return query.order_by(KpiDaily.train_id, KpiDaily.kpi_date).all()
+
+def read_kpi_rollups(db: Session, period: str, start: date, end: date,
+                     train_id: int = None) -> List[KpiRollup]:
+    query = db.query(KpiRollup).filter(
+        KpiRollup.period == period,
+        KpiRollup.period_start >= period_start(start, period),
+        KpiRollup.period_start <= end
+    )
+    if train_id:
+        query = query.filter(KpiRollup.train_id == train_id)
+    return query.order_by(KpiRollup.train_id, KpiRollup.period_start).all()
+
+def read_fleet_kpi_trend(db: Session, period: str, start: date, end: date) -> List[Dict[str, Any]]:
+    """Fleet-wide averages per day, week or month, aggregated in the database"""
+    if period == "day":
+        key, readiness, risk, open_jobs = (KpiDaily.kpi_date, KpiDaily.readiness_score,
+                                           KpiDaily.risk_probability, KpiDaily.open_job_cards)
+        source = db.query(KpiDaily).filter(KpiDaily.kpi_date >= start, KpiDaily.kpi_date <= end)
+        fleet_mileage = func.sum(KpiDaily.mileage)
+    else:
+        key, readiness, risk, open_jobs = (KpiRollup.period_start, KpiRollup.readiness_avg,
+                                           KpiRollup.risk_avg, KpiRollup.open_job_cards_avg)
+        source = db.query(KpiRollup).filter(
+            KpiRollup.period == period,
+            KpiRollup.period_start >= period_start(start, period),
+            KpiRollup.period_start <= end
+        )
+        fleet_mileage = func.sum(KpiRollup.mileage_end)
+
+    rows = source.with_entities(
+        key.label("start"),
+        func.count().label("trains"),
+        func.avg(readiness).label("readiness_avg"),
+        func.avg(risk).label("risk_avg"),
+        func.avg(open_jobs).label("open_job_cards_avg"),
+        fleet_mileage.label("fleet_mileage")
+    ).group_by(key).order_by(key).all()
+    return [dict(row._mapping) for row in rows]
+
+def read_latest_kpi_date(db: Session) -> Optional[date]:
+    return db.query(func.max(KpiDaily.kpi_date)).scalar()
@@ -0,0 +1,38 @@
+from sqlalchemy.orm import Query
+from typing import Any, Iterator, List, Optional
+
+DEFAULT_BATCH_SIZE = 500
+
+def paginate(query: Query, column, skip: int = 0, limit: Optional[int] = 100,
+             after_id: Optional[Any] = None, descending: bool = False) -> List:
+    """One page of ``query`` ordered by ``column``.
+
+    With ``after_id`` the page starts after that key (keyset pagination, an
+    index range scan that costs the same however deep the page); otherwise
+    ``skip`` rows are skipped with OFFSET, kept for existing clients. A
+    ``limit`` of None returns everything from the start of the page.
+    """
+    if after_id is not None:
+        query = query.filter(column < after_id if descending else column > after_id)
+    query = query.order_by(column.desc() if descending else column)
+    if after_id is None and skip:
+        query = query.offset(skip)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+def next_cursor(rows: List, limit: Optional[int], key: str = "id") -> Optional[Any]:
+    """``after_id`` for the page following ``rows``, or None when it was the last"""
+    if limit is None or not rows or len(rows) < limit:
+        return None
+    return getattr(rows[-1], key)
+
+def iter_keyset(query: Query, column, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator:
+    """Every row of ``query`` in ``column`` order, fetched a keyset page at a time"""
+    after_id = None
+    while True:
+        page = paginate(query, column, limit=batch_size, after_id=after_id)
+        yield from page
+        if len(page) < batch_size:
+            return
+        after_id = getattr(page[-1], column.key)
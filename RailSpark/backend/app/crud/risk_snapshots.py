@@ -0,0 +1,90 @@
+from sqlalchemy import func, case
+from sqlalchemy.orm import Session
+from models import RiskSnapshot, ReadinessSnapshot
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+
+RISK_LEVELS = ("high", "medium", "low", "unknown")
+
+READINESS_COLUMNS = ("trains_assessed", "eligible_trains", "maintenance_needed", "high_readiness_trains",
+                     "readiness_avg", "risk_factor_avg")
+
+def _risk_level_counts():
+    return [func.coalesce(func.sum(case((RiskSnapshot.risk_level == level, 1), else_=0)), 0).label(level)
+            for level in RISK_LEVELS]
+
+def create_risk_snapshot(db: Session, predictions, taken_at: datetime = None,
+                         readiness: Dict[str, Any] = None) -> datetime:
+    """Store one row per FailurePrediction, all stamped with the same ``taken_at``.
+
+    ``readiness`` holds ReadinessSnapshot columns for the fleet readiness
+    figures taken at the same time; they are stored in the same commit.
+    """
+    taken_at = taken_at or datetime.now()
+    if readiness is not None:
+        db.add(ReadinessSnapshot(taken_at=taken_at, **readiness))
+    db.add_all([
+        RiskSnapshot(
+            taken_at=taken_at,
+            train_id=p.train_id,
+            train_number=p.train_number,
+            failure_probability=float(p.failure_probability),
+            risk_level=p.risk_level,
+            predicted_failure_type=p.predicted_failure_type,
+            confidence=float(p.confidence),
+            model_used=p.model_used
+        )
+        for p in predictions
+    ])
+    db.commit()
+    return taken_at
+
+def read_latest_snapshot_time(db: Session) -> Optional[datetime]:
+    return db.query(func.max(RiskSnapshot.taken_at)).scalar()
+
+def read_latest_risk_snapshot(db: Session) -> List[RiskSnapshot]:
+    """Per-train rows of the most recent snapshot, riskiest first"""
+    latest = db.query(func.max(RiskSnapshot.taken_at)).scalar_subquery()
+    return db.query(RiskSnapshot).filter(
+        RiskSnapshot.taken_at == latest
+    ).order_by(RiskSnapshot.failure_probability.desc()).all()
+
+def read_latest_risk_summary(db: Session) -> Optional[Dict[str, Any]]:
+    """Risk level counts and mean probability of the most recent snapshot, in one query.
+
+    ``readiness`` holds the fleet readiness figures taken with it, or None
+    for snapshots stored without them.
+    """
+    latest = db.query(func.max(RiskSnapshot.taken_at)).scalar_subquery()
+    row = db.query(
+        func.max(RiskSnapshot.taken_at).label("taken_at"),
+        func.count(RiskSnapshot.id).label("trains"),
+        func.avg(RiskSnapshot.failure_probability).label("mean_probability"),
+        *_risk_level_counts()
+    ).filter(RiskSnapshot.taken_at == latest).one()
+    if not row.trains:
+        return None
+    summary = dict(row._mapping)
+    readiness = db.query(ReadinessSnapshot).filter(ReadinessSnapshot.taken_at == row.taken_at).first()
+    summary["readiness"] = {
+        column: getattr(readiness, column) for column in READINESS_COLUMNS
+    } if readiness else None
+    return summary
+
+def read_risk_trends(db: Session, since: datetime) -> List[Dict[str, Any]]:
+    """Risk level counts and mean probability per snapshot taken since ``since``"""
+    rows = db.query(
+        RiskSnapshot.taken_at,
+        func.count(RiskSnapshot.id).label("trains"),
+        func.avg(RiskSnapshot.failure_probability).label("mean_probability"),
+        *_risk_level_counts()
+    ).filter(
+        RiskSnapshot.taken_at >= since
+    ).group_by(RiskSnapshot.taken_at).order_by(RiskSnapshot.taken_at).all()
+    return [dict(row._mapping) for row in rows]
+
+def delete_risk_snapshots_before(db: Session, cutoff: datetime) -> int:
+    deleted = db.query(RiskSnapshot).filter(RiskSnapshot.taken_at < cutoff).delete(synchronize_session=False)
+    db.query(ReadinessSnapshot).filter(ReadinessSnapshot.taken_at < cutoff).delete(synchronize_session=False)
+    db.commit()
+    return deleted
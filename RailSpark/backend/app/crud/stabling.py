@@ -1,13 +1,14 @@
 from sqlalchemy.orm import Session
 from models import StablingGeometry
 from schemas import StablingGeometryCreate
+from .pagination import paginate, iter_keyset
 from typing import List, Optional
 
 def read_stabling_geometry(db: Session, geometry_id: int) -> Optional[StablingGeometry]:
     return db.query(StablingGeometry).filter(StablingGeometry.id == geometry_id).first()
 
-def read_stabling_geometries(db: Session, skip: int = 0, limit: int = 100) -> List[StablingGeometry]:
-    return db.query(StablingGeometry).offset(skip).limit(limit).all()
+def read_stabling_geometries(db: Session, skip: int = 0, limit: int = 100, after_id: int = None) -> List[StablingGeometry]:
+    return paginate(db.query(StablingGeometry), StablingGeometry.id, skip=skip, limit=limit, after_id=after_id)
 
 def read_geometry_by_train(db: Session, train_id: int) -> Optional[StablingGeometry]:
     return db.query(StablingGeometry).filter(StablingGeometry.train_id == train_id).order_by(StablingGeometry.stabled_at.desc()).first()
@@ -49,7 +50,7 @@ def delete_stabling_geometry(db: Session, geometry_id: int) -> bool:
 def optimize_stabling_arrangement(db: Session) -> List[StablingGeometry]:
     """Simple optimization to minimize shunting"""
     # This would be enhanced with actual optimization logic
-    current_arrangements = read_stabling_geometries(db)
+    current_arrangements = list(iter_keyset(db.query(StablingGeometry), StablingGeometry.id))
     # Basic logic: mark arrangements that need shunting
     for arrangement in current_arrangements:
         # Simple rule: if train is not in optimal position, mark for shunting
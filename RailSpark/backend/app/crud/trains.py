@@ -1,7 +1,10 @@
 from sqlalchemy.orm import Session
-from models import Train
+from sqlalchemy import func
+from models import Train, JobCard, BrandingContract
 from schemas import TrainCreate
-from typing import List, Optional
+from .pagination import paginate, iter_keyset, DEFAULT_BATCH_SIZE
+from typing import Iterator, List, Optional, Tuple
+from datetime import date
 
 def read_train(db: Session, train_id: int) -> Optional[Train]:
     return db.query(Train).filter(Train.id == train_id).first()
@@ -9,12 +12,42 @@ def read_train(db: Session, train_id: int) -> Optional[Train]:
 def read_train_by_number(db: Session, train_number: str) -> Optional[Train]:
     return db.query(Train).filter(Train.train_number == train_number).first()
 
-def read_trains(db: Session, skip: int = 0, limit: int = 100) -> List[Train]:
-    return db.query(Train).offset(skip).limit(limit).all()
+def read_trains(db: Session, skip: int = 0, limit: int = 100, after_id: int = None) -> List[Train]:
+    return paginate(db.query(Train), Train.id, skip=skip, limit=limit, after_id=after_id)
+
+def iter_trains(db: Session, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Train]:
+    """Every train in id order, for fleet-wide callers; unlike read_trains it never truncates"""
+    return iter_keyset(db.query(Train), Train.id, batch_size=batch_size)
+
+def count_trains(db: Session) -> int:
+    return db.query(func.count(Train.id)).scalar()
 
 def read_active_trains(db: Session) -> List[Train]:
     return db.query(Train).filter(Train.status == "active").all()
 
+def read_fleet_status(db: Session, skip: int = 0, limit: Optional[int] = 100,
+                      after_id: int = None) -> List[Tuple[Train, int, int]]:
+    """Each train with its open job card and active branding contract counts, in one query"""
+    today = date.today()
+    open_jobs = db.query(
+        JobCard.train_id, func.count(JobCard.id).label("open_jobs")
+    ).filter(JobCard.status == "open").group_by(JobCard.train_id).subquery()
+    active_contracts = db.query(
+        BrandingContract.train_id, func.count(BrandingContract.id).label("active_contracts")
+    ).filter(
+        BrandingContract.start_date <= today,
+        BrandingContract.end_date >= today
+    ).group_by(BrandingContract.train_id).subquery()
+
+    query = db.query(
+        Train,
+        func.coalesce(open_jobs.c.open_jobs, 0),
+        func.coalesce(active_contracts.c.active_contracts, 0)
+    ).outerjoin(open_jobs, open_jobs.c.train_id == Train.id
+    ).outerjoin(active_contracts, active_contracts.c.train_id == Train.id)
+    rows = paginate(query, Train.id, skip=skip, limit=limit, after_id=after_id)
+    return [(train, jobs, contracts) for train, jobs, contracts in rows]
+
 def create_train(db: Session, train: TrainCreate) -> Train:
     db_train = Train(
         train_number=train.train_number,
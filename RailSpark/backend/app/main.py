@@ -2,11 +2,18 @@ from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from database import engine, get_db
 import models
+from utils.data_version import data_version  # Installs the commit hooks that version cached data
+from utils.dashboard_summary import dashboard_summary  # Keeps the materialized overview current
+from utils.change_feed import change_feed  # Pushes committed changes to /dashboard/ws
+from utils.risk_snapshots import risk_snapshotter  # Snapshots fleet risk on a schedule and on change
+from utils.kpi_store import kpi_recorder  # Records daily KPIs after each risk snapshot
+from utils.http_cache import ETagMiddleware
+from utils.responses import FastJSONResponse, CompressionMiddleware
 
 # Import all routers
 from routers import (
     trains, fitness, job_cards, branding, cleaning, stabling, 
-    induction, feedback, auth, ai, chatbot, data_upload, dashboard
+    induction, feedback, auth, ai, chatbot, data_upload, dashboard, kpi
 )
 
 # Create all tables
@@ -15,9 +22,17 @@ models.Base.metadata.create_all(bind=engine)
 app = FastAPI(
     title="RailSpark - KMRL Train Induction System",
     description="AI-Driven Train Induction Planning & Scheduling for Kochi Metro",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse  # orjson when installed
 )
 
+# Conditional GET (ETag / 304) for read-heavy routes; added before CORS so
+# CORS wraps it and 304s carry the CORS headers too
+app.add_middleware(ETagMiddleware)
+
+# Brotli/gzip for response bodies over 1 KB
+app.add_middleware(CompressionMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -25,6 +40,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Keyset pagination cursor on list endpoints
 )
 
 # Include all routers
@@ -41,6 +57,15 @@ app.include_router(ai.router)
 app.include_router(chatbot.router)
 app.include_router(data_upload.router)
 app.include_router(dashboard.router)
+app.include_router(kpi.router)
+
+@app.on_event("startup")
+def start_risk_snapshots():
+    risk_snapshotter.start()
+
+@app.on_event("shutdown")
+def stop_risk_snapshots():
+    risk_snapshotter.stop()
 
 @app.get("/")
 async def root():
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, Text, Float
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, Text, Float, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
@@ -113,4 +113,87 @@ class User(Base):
     username = Column(String(100), unique=True, nullable=False)
     password_hash = Column(String(255), nullable=False)
     role = Column(String(20))  # operator, supervisor, admin
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class DashboardSummary(Base):
+    """Materialized /dashboard/overview figures, a single row kept current on commit"""
+    __tablename__ = "dashboard_summary"
+    
+    id = Column(Integer, primary_key=True)
+    summary_date = Column(Date)  # Date the date-dependent sections were computed for
+    total_trains = Column(Integer, default=0)
+    active_trains = Column(Integer, default=0)
+    eligible_trains = Column(Integer, default=0)
+    open_job_cards = Column(Integer, default=0)
+    trains_with_open_jobs = Column(Integer, default=0)
+    active_contracts = Column(Integer, default=0)
+    contracts_need_exposure = Column(Integer, default=0)
+    exposure_gap = Column(Integer, default=0)
+    service_trains = Column(Integer, default=0)
+    standby_trains = Column(Integer, default=0)
+    total_planned = Column(Integer, default=0)
+    unapproved_plans = Column(Integer, default=0)
+    high_risk_trains = Column(Integer, default=0)
+    updated_at = Column(DateTime(timezone=True))
+
+class RiskSnapshot(Base):
+    """Failure-risk prediction for one train, recorded with every fleet snapshot"""
+    __tablename__ = "risk_snapshots"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    taken_at = Column(DateTime, nullable=False, index=True)  # Shared by every row of one snapshot
+    # No foreign key: history outlives the train, which train_number still identifies
+    train_id = Column(Integer, index=True)
+    train_number = Column(String(10))
+    failure_probability = Column(Float, nullable=False)
+    risk_level = Column(String(20), nullable=False)  # high, medium, low, unknown
+    predicted_failure_type = Column(String(100))
+    confidence = Column(Float)
+    model_used = Column(String(50))
+
+class ReadinessSnapshot(Base):
+    """Fleet readiness figures taken with each risk snapshot, one row per snapshot"""
+    __tablename__ = "readiness_snapshots"
+    
+    id = Column(Integer, primary_key=True)
+    taken_at = Column(DateTime, nullable=False, unique=True)  # taken_at of the risk snapshot rows
+    trains_assessed = Column(Integer, nullable=False)
+    eligible_trains = Column(Integer, nullable=False)  # Available or restricted
+    maintenance_needed = Column(Integer, nullable=False)
+    high_readiness_trains = Column(Integer, nullable=False)  # Eligible with readiness_score >= 0.8
+    readiness_avg = Column(Float)  # None when no train was assessed
+    risk_factor_avg = Column(Float)
+
+class KpiDaily(Base):
+    """Per-train fleet KPIs for one day; rows for past days are never rewritten"""
+    __tablename__ = "kpi_daily"
+    __table_args__ = (UniqueConstraint("train_id", "kpi_date", name="uq_kpi_daily_train_date"),)
+    
+    id = Column(Integer, primary_key=True)
+    kpi_date = Column(Date, nullable=False, index=True)
+    train_id = Column(Integer, nullable=False)  # No foreign key, like risk_snapshots
+    readiness_score = Column(Float)
+    risk_probability = Column(Float)  # None for trains outside the risk snapshot
+    risk_level = Column(String(10))
+    mileage = Column(Integer)
+    exposure_hours = Column(Integer)  # Fulfilled hours on the train's active contracts
+    open_job_cards = Column(Integer)
+
+class KpiRollup(Base):
+    """Weekly or monthly downsample of kpi_daily for one train"""
+    __tablename__ = "kpi_rollups"
+    __table_args__ = (UniqueConstraint("period", "train_id", "period_start", name="uq_kpi_rollup_period_train_start"),)
+    
+    id = Column(Integer, primary_key=True)
+    period = Column(String(5), nullable=False)  # week, month
+    period_start = Column(Date, nullable=False, index=True)
+    train_id = Column(Integer, nullable=False)  # No foreign key, like risk_snapshots
+    days = Column(Integer)  # Daily rows the period has so far
+    readiness_avg = Column(Float)
+    readiness_min = Column(Float)
+    risk_avg = Column(Float)
+    risk_max = Column(Float)
+    mileage_end = Column(Integer)
+    mileage_delta = Column(Integer)
+    exposure_end = Column(Integer)
+    open_job_cards_avg = Column(Float)
@@ -6,6 +6,7 @@ from database import get_db
 from ai.rule_engine import AdvancedRuleEngine, TrainReadiness
 from ai.optimizer import InductionOptimizer, OptimizationResult, OptimizationConstraints
 from ai.ml_model import MLModel, FailurePrediction
+from ai.services import get_ml_model
 import schemas
 import crud
 
@@ -169,7 +170,7 @@ def generate_induction_plan(
 @router.get("/failure-predictions", response_model=List[Dict[str, Any]])
 def get_failure_predictions(db: Session = Depends(get_db)):
     """Get failure predictions for all trains"""
-    ml_model = MLModel(db)
+    ml_model = get_ml_model(db)
     
     try:
         if not ml_model.is_trained:
@@ -200,7 +201,7 @@ def get_failure_predictions(db: Session = Depends(get_db)):
 @router.get("/failure-predictions/{train_id}")
 def get_train_failure_prediction(train_id: int, db: Session = Depends(get_db)):
     """Get failure prediction for a specific train"""
-    ml_model = MLModel(db)
+    ml_model = get_ml_model(db)
     
     try:
         if not ml_model.is_trained:
@@ -246,6 +247,26 @@ def train_ml_model(db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/update-model")
+def update_ml_model_incrementally(db: Session = Depends(get_db)):
+    """Update the model with newly observed failure outcomes without a full retrain"""
+    ml_model = MLModel(db)
+    
+    try:
+        return ml_model.update_incrementally()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/model-drift")
+def get_model_drift(db: Session = Depends(get_db)):
+    """Get live drift and outcome metrics for the current model"""
+    ml_model = get_ml_model(db)
+    
+    try:
+        return ml_model.get_drift_metrics()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/optimization-stats")
 def get_optimization_statistics(db: Session = Depends(get_db)):
     """Get statistics for optimization analysis"""
@@ -253,7 +274,7 @@ def get_optimization_statistics(db: Session = Depends(get_db)):
     optimizer = InductionOptimizer(db)
     
     # Basic statistics
-    total_trains = len(crud.trains.read_trains(db))
+    total_trains = crud.trains.count_trains(db)
     active_trains = len(crud.trains.read_active_trains(db))
     eligible_trains = len(rule_engine._assess_train_readiness(plan_date=date.today()))
     
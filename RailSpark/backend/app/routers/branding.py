@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from database import get_db
 from schemas import BrandingContractCreate, BrandingContractResponse
 import crud
+from utils.responses import set_next_cursor
 
 router = APIRouter(prefix="/branding", tags=["branding contracts"])
 
@@ -19,8 +20,10 @@ def create_branding_contract(contract: BrandingContractCreate, db: Session = Dep
     return crud.branding.create_branding_contract(db=db, contract=contract)
 
 @router.get("/", response_model=List[BrandingContractResponse])
-def read_branding_contracts(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    contracts = crud.branding.read_branding_contracts(db, skip=skip, limit=limit)
+def read_branding_contracts(response: Response, skip: int = 0, limit: int = 100, after_id: Optional[int] = None,
+                            db: Session = Depends(get_db)):
+    contracts = crud.branding.read_branding_contracts(db, skip=skip, limit=limit, after_id=after_id)
+    set_next_cursor(response, contracts, limit)
     return contracts
 
 @router.get("/train/{train_id}", response_model=List[BrandingContractResponse])
@@ -1,32 +1,76 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import Dict, Any, List
-from database import get_db
+from typing import Dict, Any, List, Iterator, Optional
+from database import get_db, SessionLocal
+import json
 from ai.chatbot import Chatbot, ChatResponse
+from ai.context_store import get_context_store
+from ai.transcript_log import get_transcript_log
 import schemas
 
 router = APIRouter(prefix="/chatbot", tags=["chatbot"])
 
 @router.post("/query")
-def process_chatbot_query(
+async def process_chatbot_query(
     query: schemas.ChatQuery,
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
-    """Process chatbot query and return response"""
+    """Process chatbot query and return response.
+
+    The answer is built on the threadpool so the event loop keeps serving
+    other requests; independent parts of it load concurrently and are left
+    out (with ``partial`` set) when they miss their deadline.
+    """
     chatbot = Chatbot(db)
     
     try:
-        response = chatbot.process_message(query.message, query.user_id)
+        response = await run_in_threadpool(chatbot.process_message, query.message, query.user_id)
         
         return {
             "message": response.message,
             "data": response.data,
             "type": response.type,
+            "partial": response.partial,
             "timestamp": schemas.datetime.now().isoformat()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Chatbot error: {str(e)}")
 
+@router.get("/stream")
+def stream_chatbot_query(message: str, user_id: Optional[int] = None):
+    """Stream the chatbot answer as Server-Sent Events.
+
+    Events: intent, message, explanation, reasoning, alternatives, one chart
+    event per rendered chart, and done. Usable from a browser EventSource.
+    """
+    return StreamingResponse(
+        _stream_events(message, user_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # Stop proxies from buffering the stream
+        }
+    )
+
+def _stream_events(message: str, user_id: Optional[int]) -> Iterator[str]:
+    # The stream outlives the request handler, so it owns its session
+    db = SessionLocal()
+    try:
+        chatbot = Chatbot(db)
+        for event, payload in chatbot.stream_message(message, user_id):
+            yield _format_sse(event, payload)
+    except Exception as e:
+        yield _format_sse("error", {"detail": f"Chatbot error: {str(e)}"})
+    finally:
+        db.close()
+
+def _format_sse(event: str, payload: Any) -> str:
+    data = json.dumps(jsonable_encoder(payload))
+    return f"event: {event}\ndata: {data}\n\n"
+
 @router.post("/what-if")
 def process_what_if_scenario(
     scenario: schemas.WhatIfScenario,
@@ -51,26 +95,39 @@ def process_what_if_scenario(
         raise HTTPException(status_code=500, detail=f"What-if analysis error: {str(e)}")
 
 @router.get("/context/{user_id}")
-def get_chatbot_context(user_id: int, db: Session = Depends(get_db)):
+def get_chatbot_context(user_id: int):
     """Get chatbot context for a user"""
-    chatbot = Chatbot(db)
+    snapshot = get_context_store().snapshot(user_id)
     
-    return {
-        "user_id": user_id,
-        "context": chatbot.context.get(user_id, {}),
-        "last_interaction": "2024-01-01T00:00:00"  # Would be actual timestamp in production
-    }
+    if snapshot is None:
+        return {
+            "user_id": user_id,
+            "context": {},
+            "last_interaction": None
+        }
+    return snapshot
 
 @router.delete("/context/{user_id}")
-def clear_chatbot_context(user_id: int, db: Session = Depends(get_db)):
+def clear_chatbot_context(user_id: int):
     """Clear chatbot context for a user"""
-    chatbot = Chatbot(db)
-    
-    if user_id in chatbot.context:
-        del chatbot.context[user_id]
+    get_context_store().clear(user_id)
     
     return {"message": f"Context cleared for user {user_id}"}
 
+@router.get("/analytics")
+def get_chatbot_analytics(days: int = 7) -> Dict[str, Any]:
+    """Aggregate the transcript log: volume, latency, cache hit and error rate per intent.
+
+    ``precompute_candidates`` ranks intents by the time spent answering them
+    without the cache, i.e. where precomputing answers would save the most.
+    """
+    if days < 1:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="days must be at least 1")
+    try:
+        return get_transcript_log().analytics(days)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Chatbot analytics error: {str(e)}")
+
 @router.get("/capabilities")
 def get_chatbot_capabilities():
     """Get information about chatbot capabilities"""
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import date
 from database import get_db
 from schemas import CleaningSlotCreate, CleaningSlotResponse
 import crud
+from utils.responses import set_next_cursor
 
 router = APIRouter(prefix="/cleaning", tags=["cleaning slots"])
 
@@ -29,8 +30,10 @@ def create_cleaning_slot(slot: CleaningSlotCreate, db: Session = Depends(get_db)
     return crud.cleaning.create_cleaning_slot(db=db, slot=slot)
 
 @router.get("/", response_model=List[CleaningSlotResponse])
-def read_cleaning_slots(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    slots = crud.cleaning.read_cleaning_slots(db, skip=skip, limit=limit)
+def read_cleaning_slots(response: Response, skip: int = 0, limit: int = 100, after_id: Optional[int] = None,
+                        db: Session = Depends(get_db)):
+    slots = crud.cleaning.read_cleaning_slots(db, skip=skip, limit=limit, after_id=after_id)
+    set_next_cursor(response, slots, limit)
     return slots
 
 @router.get("/train/{train_id}", response_model=List[CleaningSlotResponse])
@@ -1,118 +1,113 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Dict, Any, List
+import asyncio
+from collections import Counter
 from datetime import date, datetime, timedelta
-from database import get_db
-from ai.rule_engine import AdvancedRuleEngine, TrainStatus
+from database import get_db, SessionLocal
+from ai.rule_engine import AdvancedRuleEngine, ReadinessStats
 from ai.optimizer import InductionOptimizer
-from ai.ml_model import MLModel
 
 # Import specific CRUD functions instead of the whole module
-from crud.trains import read_trains, read_active_trains, read_train
-from crud.job_cards import read_open_job_cards
-from crud.branding import read_active_contracts, read_contracts_need_exposure
+from crud.trains import read_fleet_status
+from crud.job_cards import count_open_job_cards, read_open_job_cards_with_trains
+from crud.branding import count_active_contracts, read_branding_compliance
 from crud.induction import read_todays_plan
+from crud.risk_snapshots import read_latest_risk_summary, read_risk_trends
+from utils.dashboard_summary import dashboard_summary
+from utils.change_feed import change_feed
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 @router.get("/overview")
 def get_dashboard_overview(db: Session = Depends(get_db)) -> Dict[str, Any]:
-    """Get dashboard overview statistics"""
+    """Get dashboard overview statistics.
+
+    Served from the materialized dashboard_summary row, which commits keep
+    current section by section; see utils.dashboard_summary.
+    """
     try:
-        # Basic counts - use the imported functions directly
-        all_trains = read_trains(db)
-        total_trains = len(all_trains)
-        active_trains_list = read_active_trains(db)
-        active_trains = len(active_trains_list)
-        
-        # Eligibility status - Fixed method call
-        rule_engine = AdvancedRuleEngine(db)
-        readiness_assessment = rule_engine._assess_train_readiness(date.today())
-        eligible_trains = len([t for t in readiness_assessment if t.status in [TrainStatus.AVAILABLE, TrainStatus.RESTRICTED]])
-        
-        # Maintenance status
-        open_jobs = read_open_job_cards(db)
-        trains_with_open_jobs = len(set(job.train_id for job in open_jobs))
-        
-        # Branding status
-        active_contracts_list = read_active_contracts(db)
-        contracts_needing_exposure = len(read_contracts_need_exposure(db))
-        
-        # Today's induction plan
-        todays_plan_list = read_todays_plan(db)
-        service_trains = len([p for p in todays_plan_list if p.induction_type == 'service'])
-        standby_trains = len([p for p in todays_plan_list if p.induction_type == 'standby'])
-        
-        # Failure predictions (sample)
-        ml_model = MLModel(db)
-        high_risk_trains = 0
-        try:
-            if ml_model.is_trained:
-                predictions = ml_model.predict_all_trains()
-                high_risk_trains = len([p for p in predictions if p.risk_level == "high"])
-        except:
-            pass  # Ignore prediction errors in overview
-        
-        return {
-            "summary": {
-                "total_trains": total_trains,
-                "active_trains": active_trains,
-                "eligible_trains": eligible_trains,
-                "utilization_rate": round(eligible_trains / active_trains * 100, 1) if active_trains > 0 else 0
-            },
-            "maintenance": {
-                "open_job_cards": len(open_jobs),
-                "trains_need_maintenance": trains_with_open_jobs,
-                "maintenance_urgency": "high" if trains_with_open_jobs > 5 else "medium" if trains_with_open_jobs > 2 else "low"
-            },
-            "branding": {
-                "active_contracts": len(active_contracts_list),
-                "contracts_need_exposure": contracts_needing_exposure,
-                "exposure_gap": sum(max(0, c.exposure_hours_required - c.exposure_hours_fulfilled) for c in active_contracts_list)
-            },
-            "today_plan": {
-                "service_trains": service_trains,
-                "standby_trains": standby_trains,
-                "total_planned": len(todays_plan_list),
-                "approval_status": "approved" if all(p.approved_by for p in todays_plan_list) else "pending"
-            },
-            "risk_assessment": {
-                "high_risk_trains": high_risk_trains,
-                "risk_level": "high" if high_risk_trains > 3 else "medium" if high_risk_trains > 1 else "low"
-            }
-        }
+        return dashboard_summary.read(db)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error generating dashboard overview: {str(e)}"
         )
 
+def _snapshot_event() -> Dict[str, Any]:
+    db = SessionLocal()
+    try:
+        return change_feed.snapshot(dashboard_summary.read(db))
+    finally:
+        db.close()
+
+@router.websocket("/ws")
+async def dashboard_updates(websocket: WebSocket):
+    """Push live dashboard changes instead of polling.
+
+    The connection first receives a ``snapshot`` of the overview, then
+    ``rows`` events for inserted, updated or deleted trains, job cards,
+    certificates, induction plans and branding contracts, and ``overview``
+    events carrying only the figures that changed. After a ``resync`` event
+    the client missed changes and is sent a fresh snapshot.
+    """
+    await websocket.accept()
+    subscription = change_feed.subscribe()
+    disconnected = asyncio.ensure_future(_wait_for_disconnect(websocket))
+    try:
+        await websocket.send_json(jsonable_encoder(await run_in_threadpool(_snapshot_event)))
+        
+        while True:
+            next_event = asyncio.ensure_future(subscription.get())
+            await asyncio.wait({next_event, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if not next_event.done():
+                next_event.cancel()
+                break
+            
+            event = next_event.result()
+            if event["type"] == "resync":
+                await websocket.send_json(event)
+                event = await run_in_threadpool(_snapshot_event)
+            await websocket.send_json(jsonable_encoder(event))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        change_feed.unsubscribe(subscription)
+        disconnected.cancel()
+
+async def _wait_for_disconnect(websocket: WebSocket):
+    # Clients do not send anything; receiving only detects the close
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
 @router.get("/train-status")
 def get_train_status_overview(db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
     """Get detailed status for all trains"""
     try:
-        trains = read_trains(db)
+        # Trains with their open job and active contract counts come back in one query
+        fleet = read_fleet_status(db, limit=None)
         rule_engine = AdvancedRuleEngine(db)
         
         # Get readiness assessment for all trains
         readiness_assessment = rule_engine._assess_train_readiness(date.today())
         readiness_dict = {t.train_id: t for t in readiness_assessment}
         
+        # Today's plan is ordered by rank; keep each train's first entry
+        todays_plans = {}
+        for plan in read_todays_plan(db):
+            todays_plans.setdefault(plan.train_id, plan)
+        
         train_status = []
-        for train in trains:
+        for train, open_jobs, active_contracts in fleet:
             # Get eligibility from readiness assessment
             train_readiness = readiness_dict.get(train.id)
             eligibility_status = train_readiness.status.value if train_readiness else "unknown"
-            
-            # Get open job cards
-            open_jobs = read_open_job_cards(db, train_id=train.id)
-            
-            # Get active branding contracts
-            active_contracts = read_active_contracts(db, train_id=train.id)
-            
-            # Get today's induction plan
-            todays_plan_list = read_todays_plan(db)
-            todays_plan = next((p for p in todays_plan_list if p.train_id == train.id), None)
+            todays_plan = todays_plans.get(train.id)
             
             train_status.append({
                 "train_id": train.id,
@@ -122,8 +117,8 @@ def get_train_status_overview(db: Session = Depends(get_db)) -> List[Dict[str, A
                 "last_maintenance": train.last_maintenance_date.isoformat() if train.last_maintenance_date else None,
                 "eligibility": eligibility_status,
                 "readiness_score": round(train_readiness.readiness_score, 2) if train_readiness else 0.0,
-                "open_job_cards": len(open_jobs),
-                "active_branding_contracts": len(active_contracts),
+                "open_job_cards": open_jobs,
+                "active_branding_contracts": active_contracts,
                 "today_induction": todays_plan.induction_type if todays_plan else "not_scheduled",
                 "today_rank": todays_plan.rank if todays_plan else None
             })
@@ -139,26 +134,27 @@ def get_train_status_overview(db: Session = Depends(get_db)) -> List[Dict[str, A
 def get_maintenance_alerts(db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
     """Get maintenance alerts and priorities"""
     try:
-        open_jobs = read_open_job_cards(db)
+        # Each job arrives with its train joined in; jobs of missing trains are left out
+        open_jobs = read_open_job_cards_with_trains(db)
+        today = datetime.now().date()
         
         alerts = []
         for job in open_jobs:
-            train = read_train(db, train_id=job.train_id)
-            if train:
-                # Simple priority calculation based on job age
-                job_age = (datetime.now().date() - job.created_at.date()).days
-                priority = "high" if job_age > 7 else "medium" if job_age > 3 else "low"
-                
-                alerts.append({
-                    "job_id": job.id,
-                    "work_order_id": job.work_order_id,
-                    "train_id": train.id,
-                    "train_number": train.train_number,
-                    "description": job.description,
-                    "priority": priority,
-                    "days_open": job_age,
-                    "created_date": job.created_at.date().isoformat()
-                })
+            train = job.train
+            # Simple priority calculation based on job age
+            job_age = (today - job.created_at.date()).days
+            priority = "high" if job_age > 7 else "medium" if job_age > 3 else "low"
+            
+            alerts.append({
+                "job_id": job.id,
+                "work_order_id": job.work_order_id,
+                "train_id": train.id,
+                "train_number": train.train_number,
+                "description": job.description,
+                "priority": priority,
+                "days_open": job_age,
+                "created_date": job.created_at.date().isoformat()
+            })
         
         # Sort by priority and age
         priority_order = {"high": 3, "medium": 2, "low": 1}
@@ -175,39 +171,38 @@ def get_maintenance_alerts(db: Session = Depends(get_db)) -> List[Dict[str, Any]
 def get_branding_compliance_report(db: Session = Depends(get_db)) -> Dict[str, Any]:
     """Get branding contract compliance report"""
     try:
-        active_contracts = read_active_contracts(db)
-        contracts_needing_exposure = read_contracts_need_exposure(db)
+        # Train numbers, completion rates and status buckets all come from one query
+        compliance_rows = read_branding_compliance(db)
+        today = date.today()
         
         compliance_data = []
         total_required = 0
         total_fulfilled = 0
+        status_counts = Counter()
         
-        for contract in active_contracts:
-            train = read_train(db, train_id=contract.train_id)
-            completion_rate = (contract.exposure_hours_fulfilled / contract.exposure_hours_required * 100) if contract.exposure_hours_required > 0 else 0
-            days_remaining = (contract.end_date - date.today()).days
-            
+        for contract, train_number, completion_rate, compliance_status in compliance_rows:
             compliance_data.append({
                 "contract_id": contract.id,
                 "advertiser": contract.advertiser_name,
-                "train_number": train.train_number if train else "Unknown",
+                "train_number": train_number or "Unknown",
                 "required_hours": contract.exposure_hours_required,
                 "fulfilled_hours": contract.exposure_hours_fulfilled,
                 "completion_rate": round(completion_rate, 1),
-                "days_remaining": days_remaining,
-                "status": "compliant" if completion_rate >= 80 else "at_risk" if completion_rate >= 50 else "critical"
+                "days_remaining": (contract.end_date - today).days,
+                "status": compliance_status
             })
             
-            total_required += contract.exposure_hours_required
-            total_fulfilled += contract.exposure_hours_fulfilled
+            status_counts[compliance_status] += 1
+            total_required += contract.exposure_hours_required or 0
+            total_fulfilled += contract.exposure_hours_fulfilled or 0
         
         overall_completion = (total_fulfilled / total_required * 100) if total_required > 0 else 0
         
         return {
             "summary": {
-                "total_contracts": len(active_contracts),
-                "contracts_at_risk": len([c for c in compliance_data if c["status"] == "at_risk"]),
-                "contracts_critical": len([c for c in compliance_data if c["status"] == "critical"]),
+                "total_contracts": len(compliance_rows),
+                "contracts_at_risk": status_counts["at_risk"],
+                "contracts_critical": status_counts["critical"],
                 "overall_completion": round(overall_completion, 1),
                 "total_exposure_gap": total_required - total_fulfilled
             },
@@ -221,63 +216,59 @@ def get_branding_compliance_report(db: Session = Depends(get_db)) -> Dict[str, A
 
 @router.get("/predictive-analytics")
 def get_predictive_analytics(db: Session = Depends(get_db)) -> Dict[str, Any]:
-    """Get predictive analytics and insights"""
+    """Get predictive analytics and insights.
+
+    Failure predictions and fleet readiness figures come from the latest
+    risk snapshot rather than running the model and the rule engine; see
+    utils.risk_snapshots. Open job cards and contract counts are live.
+    """
+    insights = {
+        "failure_predictions": {},
+        "maintenance_forecast": {},
+        "capacity_planning": {},
+        "risk_assessment": {}
+    }
     try:
-        ml_model = MLModel(db)
-        rule_engine = AdvancedRuleEngine(db)
-        
-        insights = {
-            "failure_predictions": {},
-            "maintenance_forecast": {},
-            "capacity_planning": {},
-            "risk_assessment": {}
-        }
-        
         # Failure predictions
-        if ml_model.is_trained:
-            predictions = ml_model.predict_all_trains()
-            high_risk = [p for p in predictions if p.risk_level == "high"]
-            medium_risk = [p for p in predictions if p.risk_level == "medium"]
-            
+        risk = read_latest_risk_summary(db)
+        if risk:
             insights["failure_predictions"] = {
-                "high_risk_trains": len(high_risk),
-                "medium_risk_trains": len(medium_risk),
-                "recommended_maintenance": len(high_risk) + len(medium_risk) // 2,
-                "prediction_confidence": "high" if len(predictions) > 5 else "medium"
+                "high_risk_trains": risk["high"],
+                "medium_risk_trains": risk["medium"],
+                "recommended_maintenance": risk["high"] + risk["medium"] // 2,
+                "prediction_confidence": "high" if risk["trains"] > 5 else "medium",
+                "snapshot_taken_at": risk["taken_at"]
             }
         
-        # Maintenance forecast using rule engine's readiness assessment
-        readiness_assessment = rule_engine._assess_train_readiness(date.today())
-        maintenance_needed = [t for t in readiness_assessment if t.status == TrainStatus.MAINTENANCE_NEEDED]
+        # Maintenance forecast from the readiness figures stored with the snapshot;
+        # without them the figures of an empty assessment are reported
+        readiness = (risk or {}).get("readiness") or {}
+        maintenance_needed = readiness.get("maintenance_needed", 0)
         
         insights["maintenance_forecast"] = {
-            "maintenance_due_soon": len(maintenance_needed),
-            "next_week_maintenance": min(5, len(maintenance_needed)),
-            "maintenance_capacity_required": f"{len(maintenance_needed)} trains in next 2 weeks",
-            "average_readiness_score": round(sum(t.readiness_score for t in readiness_assessment) / len(readiness_assessment), 2) if readiness_assessment else 0
+            "maintenance_due_soon": maintenance_needed,
+            "next_week_maintenance": min(5, maintenance_needed),
+            "maintenance_capacity_required": f"{maintenance_needed} trains in next 2 weeks",
+            "average_readiness_score": round(readiness["readiness_avg"], 2) if readiness.get("readiness_avg") is not None else 0
         }
         
-        # Capacity planning using readiness assessment
-        eligible_trains = [t for t in readiness_assessment if t.status in [TrainStatus.AVAILABLE, TrainStatus.RESTRICTED]]
-        active_contracts = len(read_active_contracts(db))
+        # Capacity planning
+        eligible_trains = readiness.get("eligible_trains", 0)
+        active_contracts, critical_contracts = count_active_contracts(db)
         
         insights["capacity_planning"] = {
-            "available_capacity": len(eligible_trains),
+            "available_capacity": eligible_trains,
             "branding_demand": active_contracts,
-            "capacity_utilization": f"{min(100, (active_contracts / len(eligible_trains) * 100)):.1f}%" if eligible_trains else "0%",
-            "recommendation": "Adequate capacity" if len(eligible_trains) > active_contracts + 5 else "Consider adding capacity",
-            "high_readiness_trains": len([t for t in eligible_trains if t.readiness_score >= 0.8])
+            "capacity_utilization": f"{min(100, (active_contracts / eligible_trains * 100)):.1f}%" if eligible_trains else "0%",
+            "recommendation": "Adequate capacity" if eligible_trains > active_contracts + 5 else "Consider adding capacity",
+            "high_readiness_trains": readiness.get("high_readiness_trains", 0)
         }
         
-        # Overall risk assessment using rule engine's risk factors
-        open_jobs = len(read_open_job_cards(db))
-        critical_contracts = len([c for c in read_active_contracts(db) 
-                                if c.exposure_hours_fulfilled < c.exposure_hours_required * 0.5])
-        
-        # Calculate average risk factor from readiness assessment
-        avg_risk_factor = sum(t.risk_factor for t in readiness_assessment) / len(readiness_assessment) if readiness_assessment else 0.5
+        # Overall risk assessment using the rule engine's risk factors
+        open_jobs = count_open_job_cards(db)
+        avg_risk_factor = readiness["risk_factor_avg"] if readiness.get("risk_factor_avg") is not None else 0.5
         
-        risk_score = min(100, (open_jobs * 10) + (critical_contracts * 15) + (len(maintenance_needed) * 5) + (avg_risk_factor * 100))
+        risk_score = min(100, (open_jobs * 10) + (critical_contracts * 15) + (maintenance_needed * 5) + (avg_risk_factor * 100))
         
         insights["risk_assessment"] = {
             "risk_score": round(risk_score, 1),
@@ -286,7 +277,7 @@ def get_predictive_analytics(db: Session = Depends(get_db)) -> Dict[str, Any]:
             "major_risks": [
                 f"{open_jobs} open maintenance jobs",
                 f"{critical_contracts} critical branding contracts",
-                f"{len(maintenance_needed)} trains due for maintenance",
+                f"{maintenance_needed} trains due for maintenance",
                 f"Average train risk factor: {avg_risk_factor:.2f}"
             ]
         }
@@ -297,6 +288,22 @@ def get_predictive_analytics(db: Session = Depends(get_db)) -> Dict[str, Any]:
         insights["error"] = f"Analytics generation failed: {str(e)}"
         return insights
 
+@router.get("/risk-trends")
+def get_risk_trends(days: int = 30, db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """Fleet risk level counts per stored risk snapshot over the last ``days`` days"""
+    if days < 1:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="days must be at least 1")
+    try:
+        snapshots = read_risk_trends(db, since=datetime.now() - timedelta(days=days))
+        for snapshot in snapshots:
+            snapshot["mean_probability"] = round(snapshot["mean_probability"] or 0, 3)
+        return {"days": days, "snapshots": snapshots}
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching risk trends: {str(e)}"
+        )
+
 @router.get("/train-readiness")
 def get_train_readiness_dashboard(db: Session = Depends(get_db)) -> Dict[str, Any]:
     """Get detailed train readiness dashboard using the rule engine"""
@@ -304,34 +311,17 @@ def get_train_readiness_dashboard(db: Session = Depends(get_db)) -> Dict[str, An
         rule_engine = AdvancedRuleEngine(db)
         readiness_assessment = rule_engine._assess_train_readiness(date.today())
         
-        # Categorize trains by readiness level
-        excellent = [t for t in readiness_assessment if t.readiness_score >= 0.8]
-        good = [t for t in readiness_assessment if 0.6 <= t.readiness_score < 0.8]
-        fair = [t for t in readiness_assessment if 0.4 <= t.readiness_score < 0.6]
-        poor = [t for t in readiness_assessment if t.readiness_score < 0.4]
-        
-        # Get top constraints
-        all_constraints = []
-        for train in readiness_assessment:
-            all_constraints.extend(train.constraints)
-        
-        constraint_counts = {}
-        for constraint in all_constraints:
-            constraint_counts[constraint] = constraint_counts.get(constraint, 0) + 1
+        # Buckets, averages and constraint tallies in one pass, shared with the rule engine summary
+        stats = ReadinessStats.from_readiness(readiness_assessment)
         
         return {
             "summary": {
-                "total_trains_assessed": len(readiness_assessment),
-                "average_readiness_score": round(sum(t.readiness_score for t in readiness_assessment) / len(readiness_assessment), 2),
-                "availability_rate": len([t for t in readiness_assessment if t.status in [TrainStatus.AVAILABLE, TrainStatus.RESTRICTED]]) / len(readiness_assessment),
-                "readiness_distribution": {
-                    "excellent": len(excellent),
-                    "good": len(good),
-                    "fair": len(fair),
-                    "poor": len(poor)
-                }
+                "total_trains_assessed": stats.total,
+                "average_readiness_score": round(stats.average_score, 2),
+                "availability_rate": stats.availability_rate,
+                "readiness_distribution": stats.distribution()
             },
-            "top_constraints": dict(sorted(constraint_counts.items(), key=lambda x: x[1], reverse=True)[:5]),
+            "top_constraints": stats.top_constraints(5),
             "trains_need_attention": [
                 {
                     "train_id": t.train_id,
@@ -340,7 +330,7 @@ def get_train_readiness_dashboard(db: Session = Depends(get_db)) -> Dict[str, An
                     "status": t.status.value,
                     "constraints": t.constraints
                 }
-                for t in readiness_assessment if t.readiness_score < 0.6
+                for t in stats.below(0.6)
             ]
         }
     except Exception as e:
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from database import get_db
 from schemas import UserFeedbackCreate, UserFeedbackResponse
 import crud
+from utils.responses import set_next_cursor
 
 router = APIRouter(prefix="/feedback", tags=["user feedback"])
 
@@ -12,8 +13,10 @@ def create_feedback(feedback: UserFeedbackCreate, db: Session = Depends(get_db))
     return crud.feedback.create_feedback(db=db, feedback=feedback)
 
 @router.get("/", response_model=List[UserFeedbackResponse])
-def read_all_feedback(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    feedback_list = crud.feedback.read_all_feedback(db, skip=skip, limit=limit)
+def read_all_feedback(response: Response, skip: int = 0, limit: int = 100, after_id: Optional[int] = None,
+                      db: Session = Depends(get_db)):
+    feedback_list = crud.feedback.read_all_feedback(db, skip=skip, limit=limit, after_id=after_id)
+    set_next_cursor(response, feedback_list, limit)
     return feedback_list
 
 @router.get("/user/{user_id}", response_model=List[UserFeedbackResponse])
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from database import get_db
 from schemas import FitnessCertificateCreate, FitnessCertificateResponse
 import crud
+from utils.responses import set_next_cursor
 
 router = APIRouter(prefix="/fitness", tags=["fitness certificates"])
 
@@ -19,8 +20,10 @@ def create_fitness_certificate(cert: FitnessCertificateCreate, db: Session = Dep
     return crud.fitness.create_fitness_certificate(db=db, cert=cert)
 
 @router.get("/", response_model=List[FitnessCertificateResponse])
-def read_fitness_certificates(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    certificates = crud.fitness.read_fitness_certificates(db, skip=skip, limit=limit)
+def read_fitness_certificates(response: Response, skip: int = 0, limit: int = 100, after_id: Optional[int] = None,
+                              db: Session = Depends(get_db)):
+    certificates = crud.fitness.read_fitness_certificates(db, skip=skip, limit=limit, after_id=after_id)
+    set_next_cursor(response, certificates, limit)
     return certificates
 
 @router.get("/train/{train_id}", response_model=List[FitnessCertificateResponse])
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import date
 from database import get_db
 from schemas import InductionPlanCreate, InductionPlanResponse
 import crud
+from utils.responses import set_next_cursor
 
 router = APIRouter(prefix="/induction", tags=["induction plans"])
 
@@ -32,8 +33,10 @@ def create_bulk_induction_plans(plans: List[InductionPlanCreate], db: Session =
     return crud.induction.create_bulk_induction_plans(db=db, plans=plans)
 
 @router.get("/", response_model=List[InductionPlanResponse])
-def read_induction_plans(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    plans = crud.induction.read_induction_plans(db, skip=skip, limit=limit)
+def read_induction_plans(response: Response, skip: int = 0, limit: int = 100, after_id: Optional[int] = None,
+                         db: Session = Depends(get_db)):
+    plans = crud.induction.read_induction_plans(db, skip=skip, limit=limit, after_id=after_id)
+    set_next_cursor(response, plans, limit)
     return plans
 
 @router.get("/date/{plan_date}", response_model=List[InductionPlanResponse])
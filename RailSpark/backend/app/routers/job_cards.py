@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from database import get_db
 from schemas import JobCardCreate, JobCardResponse
 import crud
+from utils.responses import set_next_cursor
 
 router = APIRouter(prefix="/job-cards", tags=["job cards"])
 
@@ -19,8 +20,10 @@ def create_job_card(job_card: JobCardCreate, db: Session = Depends(get_db)):
     return crud.job_cards.create_job_card(db=db, job_card=job_card)
 
 @router.get("/", response_model=List[JobCardResponse])
-def read_job_cards(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    job_cards = crud.job_cards.read_job_cards(db, skip=skip, limit=limit)
+def read_job_cards(response: Response, skip: int = 0, limit: int = 100, after_id: Optional[int] = None,
+                   db: Session = Depends(get_db)):
+    job_cards = crud.job_cards.read_job_cards(db, skip=skip, limit=limit, after_id=after_id)
+    set_next_cursor(response, job_cards, limit)
     return job_cards
 
 @router.get("/train/{train_id}", response_model=List[JobCardResponse])
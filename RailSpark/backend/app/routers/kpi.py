@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import date, timedelta
+from database import get_db
+from schemas import KpiDailyResponse, KpiRollupResponse
+from crud.kpi import PERIODS, read_daily_kpis, read_kpi_rollups, read_fleet_kpi_trend
+from utils.kpi_store import kpi_recorder
+
+router = APIRouter(prefix="/kpi", tags=["fleet kpis"])
+
+def _date_range(start: Optional[date], end: Optional[date], default_days: int) -> Tuple[date, date]:
+    end = end or date.today()
+    start = start or end - timedelta(days=default_days)
+    if start > end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must not be after end")
+    return start, end
+
+def _check_period(period: str, allowed=PERIODS):
+    if period not in allowed:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"period must be one of: {', '.join(allowed)}"
+        )
+
+@router.get("/daily", response_model=List[KpiDailyResponse])
+def read_daily(start: Optional[date] = None, end: Optional[date] = None, train_id: Optional[int] = None,
+               db: Session = Depends(get_db)):
+    """Per-train daily KPI rows; the last 30 days by default"""
+    start, end = _date_range(start, end, 30)
+    return read_daily_kpis(db, start, end, train_id=train_id)
+
+@router.get("/rollups/{period}", response_model=List[KpiRollupResponse])
+def read_rollups(period: str, start: Optional[date] = None, end: Optional[date] = None,
+                 train_id: Optional[int] = None, db: Session = Depends(get_db)):
+    """Per-train weekly or monthly rollups; the last year by default"""
+    _check_period(period)
+    start, end = _date_range(start, end, 365)
+    return read_kpi_rollups(db, period, start, end, train_id=train_id)
+
+@router.get("/fleet")
+def read_fleet_trend(period: str = "week", start: Optional[date] = None, end: Optional[date] = None,
+                     db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """Fleet averages per day, week or month; the last year by default"""
+    _check_period(period, ("day",) + PERIODS)
+    start, end = _date_range(start, end, 365)
+    try:
+        points = read_fleet_kpi_trend(db, period, start, end)
+        for point in points:
+            for key in ("readiness_avg", "risk_avg", "open_job_cards_avg"):
+                if point[key] is not None:
+                    point[key] = round(point[key], 3)
+        return {"period": period, "start": start, "end": end, "points": points}
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching fleet KPI trend: {str(e)}"
+        )
+
+@router.post("/record")
+def record_kpis() -> Dict[str, Any]:
+    """Record today's KPI rows now instead of waiting for the next risk snapshot"""
+    try:
+        rows = kpi_recorder.record()
+        return {"kpi_date": date.today(), "rows": rows}
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error recording KPIs: {str(e)}"
+        )
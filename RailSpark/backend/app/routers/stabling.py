@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from database import get_db
 from schemas import StablingGeometryCreate, StablingGeometryResponse
 import crud
+from utils.responses import set_next_cursor
 
 router = APIRouter(prefix="/stabling", tags=["stabling geometry"])
 
@@ -19,8 +20,10 @@ def create_stabling_geometry(geometry: StablingGeometryCreate, db: Session = Dep
     return crud.stabling.create_stabling_geometry(db=db, geometry=geometry)
 
 @router.get("/", response_model=List[StablingGeometryResponse])
-def read_stabling_geometries(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    geometries = crud.stabling.read_stabling_geometries(db, skip=skip, limit=limit)
+def read_stabling_geometries(response: Response, skip: int = 0, limit: int = 100, after_id: Optional[int] = None,
+                             db: Session = Depends(get_db)):
+    geometries = crud.stabling.read_stabling_geometries(db, skip=skip, limit=limit, after_id=after_id)
+    set_next_cursor(response, geometries, limit)
     return geometries
 
 @router.get("/train/{train_id}", response_model=StablingGeometryResponse)
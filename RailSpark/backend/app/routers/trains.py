@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from database import get_db
 from schemas import TrainCreate, TrainResponse
 import crud
+from utils.responses import set_next_cursor
 
 router = APIRouter(prefix="/trains", tags=["trains"])
 
@@ -19,8 +20,10 @@ def create_train(train: TrainCreate, db: Session = Depends(get_db)):
     return crud.trains.create_train(db=db, train=train)
 
 @router.get("/", response_model=List[TrainResponse])
-def read_trains(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    trains = crud.trains.read_trains(db, skip=skip, limit=limit)
+def read_trains(response: Response, skip: int = 0, limit: int = 100, after_id: Optional[int] = None,
+                db: Session = Depends(get_db)):
+    trains = crud.trains.read_trains(db, skip=skip, limit=limit, after_id=after_id)
+    set_next_cursor(response, trains, limit)
     return trains
 
 @router.get("/active", response_model=List[TrainResponse])
@@ -156,6 +156,37 @@ class UserResponse(UserBase):
     class Config:
         from_attributes = True
 
+# KPI Schemas
+class KpiDailyResponse(BaseModel):
+    kpi_date: date
+    train_id: int
+    readiness_score: Optional[float] = None
+    risk_probability: Optional[float] = None
+    risk_level: Optional[str] = None
+    mileage: Optional[int] = None
+    exposure_hours: Optional[int] = None
+    open_job_cards: Optional[int] = None
+    
+    class Config:
+        from_attributes = True
+
+class KpiRollupResponse(BaseModel):
+    period: str
+    period_start: date
+    train_id: int
+    days: int
+    readiness_avg: Optional[float] = None
+    readiness_min: Optional[float] = None
+    risk_avg: Optional[float] = None
+    risk_max: Optional[float] = None
+    mileage_end: Optional[int] = None
+    mileage_delta: Optional[int] = None
+    exposure_end: Optional[int] = None
+    open_job_cards_avg: Optional[float] = None
+    
+    class Config:
+        from_attributes = True
+
 # Chatbot Schemas
 class ChatQuery(BaseModel):
     message: str
@@ -0,0 +1,45 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# The app imports its modules top-level (``import crud``), so run from the app directory
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+# The app writes logs/, data/ and model artifacts relative to the working
+# directory; keep them, and the test database, out of the tree
+WORK_DIR = Path(tempfile.mkdtemp(prefix="railspark-tests-"))
+(WORK_DIR / "logs").mkdir()
+os.chdir(WORK_DIR)
+
+# Never the configured database: tests write to it
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL", f"sqlite:///{WORK_DIR}/test.db")
+
+import models  # noqa: E402
+from database import engine, SessionLocal  # noqa: E402
+from utils.data_version import data_version  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def tables():
+    models.Base.metadata.create_all(bind=engine)
+    yield
+    models.Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def quiet_commits(monkeypatch):
+    """Keep commits from starting background summary refreshes and risk snapshots"""
+    monkeypatch.setattr(data_version, "_listeners", [])
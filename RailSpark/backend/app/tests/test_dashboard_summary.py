@@ -0,0 +1,72 @@
+from datetime import date, timedelta
+
+import pytest
+
+import models
+from utils.dashboard_summary import SUMMARY_ID, DashboardSummaryRefresher, SummarySession
+
+
+@pytest.fixture
+def no_summary_row():
+    db = SummarySession()
+    db.query(models.DashboardSummary).delete()
+    db.commit()
+    db.close()
+
+
+def _stored_rows():
+    db = SummarySession()
+    try:
+        return db.query(models.DashboardSummary).all()
+    finally:
+        db.close()
+
+
+def test_refresh_uses_row_inserted_concurrently(quiet_commits, no_summary_row):
+    def session_factory():
+        session = SummarySession()
+        get = session.get
+
+        def get_then_lose_race(*args, **kwargs):
+            found = get(*args, **kwargs)
+            if found is None:
+                # Another worker inserts the row between our read and our insert
+                other = SummarySession()
+                other.add(models.DashboardSummary(id=SUMMARY_ID, total_trains=-1))
+                other.commit()
+                other.close()
+                session.get = get
+            return found
+
+        session.get = get_then_lose_race
+        return session
+
+    summary = DashboardSummaryRefresher(session_factory).refresh()
+
+    rows = _stored_rows()
+    assert len(rows) == 1
+    assert summary.summary_date == date.today()
+    assert rows[0].total_trains == summary.total_trains >= 0
+
+
+def test_stale_row_is_served_while_refresh_is_queued(quiet_commits, no_summary_row, db):
+    refresher = DashboardSummaryRefresher()
+    refresher.refresh()
+    stale = SummarySession()
+    row = stale.get(models.DashboardSummary, SUMMARY_ID)
+    actual_total = row.total_trains
+    row.summary_date = date.today() - timedelta(days=1)
+    row.total_trains = actual_total + 100
+    stale.commit()
+    stale.close()
+
+    refreshes = []
+    refresher.on_refresh(refreshes.append)
+    overview = refresher.read(db)
+    assert overview["summary"]["total_trains"] == actual_total + 100
+
+    refresher.read(db)  # Queues the full refresh once per day
+    refresher.wait(timeout=10)
+    assert len(refreshes) == 1
+    db.expire_all()
+    assert refresher.read(db)["summary"]["total_trains"] == actual_total
@@ -0,0 +1,73 @@
+from datetime import date, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import models
+from routers import dashboard
+from utils.data_version import data_version
+from utils.http_cache import CACHE_RULES, ETagMiddleware, compute_etag
+
+RULE_TABLES = [(rule, table) for rule in CACHE_RULES for table in rule.tables]
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(ETagMiddleware)
+    app.include_router(dashboard.router)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("rule,table", RULE_TABLES,
+                         ids=[f"{rule.prefix}:{table}" for rule, table in RULE_TABLES])
+def test_write_to_listed_table_changes_etag(quiet_commits, rule, table):
+    before = compute_etag(rule)
+    data_version.bump({table})
+    assert compute_etag(rule) != before
+
+
+def test_write_to_unlisted_table_keeps_etag(quiet_commits):
+    rule = next(rule for rule in CACHE_RULES if rule.prefix == "/trains")
+    before = compute_etag(rule)
+    data_version.bump({"user_feedback"})
+    assert compute_etag(rule) == before
+
+
+def test_train_status_revalidates_after_certificate_and_plan_writes(quiet_commits, client, db):
+    today = date.today()
+    train = models.Train(train_number="ETAG-1", status="active", current_mileage=1000,
+                         last_maintenance_date=today - timedelta(days=10))
+    db.add(train)
+    db.flush()
+    certificates = [
+        models.FitnessCertificate(train_id=train.id, department=department, is_valid=True,
+                                  valid_from=today - timedelta(days=30),
+                                  valid_until=today + timedelta(days=30))
+        for department in ("Rolling-Stock", "Signalling", "Telecom")
+    ]
+    db.add_all(certificates)
+    db.commit()
+
+    def status_of(response):
+        return next(row for row in response.json() if row["train_id"] == train.id)
+
+    first = client.get("/dashboard/train-status")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert client.get("/dashboard/train-status", headers={"If-None-Match": etag}).status_code == 304
+
+    for certificate in certificates:
+        certificate.is_valid = False
+    db.commit()
+    after_certificates = client.get("/dashboard/train-status", headers={"If-None-Match": etag})
+    assert after_certificates.status_code == 200
+    assert status_of(after_certificates)["eligibility"] != status_of(first)["eligibility"]
+
+    etag = after_certificates.headers["etag"]
+    db.add(models.InductionPlan(plan_date=today, train_id=train.id, induction_type="standby", rank=1))
+    db.commit()
+    after_plan = client.get("/dashboard/train-status", headers={"If-None-Match": etag})
+    assert after_plan.status_code == 200
+    assert status_of(after_plan)["today_induction"] == "standby"
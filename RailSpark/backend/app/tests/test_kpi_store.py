@@ -0,0 +1,45 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+import threading
+import time
+
+import models
+from utils.dashboard_summary import SummarySession
+from utils.kpi_store import KpiRecorder
+
+
+def test_concurrent_records_are_serialized(quiet_commits, db):
+    db.add_all(models.Train(train_number=f"KPI-{i}", status="active", current_mileage=1000 * i)
+               for i in range(1, 4))
+    db.commit()
+
+    guard = threading.Lock()
+    open_sessions = []
+    peak = 0
+
+    def session_factory():
+        nonlocal peak
+        session = SummarySession()
+        close = session.close
+
+        def tracked_close():
+            with guard:
+                open_sessions.remove(session)
+            close()
+
+        session.close = tracked_close
+        with guard:
+            open_sessions.append(session)
+            peak = max(peak, len(open_sessions))
+        time.sleep(0.02)  # Widen the window a second writer would slip into
+        return session
+
+    recorder = KpiRecorder(session_factory)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: recorder.record(), range(8)))
+
+    trains = db.query(models.Train).count()
+    assert peak == 1
+    assert results == [trains] * 8
+    assert recorder.version == 8
+    assert db.query(models.KpiDaily).filter(models.KpiDaily.kpi_date == date.today()).count() == trains
@@ -0,0 +1,35 @@
+from types import SimpleNamespace
+
+import pytest
+
+from ai.ml_model import MLModel
+
+
+def test_loading_a_model_does_not_update_it(monkeypatch, db):
+    monkeypatch.setattr(MLModel, "load_model", lambda self: True)
+
+    def fail(self, *args, **kwargs):
+        pytest.fail("model updated while being loaded")
+
+    for method in ("check_retraining_need", "update_incrementally", "train_model", "save_model"):
+        monkeypatch.setattr(MLModel, method, fail)
+
+    assert MLModel(db).is_trained
+
+
+def test_compile_result_is_cached_per_artifact_version(monkeypatch, db):
+    monkeypatch.setattr(MLModel, "load_model", lambda self: True)
+    compiles = []
+    monkeypatch.setattr(MLModel, "_compile_best_model", lambda self: compiles.append(self) and None)
+    artifact = SimpleNamespace(version="v-uncompiled", metadata={})
+
+    for _ in range(3):
+        model = MLModel(db)
+        model._artifact = artifact
+        assert model.compiled_model is None
+    assert len(compiles) == 1
+
+    model = MLModel(db)
+    model._artifact = SimpleNamespace(version="v-next", metadata={})
+    assert model.compiled_model is None
+    assert len(compiles) == 2
@@ -0,0 +1,37 @@
+from datetime import date, datetime
+import itertools
+
+import pytest
+
+import crud
+import models
+
+_numbers = itertools.count(1)
+
+
+@pytest.fixture
+def train(db):
+    train = models.Train(train_number=f"DEL-{next(_numbers)}", status="active", current_mileage=1000)
+    db.add(train)
+    db.commit()
+    return train
+
+
+def test_snapshotted_train_can_be_deleted(quiet_commits, db, train):
+    assert not models.RiskSnapshot.__table__.c.train_id.foreign_keys
+    db.add(models.RiskSnapshot(taken_at=datetime.now(), train_id=train.id, train_number=train.train_number,
+                               failure_probability=0.2, risk_level="low"))
+    db.commit()
+
+    assert crud.trains.delete_train(db, train_id=train.id)
+    assert db.query(models.RiskSnapshot).filter(models.RiskSnapshot.train_number == train.train_number).count() == 1
+
+
+def test_train_with_kpis_can_be_deleted(quiet_commits, db, train):
+    for model in (models.KpiDaily, models.KpiRollup):
+        assert not model.__table__.c.train_id.foreign_keys
+    db.add(models.KpiDaily(kpi_date=date.today(), train_id=train.id, readiness_score=0.9))
+    db.add(models.KpiRollup(period="week", period_start=date.today(), train_id=train.id, days=1))
+    db.commit()
+
+    assert crud.trains.delete_train(db, train_id=train.id)
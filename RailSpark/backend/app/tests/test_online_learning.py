@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+from ai.online_learning import DriftMonitor
+
+
+def test_drift_metrics_report_live_spread_against_training():
+    monitor = DriftMonitor(["mileage", "open_jobs_count"])
+    monitor.set_reference({"features": {"mileage": {"mean": 50000.0, "std": 1000.0},
+                                        "open_jobs_count": {"mean": 1.0, "std": 1.0}}}, "v1")
+    rng = np.random.default_rng(0)
+    for mileage, jobs in zip(rng.normal(50000, 3000, 2000), rng.normal(1, 1, 2000)):
+        monitor.update({"mileage": mileage, "open_jobs_count": jobs}, 0.1)
+
+    metrics = monitor.metrics()
+    assert metrics["feature_spread_ratio"]["mileage"] == pytest.approx(3.0, rel=0.05)
+    assert metrics["feature_spread_ratio"]["open_jobs_count"] == pytest.approx(1.0, rel=0.05)
+    assert abs(metrics["feature_shift"]["mileage"]) < 0.5
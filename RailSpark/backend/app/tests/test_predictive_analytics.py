@@ -0,0 +1,67 @@
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import models
+from ai.rule_engine import AdvancedRuleEngine, ReadinessStats, TrainStatus
+from routers import dashboard
+from utils import risk_snapshots
+from utils.risk_snapshots import RiskSnapshotter
+from tests.test_risk_snapshots import _prediction
+
+
+@pytest.fixture
+def fleet(db):
+    today = date.today()
+    trains = [models.Train(train_number=f"PA-{i}", status="active", current_mileage=20000 * i,
+                           last_maintenance_date=today - timedelta(days=20 * i))
+              for i in range(1, 5)]
+    db.add_all(trains)
+    db.flush()
+    for train in trains[:3]:
+        db.add_all(models.FitnessCertificate(train_id=train.id, department=department, is_valid=True,
+                                             valid_from=today - timedelta(days=30),
+                                             valid_until=today + timedelta(days=30))
+                   for department in ("Rolling-Stock", "Signalling", "Telecom"))
+    db.add(models.JobCard(train_id=trains[0].id, work_order_id="WO-PA-1", description="Brake pads", status="open"))
+    db.add(models.BrandingContract(train_id=trains[1].id, advertiser_name="Acme",
+                                   exposure_hours_required=100, exposure_hours_fulfilled=10,
+                                   start_date=today - timedelta(days=5), end_date=today + timedelta(days=5)))
+    db.commit()
+    return trains
+
+
+def test_predictive_analytics_reads_stored_readiness(monkeypatch, quiet_commits, db, fleet):
+    model = SimpleNamespace(is_trained=True,
+                            predict_all_trains=lambda: [_prediction(train.id) for train in fleet])
+    monkeypatch.setattr(risk_snapshots, "get_ml_model", lambda db: model)
+    monkeypatch.setattr(risk_snapshots.dashboard_summary, "schedule", lambda tables: None)
+    RiskSnapshotter().take()
+
+    readiness = AdvancedRuleEngine(db)._assess_train_readiness(date.today())
+    stats = ReadinessStats.from_readiness(readiness)
+    eligible = [t for t in readiness if t.status in (TrainStatus.AVAILABLE, TrainStatus.RESTRICTED)]
+
+    def no_rule_engine(*args, **kwargs):
+        pytest.fail("predictive analytics ran the rule engine")
+
+    monkeypatch.setattr(dashboard, "AdvancedRuleEngine", no_rule_engine)
+    app = FastAPI()
+    app.include_router(dashboard.router)
+    insights = TestClient(app).get("/dashboard/predictive-analytics").json()
+
+    assert "error" not in insights
+    maintenance_needed = len([t for t in readiness if t.status == TrainStatus.MAINTENANCE_NEEDED])
+    assert insights["maintenance_forecast"]["maintenance_due_soon"] == maintenance_needed
+    assert insights["maintenance_forecast"]["average_readiness_score"] == round(stats.average_score, 2)
+    assert insights["capacity_planning"]["available_capacity"] == len(eligible)
+    assert insights["capacity_planning"]["high_readiness_trains"] == \
+        len([t for t in eligible if t.readiness_score >= 0.8])
+    assert insights["capacity_planning"]["branding_demand"] >= 1
+    avg_risk_factor = sum(t.risk_factor for t in readiness) / len(readiness)
+    assert insights["risk_assessment"]["average_risk_factor"] == round(avg_risk_factor, 2)
+    assert f"{db.query(models.JobCard).filter_by(status='open').count()} open maintenance jobs" in \
+        insights["risk_assessment"]["major_risks"]
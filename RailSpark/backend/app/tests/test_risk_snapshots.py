@@ -0,0 +1,55 @@
+from datetime import datetime
+from types import SimpleNamespace
+import threading
+
+from ai.ml_model import FailurePrediction
+from utils import risk_snapshots
+from utils.risk_snapshots import RiskSnapshotter
+
+
+def _prediction(train_id):
+    return FailurePrediction(train_id=train_id, train_number=f"RS-{train_id}", failure_probability=0.3,
+                             risk_level="low", predicted_failure_type=None, confidence=0.8,
+                             recommendation="", features={}, model_used="random_forest",
+                             prediction_timestamp=datetime.now())
+
+
+def test_stop_waits_for_running_snapshot_and_drops_new_requests(monkeypatch):
+    snapshotter = RiskSnapshotter(min_gap=0)
+    started, release = threading.Event(), threading.Event()
+    taken = []
+
+    def take():
+        started.set()
+        release.wait(5)
+        taken.append(datetime.now())
+        return taken[-1]
+
+    monkeypatch.setattr(snapshotter, "take", take)
+    snapshotter.request()
+    assert started.wait(5)
+    snapshotter.request()  # Queued behind the running one, dropped by stop
+
+    threading.Timer(0.05, release.set).start()
+    snapshotter.stop()
+    assert len(taken) == 1
+
+    snapshotter.request()
+    snapshotter.wait(5)
+    assert len(taken) == 1
+
+
+def test_take_skips_summary_refresh_once_stopping(monkeypatch, quiet_commits):
+    model = SimpleNamespace(is_trained=True, predict_all_trains=lambda: [_prediction(1), _prediction(2)])
+    monkeypatch.setattr(risk_snapshots, "get_ml_model", lambda db: model)
+    scheduled = []
+    monkeypatch.setattr(risk_snapshots.dashboard_summary, "schedule", scheduled.append)
+    snapshotter = RiskSnapshotter()
+
+    assert snapshotter.take() is not None
+    assert scheduled == [{"risk_snapshots"}]
+
+    snapshotter.stop()
+    assert snapshotter.take() is not None
+    assert scheduled == [{"risk_snapshots"}]
+    assert snapshotter.version == 2
@@ -0,0 +1,31 @@
+from datetime import date
+
+from ai import scenario_engine
+from ai.scenario_engine import ScenarioEngine
+
+PLAN_DATE = date(2026, 1, 2)
+
+
+def test_baseline_is_not_cached_for_a_replaced_snapshot(monkeypatch):
+    loads = []
+    monkeypatch.setattr(scenario_engine.FleetSnapshot, "load",
+                        staticmethod(lambda db: loads.append(object()) or loads[-1]))
+    engine = ScenarioEngine(snapshot_ttl=3600)
+    solved = []
+
+    def solve(snapshot, plan_date):
+        solved.append(snapshot)
+        if len(solved) == 1:
+            # The snapshot expires and is reloaded while the first solve runs
+            engine._snapshot_loaded = float("-inf")
+            engine.snapshot(None)
+        return [snapshot]
+
+    monkeypatch.setattr(engine, "_solve", solve)
+
+    assert engine.baseline(None, PLAN_DATE) == [loads[0]]
+    assert PLAN_DATE not in engine._baseline
+
+    assert engine.baseline(None, PLAN_DATE) == [loads[1]]
+    assert engine.baseline(None, PLAN_DATE) == [loads[1]]
+    assert solved == [loads[0], loads[1]]
@@ -0,0 +1,29 @@
+from ai import services
+
+
+class FakeModel:
+    def __init__(self, db):
+        self.db = db
+        self.loaded_with = db
+        self._models = {"random_forest": "fitted"}
+        self.feature_names = ["mileage"]
+
+    def refresh_if_stale(self):
+        return False
+
+
+def test_request_copies_do_not_share_state(monkeypatch, db):
+    monkeypatch.setattr(services, "MLModel", FakeModel)
+    engine_services = services.EngineServices()
+
+    model = engine_services.ml_model(db)
+    model._models["random_forest"] = "refitted"
+    model.feature_names.append("train_age_days")
+
+    shared = engine_services._ml_model
+    assert shared._models == {"random_forest": "fitted"}
+    assert shared.feature_names == ["mileage"]
+    assert model.db is db
+    assert shared.loaded_with is not db
+    assert shared.db is None
+    assert engine_services.ml_model(db)._models == {"random_forest": "fitted"}
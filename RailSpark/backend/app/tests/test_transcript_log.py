@@ -0,0 +1,71 @@
+import threading
+
+from ai.transcript_log import TranscriptLog
+
+
+def _turn(log, day):
+    log.record(user_id=1, intent="schedule", keywords=["plan"], numbers=[], response_type="schedule",
+               total_ms=12.0)
+    log._buffer[-1]["day"] = day
+
+
+def _written(log, day):
+    partition = log.log_dir / f"day={day}"
+    return sorted(partition.iterdir()) if partition.exists() else []
+
+
+def test_only_failed_days_are_rebuffered(tmp_path, monkeypatch):
+    log = TranscriptLog(tmp_path, flush_rows=1000, flush_interval=3600)
+    for day in ("2026-10-17", "2026-10-17", "2026-10-18"):
+        _turn(log, day)
+
+    write_part = log._write_part
+
+    def fail_on_18th(day, df):
+        if day == "2026-10-18":
+            raise OSError("disk full")
+        write_part(day, df)
+
+    monkeypatch.setattr(log, "_write_part", fail_on_18th)
+    assert log.flush() == 2
+    assert [row["day"] for row in log._buffer] == ["2026-10-18"]
+
+    monkeypatch.setattr(log, "_write_part", write_part)
+    assert log.flush() == 1
+    assert len(_written(log, "2026-10-17")) == 1
+    assert len(_written(log, "2026-10-18")) == 1
+    assert log._buffer == []
+
+
+def test_buffer_is_capped_while_writes_fail(tmp_path, monkeypatch):
+    log = TranscriptLog(tmp_path, flush_rows=3, flush_interval=3600, max_buffer_rows=5)
+
+    def fail(day, df):
+        raise OSError("read-only file system")
+
+    monkeypatch.setattr(log, "_write_part", fail)
+    for i in range(20):
+        log.record(user_id=i, intent="schedule", keywords=[], numbers=[], response_type="schedule",
+                   total_ms=1.0)
+        assert len(log._buffer) <= 5
+    assert [row["user_id"] for row in log._buffer][-1] == 19
+
+
+def test_record_leaves_the_write_to_a_background_thread(tmp_path, monkeypatch):
+    log = TranscriptLog(tmp_path, flush_rows=3, flush_interval=3600)
+    writers = []
+    write_part = log._write_part
+
+    def tracked(day, df):
+        writers.append(threading.current_thread())
+        write_part(day, df)
+
+    monkeypatch.setattr(log, "_write_part", tracked)
+    for i in range(3):
+        log.record(user_id=i, intent="schedule", keywords=[], numbers=[], response_type="schedule",
+                   total_ms=1.0)
+    log.wait(5)
+
+    assert writers and threading.current_thread() not in writers
+    assert log._buffer == []
+    assert len(log.load(1)) == 3
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+
+from ai.tree_inference import CompiledTreeEnsemble, verify_parity
+
+
+def _training_data(seed=0, n_samples=400, n_features=12):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_samples, n_features))
+    y = (X[:, 0] + 0.5 * X[:, 3] - X[:, 7] + rng.normal(scale=0.5, size=n_samples) > 0).astype(int)
+    return X, y
+
+
+@pytest.mark.parametrize("estimator", [
+    RandomForestClassifier(n_estimators=50, max_depth=8, random_state=0),
+    GradientBoostingClassifier(n_estimators=60, learning_rate=0.1, max_depth=3, random_state=0),
+], ids=["random_forest", "gradient_boosting"])
+def test_compiled_ensemble_matches_predict_proba(estimator):
+    X, y = _training_data()
+    model = estimator.fit(X, y)
+    compiled = CompiledTreeEnsemble.from_estimator(model)
+
+    probes = np.random.default_rng(1).normal(scale=3.0, size=(1000, X.shape[1]))
+    expected = model.predict_proba(probes)[:, 1]
+    np.testing.assert_allclose(compiled.predict_proba(probes), expected, rtol=0, atol=1e-9)
+    for row, probability in zip(probes[:50], expected[:50]):
+        assert compiled.predict_proba_one(row) == pytest.approx(probability, abs=1e-9)
+
+    assert verify_parity(model, compiled) <= 1e-9
+
+
+def test_compiled_ensemble_round_trips_through_arrays():
+    X, y = _training_data(seed=2)
+    model = GradientBoostingClassifier(n_estimators=20, random_state=0).fit(X, y)
+    compiled = CompiledTreeEnsemble.from_estimator(model)
+    restored = CompiledTreeEnsemble(compiled.to_arrays(), compiled.params())
+    np.testing.assert_array_equal(restored.predict_proba(X), compiled.predict_proba(X))
+
+
+def test_multiclass_models_are_not_compiled():
+    X, _ = _training_data(seed=3)
+    y = np.arange(len(X)) % 3
+    with pytest.raises(ValueError):
+        CompiledTreeEnsemble.from_estimator(RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y))
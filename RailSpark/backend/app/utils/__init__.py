@@ -1,8 +1,10 @@
 # Utilities package
 from .data_loader import DataLoader, WhatsAppParser, CSVLoader
 from .validators import DataValidator, DateValidator, FileValidator
+from .data_version import DataVersion, data_version
 
 __all__ = [
     "DataLoader", "WhatsAppParser", "CSVLoader",
-    "DataValidator", "DateValidator", "FileValidator"
+    "DataValidator", "DateValidator", "FileValidator",
+    "DataVersion", "data_version"
 ]
\ No newline at end of file
@@ -0,0 +1,169 @@
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event, inspect
+from typing import Any, Dict, List, Optional, Set
+import asyncio
+import itertools
+import threading
+import logging
+
+from database import SessionLocal
+from .dashboard_summary import dashboard_summary
+
+logger = logging.getLogger(__name__)
+
+# Tables whose row changes are pushed to live dashboards
+WATCHED_TABLES = {"trains", "job_cards", "fitness_certificates", "induction_plans", "branding_contracts"}
+
+
+class Subscription:
+    """One live dashboard connection's queue of pending events.
+
+    Events are offered from whichever thread commits, but the queue belongs
+    to the connection's event loop, so they are handed over with
+    ``call_soon_threadsafe``. A client that falls ``max_pending`` events
+    behind has its backlog replaced by a single resync event.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_pending: int = 256):
+        self.loop = loop
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max_pending)
+
+    def offer(self, event: Dict[str, Any]):
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event: Dict[str, Any]):
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            event = {"type": "resync", "seq": event["seq"]}
+        self.queue.put_nowait(event)
+
+    async def get(self) -> Dict[str, Any]:
+        return await self.queue.get()
+
+
+class ChangeFeed:
+    """Fans committed changes out to live dashboard connections.
+
+    Two kinds of events are published, each with an increasing ``seq``:
+    ``rows`` lists the rows a commit inserted, updated or deleted in the
+    watched tables, and ``overview`` carries only the overview figures that
+    changed once the dashboard summary has been refreshed. Nothing is
+    computed per connection, so cost follows the change rate rather than
+    the number of open screens.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Set[Subscription] = set()
+        self._seq = itertools.count(1)
+        self.seq = 0
+        self._overview: Optional[Dict[str, Any]] = None
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscribe(self, loop: asyncio.AbstractEventLoop = None) -> Subscription:
+        subscription = Subscription(loop or asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event: Dict[str, Any]):
+        with self._lock:
+            self.seq = next(self._seq)
+            event = dict(event, seq=self.seq)
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.offer(event)
+            except RuntimeError:
+                # The connection's loop has closed
+                self.unsubscribe(subscription)
+
+    def publish_rows(self, rows: List[Dict[str, Any]]):
+        if rows and self.has_subscribers:
+            self.publish({"type": "rows", "rows": jsonable_encoder(rows)})
+
+    def snapshot(self, overview: Dict[str, Any]) -> Dict[str, Any]:
+        """Snapshot event for a new connection; later overview events are deltas from it"""
+        with self._lock:
+            if self._overview is None:
+                self._overview = _flatten(overview)
+            return {"type": "snapshot", "seq": self.seq, "overview": overview}
+
+    def publish_overview(self, overview: Dict[str, Any]):
+        """on_refresh callback: publish the overview figures that changed"""
+        flat = _flatten(overview)
+        with self._lock:
+            previous, self._overview = self._overview, flat
+        changes = {key: value for key, value in flat.items()
+                   if previous is None or previous.get(key) != value}
+        if set(changes) - {"updated_at"} and self.has_subscribers:
+            self.publish({"type": "overview", "changes": changes})
+
+
+def _flatten(overview: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    flat = {}
+    for key, value in overview.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+change_feed = ChangeFeed()
+
+
+def _row_change(obj, op: str) -> Optional[Dict[str, Any]]:
+    table = getattr(obj, "__tablename__", None)
+    if table not in WATCHED_TABLES:
+        return None
+    # Only attributes already loaded; reading expired ones would query mid-flush
+    loaded = inspect(obj).dict
+    values = {column.key: loaded[column.key] for column in obj.__table__.columns if column.key in loaded}
+    if op == "delete":
+        values = {"id": values.get("id"), "train_id": values.get("train_id")}
+    return {"table": table, "op": op, "values": values}
+
+
+def _collect_rows(session, flush_context):
+    if not change_feed.has_subscribers:
+        return
+    rows = session.info.setdefault("changed_rows", [])
+    for op, objects in (("insert", session.new), ("update", session.dirty), ("delete", session.deleted)):
+        for obj in objects:
+            if op == "update" and not session.is_modified(obj, include_collections=False):
+                continue
+            change = _row_change(obj, op)
+            if change:
+                rows.append(change)
+
+
+def _publish_rows(session):
+    rows = session.info.pop("changed_rows", None)
+    if rows:
+        change_feed.publish_rows(rows)
+
+
+def _discard_rows(session):
+    session.info.pop("changed_rows", None)
+
+
+def install(session_factory=SessionLocal):
+    """Feed commits made through ``session_factory``; safe to call repeatedly"""
+    for name, listener in (("after_flush", _collect_rows),
+                           ("after_commit", _publish_rows),
+                           ("after_rollback", _discard_rows)):
+        if not event.contains(session_factory, name, listener):
+            event.listen(session_factory, name, listener)
+    dashboard_summary.on_refresh(change_feed.publish_overview)
+
+
+install()
@@ -0,0 +1,268 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from sqlalchemy import func, case
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+import threading
+import logging
+
+from database import engine
+from models import (DashboardSummary, Train, JobCard, BrandingContract, InductionPlan)
+from ai.rule_engine import AdvancedRuleEngine, TrainStatus
+from crud.risk_snapshots import read_latest_risk_summary
+from .data_version import data_version
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_ID = 1
+
+# Tables each overview section is computed from. A commit refreshes only the
+# sections whose tables it touched.
+SECTION_TABLES: Dict[str, Set[str]] = {
+    "fleet": {"trains"},
+    "eligibility": {"trains", "fitness_certificates"},
+    "maintenance": {"job_cards"},
+    "branding": {"branding_contracts"},
+    "plan": {"induction_plans"},
+    "risk": {"risk_snapshots"},  # Scheduled by the risk snapshotter after each snapshot
+}
+
+# Sessions from SessionLocal publish their commits to data_version. Summary
+# writes go through an unhooked factory so refreshing the summary does not
+# itself invalidate cached answers.
+SummarySession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def _fleet(db: Session, today: date) -> Dict[str, int]:
+    total, active = db.query(
+        func.count(Train.id),
+        func.coalesce(func.sum(case((Train.status == "active", 1), else_=0)), 0)
+    ).one()
+    return {"total_trains": total, "active_trains": active}
+
+
+def _eligibility(db: Session, today: date) -> Dict[str, int]:
+    readiness = AdvancedRuleEngine(db)._assess_train_readiness(today)
+    eligible = [t for t in readiness if t.status in [TrainStatus.AVAILABLE, TrainStatus.RESTRICTED]]
+    return {"eligible_trains": len(eligible)}
+
+
+def _maintenance(db: Session, today: date) -> Dict[str, int]:
+    open_jobs, trains = db.query(
+        func.count(JobCard.id), func.count(func.distinct(JobCard.train_id))
+    ).filter(JobCard.status == "open").one()
+    return {"open_job_cards": open_jobs, "trains_with_open_jobs": trains}
+
+
+def _branding(db: Session, today: date) -> Dict[str, int]:
+    shortfall = BrandingContract.exposure_hours_required - BrandingContract.exposure_hours_fulfilled
+    active, need_exposure, gap = db.query(
+        func.count(BrandingContract.id),
+        func.coalesce(func.sum(case((shortfall > 0, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((shortfall > 0, shortfall), else_=0)), 0)
+    ).filter(
+        BrandingContract.start_date <= today,
+        BrandingContract.end_date >= today
+    ).one()
+    return {"active_contracts": active, "contracts_need_exposure": need_exposure, "exposure_gap": gap}
+
+
+def _plan(db: Session, today: date) -> Dict[str, int]:
+    total, service, standby, unapproved = db.query(
+        func.count(InductionPlan.id),
+        func.coalesce(func.sum(case((InductionPlan.induction_type == "service", 1), else_=0)), 0),
+        func.coalesce(func.sum(case((InductionPlan.induction_type == "standby", 1), else_=0)), 0),
+        func.coalesce(func.sum(case((InductionPlan.approved_by.is_(None), 1), else_=0)), 0)
+    ).filter(InductionPlan.plan_date == today).one()
+    return {"total_planned": total, "service_trains": service,
+            "standby_trains": standby, "unapproved_plans": unapproved}
+
+
+def _risk(db: Session, today: date) -> Dict[str, int]:
+    risk = read_latest_risk_summary(db)
+    return {"high_risk_trains": risk["high"] if risk else 0}
+
+
+SECTIONS: Dict[str, Callable[[Session, date], Dict[str, int]]] = {
+    "fleet": _fleet,
+    "eligibility": _eligibility,
+    "maintenance": _maintenance,
+    "branding": _branding,
+    "plan": _plan,
+    "risk": _risk,
+}
+
+
+class DashboardSummaryRefresher:
+    """Keeps the ``dashboard_summary`` row in step with committed writes.
+
+    Every commit through SessionLocal (CRUD routes, CSV uploads, WhatsApp
+    updates) reports the tables it changed; the sections computed from those
+    tables are recomputed from aggregate queries on a single background
+    worker, coalescing commits that arrive while a refresh is running. Branding
+    and plan figures depend on the date, so the first read on a new day
+    queues a full refresh and is answered from the previous row meanwhile;
+    only a missing row is computed in the request. Callbacks registered with ``on_refresh`` receive
+    the new overview after each refresh. ``version`` counts stored refreshes,
+    standing in for the data_version counter summary writes do not bump.
+    """
+
+    def __init__(self, session_factory=SummarySession):
+        self.session_factory = session_factory
+        self.version = 0
+        self._lock = threading.Lock()
+        self._pending: Set[str] = set()
+        self._stale_queued: Optional[date] = None  # Day a stale row last queued a full refresh
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dashboard-summary")
+
+    def on_refresh(self, callback: Callable[[Dict[str, Any]], None]):
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+        return callback
+
+    @staticmethod
+    def sections_for(tables: Iterable[str]) -> Set[str]:
+        tables = set(tables)
+        return {name for name, sources in SECTION_TABLES.items() if sources & tables}
+
+    def schedule(self, tables: Iterable[str]):
+        """on_commit callback: queue a refresh of the sections the tables feed"""
+        self._queue(self.sections_for(tables))
+
+    def _queue(self, sections: Set[str]):
+        if not sections:
+            return
+        with self._lock:
+            queued = bool(self._pending)
+            self._pending |= sections
+        if not queued:
+            self._executor.submit(self._refresh_pending)
+
+    def wait(self, timeout: float = None):
+        """Block until every refresh queued so far has been applied"""
+        self._executor.submit(lambda: None).result(timeout=timeout)
+
+    def _refresh_pending(self):
+        with self._lock:
+            sections, self._pending = self._pending, set()
+        try:
+            self.refresh(sections)
+        except Exception as e:
+            logger.error(f"Error refreshing dashboard summary {sorted(sections)}: {e}")
+
+    def refresh(self, sections: Iterable[str] = None) -> DashboardSummary:
+        """Recompute the given sections (all by default) and store the row"""
+        sections = set(SECTIONS) if sections is None else set(sections)
+        today = date.today()
+        db = self.session_factory()
+        try:
+            summary = db.get(DashboardSummary, SUMMARY_ID)
+            if summary is None:
+                summary = self._create_row(db)
+                sections = set(SECTIONS)
+
+            for name in SECTIONS:
+                if name not in sections:
+                    continue
+                try:
+                    for column, value in SECTIONS[name](db, today).items():
+                        setattr(summary, column, int(value))
+                except Exception as e:
+                    logger.error(f"Error computing dashboard summary section '{name}': {e}")
+
+            summary.summary_date = today
+            summary.updated_at = datetime.now()
+            db.commit()
+            db.refresh(summary)
+            db.expunge(summary)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        with self._lock:
+            self.version += 1
+            listeners = list(self._listeners)
+        if listeners:
+            overview = format_overview(summary)
+            for callback in listeners:
+                try:
+                    callback(overview)
+                except Exception as e:
+                    logger.error(f"Dashboard summary listener {callback!r} failed: {e}")
+        return summary
+
+    @staticmethod
+    def _create_row(db: Session) -> DashboardSummary:
+        # Concurrent first reads, the background worker and other processes
+        # can all find the row missing; whoever loses the insert uses the
+        # winner's row
+        try:
+            with db.begin_nested():
+                summary = DashboardSummary(id=SUMMARY_ID)
+                db.add(summary)
+            return summary
+        except IntegrityError:
+            return db.get(DashboardSummary, SUMMARY_ID, populate_existing=True)
+
+    def read(self, db: Session) -> Dict[str, Any]:
+        """The overview in the shape /dashboard/overview returns, from the stored row"""
+        summary = db.get(DashboardSummary, SUMMARY_ID)
+        if summary is None:
+            summary = self.refresh()
+        elif summary.summary_date != date.today():
+            today = date.today()
+            with self._lock:
+                queue, self._stale_queued = self._stale_queued != today, today
+            if queue:
+                self._queue(set(SECTIONS))
+        return format_overview(summary)
+
+
+def format_overview(summary: DashboardSummary) -> Dict[str, Any]:
+    active_trains = summary.active_trains
+    trains_with_open_jobs = summary.trains_with_open_jobs
+    high_risk_trains = summary.high_risk_trains
+    return {
+        "summary": {
+            "total_trains": summary.total_trains,
+            "active_trains": active_trains,
+            "eligible_trains": summary.eligible_trains,
+            "utilization_rate": round(summary.eligible_trains / active_trains * 100, 1) if active_trains > 0 else 0
+        },
+        "maintenance": {
+            "open_job_cards": summary.open_job_cards,
+            "trains_need_maintenance": trains_with_open_jobs,
+            "maintenance_urgency": "high" if trains_with_open_jobs > 5 else "medium" if trains_with_open_jobs > 2 else "low"
+        },
+        "branding": {
+            "active_contracts": summary.active_contracts,
+            "contracts_need_exposure": summary.contracts_need_exposure,
+            "exposure_gap": summary.exposure_gap
+        },
+        "today_plan": {
+            "service_trains": summary.service_trains,
+            "standby_trains": summary.standby_trains,
+            "total_planned": summary.total_planned,
+            "approval_status": "approved" if summary.unapproved_plans == 0 else "pending"
+        },
+        "risk_assessment": {
+            "high_risk_trains": high_risk_trains,
+            "risk_level": "high" if high_risk_trains > 3 else "medium" if high_risk_trains > 1 else "low"
+        },
+        "updated_at": summary.updated_at.isoformat() if summary.updated_at else None
+    }
+
+
+dashboard_summary = DashboardSummaryRefresher()
+
+
+def install(refresher: DashboardSummaryRefresher = dashboard_summary):
+    data_version.on_commit(refresher.schedule)
+
+
+install()
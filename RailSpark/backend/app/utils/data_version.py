@@ -0,0 +1,87 @@
+from sqlalchemy import event
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+import itertools
+import threading
+import logging
+
+from database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class DataVersion:
+    """Process-wide counters bumped whenever a session commits changes.
+
+    ``version`` increases on every commit that touched a table, and each
+    table keeps its own counter, so caches can be keyed on exactly the data
+    they were computed from. Callbacks registered with ``on_commit`` receive
+    the set of changed table names.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = 0
+        self.table_versions: Dict[str, int] = {}
+        self._listeners: List[Callable[[Set[str]], None]] = []
+
+    def current(self) -> int:
+        return self.version
+
+    def tables_version(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        with self._lock:
+            return tuple(self.table_versions.get(table, 0) for table in tables)
+
+    def bump(self, tables: Iterable[str]):
+        tables = set(tables)
+        if not tables:
+            return
+        with self._lock:
+            self.version += 1
+            for table in tables:
+                self.table_versions[table] = self.table_versions.get(table, 0) + 1
+            listeners = list(self._listeners)
+
+        for callback in listeners:
+            try:
+                callback(tables)
+            except Exception as e:
+                logger.error(f"Data change listener {callback!r} failed: {e}")
+
+    def on_commit(self, callback: Callable[[Set[str]], None]):
+        with self._lock:
+            self._listeners.append(callback)
+        return callback
+
+
+data_version = DataVersion()
+
+
+def _track_changes(session, flush_context):
+    # The new/dirty/deleted collections still describe what this flush wrote
+    changed = session.info.setdefault("changed_tables", set())
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table:
+            changed.add(table)
+
+
+def _publish_changes(session):
+    tables = session.info.pop("changed_tables", None)
+    if tables:
+        data_version.bump(tables)
+
+
+def _discard_changes(session):
+    session.info.pop("changed_tables", None)
+
+
+def install(session_factory=SessionLocal):
+    """Track commits made through ``session_factory``; safe to call repeatedly"""
+    for name, listener in (("after_flush", _track_changes),
+                           ("after_commit", _publish_changes),
+                           ("after_rollback", _discard_changes)):
+        if not event.contains(session_factory, name, listener):
+            event.listen(session_factory, name, listener)
+
+
+install()
@@ -0,0 +1,142 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+import hashlib
+import uuid
+
+from .data_version import data_version
+from .dashboard_summary import dashboard_summary
+from .risk_snapshots import risk_snapshotter
+from .kpi_store import kpi_recorder
+
+# Responses may be stored but must be revalidated before every use, so a
+# polling screen always asks and usually gets a bodyless 304 back
+CACHE_CONTROL = "private, no-cache"
+
+# Versions are per process; tagging them with the process keeps another
+# worker's counters from validating a response they did not describe
+_BOOT_ID = uuid.uuid4().hex
+
+READINESS_TABLES = ("trains", "fitness_certificates", "job_cards",
+                    "branding_contracts", "cleaning_slots", "stabling_geometry")
+
+
+@dataclass(frozen=True)
+class CacheRule:
+    """GET routes under ``prefix`` and the data their responses are built from.
+
+    ``version`` covers state that commits through SessionLocal do not
+    version, such as the materialized dashboard summary.
+    """
+    prefix: str
+    tables: Tuple[str, ...] = ()
+    version: Optional[Callable[[], Any]] = None
+
+    def matches(self, path: str) -> bool:
+        return path == self.prefix or path.startswith(self.prefix + "/")
+
+
+# Most specific first. A rule must list every table its routes read, directly
+# or through the rule engine, or a write to the missing one is answered 304.
+CACHE_RULES: List[CacheRule] = [
+    CacheRule("/trains", ("trains",)),
+    CacheRule("/induction", ("induction_plans",)),
+    CacheRule("/branding", ("branding_contracts",)),
+    CacheRule("/dashboard/overview", version=lambda: dashboard_summary.version),
+    # Fleet counts, readiness assessment and today's plan
+    CacheRule("/dashboard/train-status", READINESS_TABLES + ("induction_plans",)),
+    CacheRule("/dashboard/maintenance-alerts", ("job_cards", "trains")),
+    CacheRule("/dashboard/branding-compliance", ("branding_contracts", "trains")),
+    CacheRule("/dashboard/train-readiness", READINESS_TABLES),
+    # Readiness and risk from the latest snapshot; job card and contract counts live
+    CacheRule("/dashboard/predictive-analytics", ("job_cards", "branding_contracts"),
+              version=lambda: risk_snapshotter.version),
+    CacheRule("/dashboard/risk-trends", version=lambda: risk_snapshotter.version),
+    CacheRule("/kpi", version=lambda: kpi_recorder.version),
+]
+
+
+def compute_etag(rule: CacheRule) -> str:
+    """Weak ETag for the current state of the rule's data.
+
+    The date is part of it because active contracts and today's plan change
+    at midnight without a commit.
+    """
+    state = (_BOOT_ID, date.today().isoformat(), data_version.tables_version(rule.tables),
+             rule.version() if rule.version else None)
+    digest = hashlib.blake2b(repr(state).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison (RFC 9110 13.1.2): opaque tags compared without W/
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == bare:
+            return True
+    return False
+
+
+class ETagMiddleware:
+    """Conditional GET for read-heavy routes keyed on data_version.
+
+    The ETag is computed before the route runs, from the version counters of
+    the tables the route reads, so a matching ``If-None-Match`` is answered
+    with 304 without opening a session or serializing anything. Because it
+    is taken first, a commit landing while the route runs can only make the
+    tag older than the body, which costs one extra full response rather
+    than a stale cached one. Only 200 responses are tagged.
+    """
+
+    def __init__(self, app, rules: Iterable[CacheRule] = None):
+        self.app = app
+        self.rules = list(CACHE_RULES if rules is None else rules)
+
+    def _rule_for(self, path: str) -> Optional[CacheRule]:
+        for rule in self.rules:
+            if rule.matches(path):
+                return rule
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+        rule = self._rule_for(scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        etag = compute_etag(rule)
+        if_none_match = _header(scope, b"if-none-match")
+        if if_none_match is not None and etag_matches(if_none_match, etag):
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": [(b"etag", etag.encode()), (b"cache-control", CACHE_CONTROL.encode())],
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = [(name, value) for name, value in message.get("headers", [])
+                           if name.lower() not in (b"etag", b"cache-control")]
+                headers.append((b"etag", etag.encode()))
+                headers.append((b"cache-control", CACHE_CONTROL.encode()))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", []):
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
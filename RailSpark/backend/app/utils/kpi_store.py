@@ -0,0 +1,69 @@
+from datetime import date, datetime
+from typing import Optional
+import threading
+import logging
+
+from ai.rule_engine import AdvancedRuleEngine
+from crud.kpi import record_daily_kpis, rollup_kpis
+from crud.risk_snapshots import read_latest_risk_snapshot
+from .dashboard_summary import SummarySession
+from .risk_snapshots import risk_snapshotter
+
+logger = logging.getLogger(__name__)
+
+
+class KpiRecorder:
+    """Writes the day's per-train KPI rows and keeps their rollups current.
+
+    Runs after each risk snapshot attempt (hourly and on change), so the
+    current day's rows follow the fleet during the day and the last write
+    of a day is what stays. Risk figures are taken only from a snapshot of
+    the same day. The week and month containing the day are re-rolled from
+    the daily rows on every write, which is at most a month of rows per
+    train. ``version`` counts writes; writes are serialized.
+    """
+
+    def __init__(self, session_factory=SummarySession):
+        self.session_factory = session_factory
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def record(self, kpi_date: date = None) -> int:
+        """Record ``kpi_date`` (today by default); returns the number of daily rows"""
+        kpi_date = kpi_date or date.today()
+        # The day's rows are deleted and re-inserted, so two writers at once
+        # (POST /kpi/record and the snapshot thread) would collide on the
+        # unique constraint; one at a time
+        with self._lock:
+            db = self.session_factory()
+            try:
+                readiness = {t.train_id: t.readiness_score
+                             for t in AdvancedRuleEngine(db)._assess_train_readiness(kpi_date)}
+                risk = {r.train_id: (r.failure_probability, r.risk_level)
+                        for r in read_latest_risk_snapshot(db) if r.taken_at.date() == kpi_date}
+                rows = record_daily_kpis(db, kpi_date, readiness, risk)
+                rollup_kpis(db, kpi_date)
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+            self.version += 1
+        return rows
+
+    def on_snapshot(self, taken_at: Optional[datetime]):
+        """on_snapshot callback"""
+        try:
+            self.record()
+        except Exception as e:
+            logger.error(f"Error recording daily KPIs: {e}")
+
+
+kpi_recorder = KpiRecorder()
+
+
+def install(recorder: KpiRecorder = kpi_recorder):
+    risk_snapshotter.on_snapshot(recorder.on_snapshot)
+
+
+install()
@@ -0,0 +1,235 @@
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from typing import Any, Dict, List, Optional
+import base64
+import gzip
+import json
+import os
+import time
+import logging
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from crud.pagination import next_cursor
+
+logger = logging.getLogger(__name__)
+
+# Response header carrying the after_id of a list endpoint's next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Bodies smaller than this are sent as they are; compressing them saves
+# less than the Content-Encoding header costs
+MIN_COMPRESS_SIZE = 1024
+
+# Already compressed, or must not be buffered (Server-Sent Events)
+UNCOMPRESSED_TYPES = ("image/", "video/", "audio/", "application/zip", "application/gzip",
+                      "text/event-stream")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON with orjson, or the stdlib when it is missing"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            # Types orjson does not know; the stdlib path reports them the usual way
+            pass
+    return json.dumps(content, ensure_ascii=False, allow_nan=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when it is installed.
+
+    Used as the app's default response class; FastAPI has already run the
+    content through jsonable_encoder, so only the final encode changes.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def set_next_cursor(response: Response, rows: List, limit: Optional[int]):
+    """Point clients at the next keyset page; omitted on the last page"""
+    cursor = next_cursor(rows, limit)
+    if cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = str(cursor)
+
+
+def _accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    encodings = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            encodings[name.strip().lower()] = quality
+    return encodings
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """br when the client takes it and brotli is installed, else gzip, else None"""
+    if not accept_encoding:
+        return None
+    accepted = _accepted_encodings(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    if brotli is not None and accepted.get("br", wildcard) > 0:
+        return "br"
+    if accepted.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 4) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class CompressionMiddleware:
+    """Negotiated Brotli/gzip compression for complete response bodies.
+
+    A response is compressed when its body arrives in one message (every
+    JSONResponse does), is at least ``minimum_size`` bytes and is not of an
+    already-compressed or streamed type. Streaming responses pass through
+    untouched, so SSE events are never held back. Brotli is preferred when
+    the client accepts it and the ``brotli`` package is installed.
+    """
+
+    def __init__(self, app, minimum_size: int = MIN_COMPRESS_SIZE, gzip_level: int = 6,
+                 brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(_header(scope.get("headers", []), b"accept-encoding"))
+        start_message = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            body = message.get("body", b"")
+            headers = list(start_message.get("headers", []))
+            if message.get("more_body", False) or not self._compressible(headers, body):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            headers.append((b"vary", b"Accept-Encoding"))
+            if encoding is not None:
+                body = compress(body, encoding, self.gzip_level, self.brotli_quality)
+                headers = [(name, value) for name, value in headers if name.lower() != b"content-length"]
+                headers.append((b"content-encoding", encoding.encode()))
+                headers.append((b"content-length", str(len(body)).encode()))
+            await send(dict(start_message, headers=headers))
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _compressible(self, headers, body: bytes) -> bool:
+        if len(body) < self.minimum_size or _header(headers, b"content-encoding") is not None:
+            return False
+        content_type = (_header(headers, b"content-type") or "").lower()
+        return not content_type.startswith(UNCOMPRESSED_TYPES)
+
+
+def _header(headers, name: bytes) -> Optional[str]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _sample_payloads(trains: int = 40) -> Dict[str, Any]:
+    """Payloads shaped like the largest responses: train status, predictions, a chart answer"""
+    train_status = [
+        {"id": i, "train_number": f"KMRL-{i:03d}", "current_mileage": 40000 + i * 731,
+         "status": "active", "open_job_cards": i % 4, "active_contracts": i % 3,
+         "eligible": i % 5 != 0, "last_maintenance_date": "2026-09-%02d" % (1 + i % 28)}
+        for i in range(1, trains + 1)
+    ]
+    predictions = [
+        {"train_id": i, "train_number": f"KMRL-{i:03d}", "failure_probability": (i * 37 % 100) / 100,
+         "risk_level": ("low", "medium", "high")[i % 3], "predicted_failure_type": "Brake System",
+         "confidence": 0.82, "recommendation": "Schedule inspection within 7 days",
+         "features": {f"feature_{k}": (i * k) % 97 / 7 for k in range(25)},
+         "model_used": "random_forest", "prediction_timestamp": "2026-10-18T09:00:00"}
+        for i in range(1, trains + 1)
+    ]
+    chart = base64.b64encode(os.urandom(24000)).decode()
+    chatbot = {"message": "Tomorrow's induction plan ranks 18 trains for service. " * 20,
+               "data": {"charts": [{"title": "Readiness", "image": chart}]},
+               "type": "schedule", "partial": False}
+    return {"train_status": train_status, "failure_predictions": predictions, "chatbot": chatbot}
+
+
+def benchmark(iterations: int = 200) -> List[Dict[str, Any]]:
+    """Serialization time and encoded size per sample payload"""
+    results = []
+    for name, payload in _sample_payloads().items():
+        start = time.perf_counter()
+        for _ in range(iterations):
+            stdlib_body = json.dumps(payload, ensure_ascii=False, allow_nan=False,
+                                     separators=(",", ":")).encode("utf-8")
+        stdlib_ms = (time.perf_counter() - start) / iterations * 1000
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            body = dumps(payload)
+        dumps_ms = (time.perf_counter() - start) / iterations * 1000
+
+        start = time.perf_counter()
+        gzipped = compress(body, "gzip")
+        gzip_ms = (time.perf_counter() - start) * 1000
+        result = {
+            "payload": name,
+            "encoder": "orjson" if orjson is not None else "json",
+            "stdlib_ms": stdlib_ms,
+            "dumps_ms": dumps_ms,
+            "bytes": len(stdlib_body),
+            "gzip_bytes": len(gzipped),
+            "gzip_ms": gzip_ms,
+        }
+        if brotli is not None:
+            start = time.perf_counter()
+            result["br_bytes"] = len(compress(body, "br"))
+            result["br_ms"] = (time.perf_counter() - start) * 1000
+        results.append(result)
+    return results
+
+
+if __name__ == "__main__":
+    # Usage: python -m utils.responses
+    for r in benchmark():
+        line = (f"{r['payload']:<20} {r['encoder']}: {r['dumps_ms']:.3f}ms (stdlib {r['stdlib_ms']:.3f}ms)  "
+                f"{r['bytes']:,}B -> gzip {r['gzip_bytes']:,}B in {r['gzip_ms']:.2f}ms")
+        if "br_bytes" in r:
+            line += f", br {r['br_bytes']:,}B in {r['br_ms']:.2f}ms"
+        print(line)
@@ -0,0 +1,174 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import os
+import threading
+import time
+import logging
+
+from ai.rule_engine import AdvancedRuleEngine, ReadinessStats
+from ai.services import get_ml_model
+from crud.risk_snapshots import create_risk_snapshot, delete_risk_snapshots_before
+from .data_version import data_version
+from .dashboard_summary import dashboard_summary, SummarySession
+
+logger = logging.getLogger(__name__)
+
+# Tables the failure model's per-train features and the readiness assessment are read from
+FEATURE_TABLES = {"trains", "job_cards", "fitness_certificates", "branding_contracts",
+                  "cleaning_slots", "induction_plans", "stabling_geometry"}
+
+
+class RiskSnapshotter:
+    """Records fleet failure-risk predictions in ``risk_snapshots``.
+
+    A snapshot runs ``predict_all_trains`` once and stores a row per train,
+    so dashboards read risk with an aggregate query instead of running the
+    model per request, and past snapshots double as trend history. The
+    fleet readiness figures /dashboard/predictive-analytics reports are
+    stored with each snapshot in ``readiness_snapshots``, so that route does
+    not run the rule engine either. One is
+    taken every ``interval`` seconds once ``start`` is called, and after
+    commits that change the model's features, at most one per ``min_gap``
+    seconds with commits in between coalesced. Snapshots older than
+    ``retention_days`` are pruned. ``version`` counts stored snapshots.
+    Callbacks registered with ``on_snapshot`` run after every scheduled
+    attempt with the snapshot time, or None when none could be taken.
+    After ``stop`` no snapshot is requested or taken until ``start``.
+    """
+
+    def __init__(self, interval: float = 3600.0, min_gap: float = 60.0, retention_days: int = 365,
+                 session_factory=SummarySession):
+        self.interval = interval
+        self.min_gap = min_gap
+        self.retention_days = retention_days
+        self.session_factory = session_factory
+        self.version = 0
+        self._lock = threading.Lock()
+        self._pending = False
+        self._last_taken: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: List[Callable[[Optional[datetime]], None]] = []
+        self._executor = self._new_executor()
+
+    @staticmethod
+    def _new_executor() -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="risk-snapshot")
+
+    def on_snapshot(self, callback: Callable[[Optional[datetime]], None]):
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+        return callback
+
+    def schedule(self, tables: Iterable[str]):
+        """on_commit callback: queue a snapshot when the model's features changed"""
+        if FEATURE_TABLES & set(tables):
+            self.request()
+
+    def request(self):
+        if self._stop.is_set():
+            return
+        with self._lock:
+            queued, self._pending = self._pending, True
+        if not queued:
+            self._executor.submit(self._take_pending)
+
+    def wait(self, timeout: float = None):
+        """Block until every snapshot requested so far has been taken"""
+        self._executor.submit(lambda: None).result(timeout=timeout)
+
+    def _take_pending(self):
+        if self._last_taken is not None:
+            self._stop.wait(self._last_taken + self.min_gap - time.monotonic())
+        with self._lock:
+            self._pending = False
+            listeners = list(self._listeners)
+        if self._stop.is_set():
+            return
+        taken_at = None
+        try:
+            taken_at = self.take()
+        except Exception as e:
+            logger.error(f"Error taking risk snapshot: {e}")
+        for callback in listeners:
+            try:
+                callback(taken_at)
+            except Exception as e:
+                logger.error(f"Risk snapshot listener {callback!r} failed: {e}")
+
+    def take(self) -> Optional[datetime]:
+        """Predict every active train and store the results; returns the snapshot time"""
+        db = self.session_factory()
+        try:
+            model = get_ml_model(db)
+            if not model.is_trained:
+                logger.info("Failure model not trained yet, skipping risk snapshot")
+                return None
+            predictions = model.predict_all_trains()
+            if not predictions:
+                return None
+            taken_at = create_risk_snapshot(db, predictions, readiness=self._readiness(db))
+            if self.retention_days:
+                delete_risk_snapshots_before(db, taken_at - timedelta(days=self.retention_days))
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        with self._lock:
+            self.version += 1
+            self._last_taken = time.monotonic()
+        logger.info(f"Stored risk snapshot of {len(predictions)} trains at {taken_at}")
+        if not self._stop.is_set():
+            # The summary worker may already be gone when stopping at exit
+            dashboard_summary.schedule({"risk_snapshots"})
+        return taken_at
+
+    @staticmethod
+    def _readiness(db) -> Dict[str, Any]:
+        stats = ReadinessStats.from_readiness(AdvancedRuleEngine(db)._assess_train_readiness(date.today()))
+        return {
+            "trains_assessed": stats.total,
+            "eligible_trains": stats.available,
+            "maintenance_needed": stats.maintenance_needed,
+            "high_readiness_trains": stats.high_readiness_available,
+            "readiness_avg": stats.average_score if stats.total else None,
+            "risk_factor_avg": stats.average_risk_factor,
+        }
+
+    def start(self):
+        """Take a snapshot now and then every ``interval`` seconds on a daemon thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="risk-snapshot-timer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.request()
+            self._stop.wait(self.interval)
+
+    def stop(self, timeout: float = 30.0):
+        """Stop the timer, drop queued snapshots and wait for a running one"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        with self._lock:
+            executor, self._executor = self._executor, self._new_executor()
+            self._pending = False
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+risk_snapshotter = RiskSnapshotter(interval=float(os.getenv("RISK_SNAPSHOT_INTERVAL", "3600")))
+
+
+def install(snapshotter: RiskSnapshotter = risk_snapshotter):
+    data_version.on_commit(snapshotter.schedule)
+
+
+install()